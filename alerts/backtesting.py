@@ -0,0 +1,302 @@
+import datetime
+from collections import defaultdict
+import numpy as np
+from alerts.metric_history import (
+    alarm_metric_request,
+    check_history_period,
+    fetch_history_matrix,
+)
+from common.logging_utilities import setup_logging
+
+logger = setup_logging()
+
+STATE_INSUFFICIENT_DATA = -1
+STATE_OK = 0
+STATE_ALARM = 1
+
+COMPARISON_OPERATORS = {
+    "GreaterThanOrEqualToThreshold": np.greater_equal,
+    "GreaterThanThreshold": np.greater,
+    "LessThanThreshold": np.less,
+    "LessThanOrEqualToThreshold": np.less_equal,
+}
+TREAT_MISSING_DATA = ("missing", "breaching", "notBreaching", "ignore")
+
+
+def window_counts(mask, window):
+    """
+    Counts True values in the trailing window of each column, row by row.
+
+    Window sums come from differences of one cumulative sum, so the cost is
+    O(rows x columns) whatever the window size. The first window - 1 columns count
+    over the shorter window available.
+    """
+    cumulative = np.zeros((mask.shape[0], mask.shape[1] + 1), dtype=np.int32)
+    np.cumsum(mask, axis=1, out=cumulative[:, 1:])
+    window_starts = np.maximum(np.arange(1, mask.shape[1] + 1) - window, 0)
+    return cumulative[:, 1:] - cumulative[:, window_starts]
+
+
+def _carry_forward(states, valid):
+    # Replaces states where valid is False with the last valid state in the row
+    columns = np.arange(states.shape[1])
+    last_valid = np.maximum.accumulate(np.where(valid, columns, -1), axis=1)
+    carried = np.take_along_axis(states, np.maximum(last_valid, 0), axis=1)
+    return np.where(last_valid >= 0, carried, STATE_INSUFFICIENT_DATA).astype(np.int8)
+
+
+def evaluate_alarm_states(
+    values,
+    thresholds,
+    comparison_operator,
+    evaluation_periods,
+    datapoints_to_alarm=None,
+    treat_missing_data="missing",
+):
+    """
+    Replays CloudWatch alarm evaluation over a matrix of metric history.
+
+    Each row is one alarm's metric on a regular grid (NaN for missing datapoints) and
+    is evaluated against its own threshold. At every period the alarm is in ALARM when
+    at least datapoints_to_alarm of the last evaluation_periods datapoints breach.
+
+    Parameters:
+    values (numpy.ndarray): Shape (alarms, periods), or a single 1-D series.
+    thresholds (float or array): One threshold, or one per row.
+    comparison_operator (str): One of COMPARISON_OPERATORS.
+    evaluation_periods (int): N, the number of datapoints evaluated.
+    datapoints_to_alarm (int, optional): M, breaching datapoints needed. Defaults to N.
+    treat_missing_data (str, optional): "missing" (default), "breaching", "notBreaching" or "ignore".
+
+    Returns:
+    numpy.ndarray: int8 states with the same shape as values: STATE_OK, STATE_ALARM
+                   or STATE_INSUFFICIENT_DATA.
+
+    Raises:
+    ValueError: If the operator or missing-data treatment is not supported.
+    """
+    compare = COMPARISON_OPERATORS.get(comparison_operator)
+    if compare is None:
+        raise ValueError(f"Unsupported comparison operator: {comparison_operator}")
+    if treat_missing_data not in TREAT_MISSING_DATA:
+        raise ValueError(f"Unsupported TreatMissingData: {treat_missing_data}")
+
+    values = np.asarray(values, dtype=float)
+    single = values.ndim == 1
+    values = np.atleast_2d(values)
+    thresholds = np.broadcast_to(
+        np.asarray(thresholds, dtype=float).reshape(-1, 1), (values.shape[0], 1)
+    )
+    datapoints_to_alarm = datapoints_to_alarm or evaluation_periods
+
+    present = ~np.isnan(values)
+    with np.errstate(invalid="ignore"):
+        breaching = compare(values, thresholds) & present
+    if treat_missing_data == "breaching":
+        breaching |= ~present
+
+    alarm = window_counts(breaching, evaluation_periods) >= datapoints_to_alarm
+    states = np.where(alarm, STATE_ALARM, STATE_OK).astype(np.int8)
+
+    if treat_missing_data in ("missing", "ignore"):
+        has_data = window_counts(present, evaluation_periods) > 0
+        if treat_missing_data == "missing":
+            states[~has_data] = STATE_INSUFFICIENT_DATA
+        else:
+            states = _carry_forward(states, has_data)
+
+    return states[0] if single else states
+
+
+def summarize_states(states, grid_start, period):
+    """
+    Reports how often and when each row's alarm would have fired.
+
+    Returns:
+    list: One dict per row with "fired" (OK/INSUFFICIENT_DATA -> ALARM transitions),
+          "fired_at" (datetimes of those transitions), "seconds_in_alarm",
+          "alarm_fraction" and "insufficient_fraction".
+    """
+    states = np.atleast_2d(states)
+    in_alarm = states == STATE_ALARM
+    previous = np.concatenate(
+        [np.zeros((states.shape[0], 1), dtype=bool), in_alarm[:, :-1]], axis=1
+    )
+    fires = in_alarm & ~previous
+    fire_rows, fire_columns = np.nonzero(fires)
+    fired_at = defaultdict(list)
+    for row, column in zip(fire_rows.tolist(), fire_columns.tolist()):
+        fired_at[row].append(
+            datetime.datetime.fromtimestamp(
+                grid_start + column * period, datetime.timezone.utc
+            )
+        )
+
+    fire_counts = fires.sum(axis=1)
+    alarm_periods = in_alarm.sum(axis=1)
+    columns = max(states.shape[1], 1)
+    insufficient = (states == STATE_INSUFFICIENT_DATA).sum(axis=1)
+    return [
+        {
+            "fired": int(fire_counts[row]),
+            "fired_at": fired_at.get(row, []),
+            "seconds_in_alarm": int(alarm_periods[row]) * period,
+            "alarm_fraction": float(alarm_periods[row]) / columns,
+            "insufficient_fraction": float(insufficient[row]) / columns,
+        }
+        for row in range(states.shape[0])
+    ]
+
+
+def _check_history(names, history):
+    # A row without a single datapoint usually means a wrong dimension or a metric
+    # that is not published; its states would read as a real (quiet) result
+    data_fraction = np.count_nonzero(~np.isnan(history), axis=1) / max(
+        history.shape[1], 1
+    )
+    errors = []
+    for name, fraction in zip(names, data_fraction.tolist()):
+        if fraction == 0:
+            logger.warning(f"No datapoints for alarm {name} in the backtest window")
+            errors.append("No datapoints in the backtest window")
+        else:
+            errors.append(None)
+    return data_fraction.tolist(), errors
+
+
+def _evaluation_key(alarm):
+    return (
+        alarm["ComparisonOperator"],
+        int(alarm["EvaluationPeriods"]),
+        int(alarm.get("DatapointsToAlarm") or alarm["EvaluationPeriods"]),
+        alarm.get("TreatMissingData") or "missing",
+    )
+
+
+def backtest_alarms(
+    alarms,
+    start_time,
+    end_time,
+    cloudwatch_client=None,
+    region_name=None,
+    thresholds=None,
+):
+    """
+    Evaluates alarm definitions locally against their own metric history.
+
+    History for every alarm is fetched with batched GetMetricData calls. Alarms that
+    share period, operator, N, M and missing-data treatment are then evaluated together
+    as one matrix, so thousands of alarms take one NumPy pass per group.
+
+    Parameters:
+    alarms (iterable): put_metric_alarm specs or describe_alarms records.
+    start_time (datetime): Start of the backtest window.
+    end_time (datetime): End of the backtest window.
+    cloudwatch_client (boto3.client, optional): A CloudWatch client. If None, one is initialized.
+    region_name (str, optional): The AWS region to use when a client is initialized.
+    thresholds (dict, optional): AlarmName -> threshold to try instead of the alarm's own.
+
+    Returns:
+    dict: Maps AlarmName to the summarize_states report plus the "threshold" used,
+          "data_fraction" (share of periods with a datapoint) and "error" (None, or
+          why the result is not meaningful, e.g. no datapoints at all).
+
+    Raises:
+    ValueError: If an alarm's period is not retained back to start_time.
+    RuntimeError: If a GetMetricData batch fails.
+    """
+    thresholds = thresholds or {}
+    groups = defaultdict(list)
+    for alarm in alarms:
+        try:
+            request = alarm_metric_request(alarm)
+        except (KeyError, ValueError) as e:
+            logger.warning(f"Skipping alarm {alarm.get('AlarmName')}: {e}")
+            continue
+        groups[(request.period,) + _evaluation_key(alarm)].append((alarm, request))
+
+    # Every period is validated before any data is fetched
+    for period, *_ in groups:
+        check_history_period(start_time, period)
+
+    reports = {}
+    for (period, operator, n, m, treat), members in groups.items():
+        grid_start, history = fetch_history_matrix(
+            [request for _, request in members],
+            start_time,
+            end_time,
+            period,
+            cloudwatch_client=cloudwatch_client,
+            region_name=region_name,
+            raise_on_error=True,
+        )
+        data_fractions, errors = _check_history(
+            [alarm["AlarmName"] for alarm, _ in members], history
+        )
+        alarm_thresholds = np.array(
+            [
+                thresholds.get(alarm["AlarmName"], alarm["Threshold"])
+                for alarm, _ in members
+            ],
+            dtype=float,
+        )
+        states = evaluate_alarm_states(history, alarm_thresholds, operator, n, m, treat)
+        for (alarm, _), threshold, summary, data_fraction, error in zip(
+            members,
+            alarm_thresholds,
+            summarize_states(states, grid_start, period),
+            data_fractions,
+            errors,
+        ):
+            summary["threshold"] = float(threshold)
+            summary["data_fraction"] = data_fraction
+            summary["error"] = error
+            reports[alarm["AlarmName"]] = summary
+    return reports
+
+
+def backtest_thresholds(
+    alarm,
+    candidate_thresholds,
+    start_time,
+    end_time,
+    cloudwatch_client=None,
+    region_name=None,
+):
+    """
+    Evaluates one alarm against several candidate thresholds in a single pass.
+
+    The metric history is fetched once and repeated as one row per candidate.
+
+    Returns:
+    dict: Maps each candidate threshold to its summarize_states report.
+
+    Raises:
+    ValueError: If the alarm's period is not retained back to start_time, or there
+                are no datapoints in the window.
+    RuntimeError: If the history could not be fetched.
+    """
+    request = alarm_metric_request(alarm)
+    operator, n, m, treat = _evaluation_key(alarm)
+    grid_start, history = fetch_history_matrix(
+        [request],
+        start_time,
+        end_time,
+        request.period,
+        cloudwatch_client=cloudwatch_client,
+        region_name=region_name,
+        raise_on_error=True,
+    )
+    if np.isnan(history).all():
+        raise ValueError(
+            f"No datapoints for alarm {alarm.get('AlarmName')} in the backtest window"
+        )
+    candidates = np.asarray(list(candidate_thresholds), dtype=float)
+    rows = np.repeat(history, len(candidates), axis=0)
+    states = evaluate_alarm_states(rows, candidates, operator, n, m, treat)
+    return dict(
+        zip(
+            candidates.tolist(),
+            summarize_states(states, grid_start, request.period),
+        )
+    )
@@ -0,0 +1,141 @@
+import warnings
+import numpy as np
+from alerts.metric_history import fetch_history_matrix
+from common.logging_utilities import setup_logging
+
+logger = setup_logging()
+
+DEFAULT_LEVEL_PERCENTILE = 5
+DEFAULT_LEVEL_FRACTION = 0.5
+DEFAULT_RATE_PERCENTILE = 95
+DEFAULT_MIN_SAMPLES = 24
+DEFAULT_TOLERANCE = 0.1
+
+
+def low_water_thresholds(
+    history,
+    horizon_periods,
+    level_percentile=DEFAULT_LEVEL_PERCENTILE,
+    level_fraction=DEFAULT_LEVEL_FRACTION,
+    rate_percentile=DEFAULT_RATE_PERCENTILE,
+    minimum=0.0,
+    min_samples=DEFAULT_MIN_SAMPLES,
+    step=None,
+):
+    """
+    Computes one "alarm below" threshold per row of metric history in a single pass.
+
+    Suited to metrics that run out, such as FreeStorageSpace. Each row's threshold is
+    the larger of:
+    - level_fraction of the row's level_percentile value, so the alarm sits well
+      under the metric's normal low point, and
+    - the row's rate_percentile per-period drop times horizon_periods, so there is
+      at least horizon_periods of headroom at a high rate of consumption.
+
+    Parameters:
+    history (numpy.ndarray): Shape (targets, periods); NaN marks missing datapoints.
+    horizon_periods (float): Periods of headroom the threshold should leave.
+    level_percentile (float, optional): Percentile of the values used as the normal low. Defaults to 5.
+    level_fraction (float, optional): Fraction of that low used as a threshold. Defaults to 0.5.
+    rate_percentile (float, optional): Percentile of per-period drops used as the consumption rate. Defaults to 95.
+    minimum (float, optional): Lower bound for every threshold.
+    min_samples (int, optional): Rows with fewer datapoints get NaN. Defaults to 24.
+    step (float, optional): Round every threshold up to a multiple of step. A sliding
+                            history window then yields the same thresholds from run to
+                            run, so deployed alarms are not rewritten for noise.
+
+    Returns:
+    numpy.ndarray: One threshold per row; NaN where there was too little history.
+    """
+    history = np.atleast_2d(np.asarray(history, dtype=float))
+    thresholds = np.full(history.shape[0], np.nan)
+    enough = np.count_nonzero(~np.isnan(history), axis=1) >= min_samples
+    if not enough.any():
+        return thresholds
+    history = history[enough]
+
+    level = np.nanpercentile(history, level_percentile, axis=1)
+    # Drops between consecutive datapoints; gaps produce NaN and are ignored
+    drops = np.clip(-np.diff(history, axis=1), 0, None)
+    if drops.shape[1]:
+        with warnings.catch_warnings():
+            # Rows with no consecutive datapoints have no drops to take a percentile of
+            warnings.simplefilter("ignore", RuntimeWarning)
+            rate = np.nan_to_num(np.nanpercentile(drops, rate_percentile, axis=1))
+    else:
+        rate = np.zeros(history.shape[0])
+
+    raw = np.maximum(level * level_fraction, rate * horizon_periods)
+    if step:
+        raw = np.ceil(raw / step) * step
+    thresholds[enough] = np.maximum(raw, minimum)
+    return thresholds
+
+
+def stable_thresholds(proposed, current, tolerance=DEFAULT_TOLERANCE):
+    """
+    Keeps each deployed threshold unless the proposed one moved by more than tolerance.
+
+    Thresholds recomputed from a sliding window drift a little on every run; applying
+    every drift would rewrite the whole fleet's alarms each time.
+
+    Parameters:
+    proposed (dict): Target -> newly computed threshold.
+    current (dict): Target -> threshold of the deployed alarm, for targets that have one.
+    tolerance (float, optional): Relative change, as a fraction of the deployed
+                                 threshold, that is ignored. Defaults to 0.1.
+
+    Returns:
+    dict: Target -> threshold to deploy.
+    """
+    stable = {}
+    for target, value in proposed.items():
+        deployed = current.get(target)
+        if deployed is not None and abs(value - deployed) <= tolerance * abs(deployed):
+            stable[target] = deployed
+        else:
+            stable[target] = value
+    return stable
+
+
+def fetch_low_water_thresholds(
+    requests,
+    start_time,
+    end_time,
+    period,
+    horizon_periods,
+    cloudwatch_client=None,
+    region_name=None,
+    **threshold_options,
+):
+    """
+    Bulk-fetches history for many metrics and computes low_water_thresholds for each.
+
+    Parameters:
+    requests (list): MetricRequest values, one per target.
+    start_time (datetime): Start of the history window.
+    end_time (datetime): End of the history window.
+    period (int): Grid spacing in seconds.
+    horizon_periods (float): Periods of headroom the thresholds should leave.
+    cloudwatch_client (boto3.client, optional): A CloudWatch client. If None, one is initialized.
+    region_name (str, optional): The AWS region to use when a client is initialized.
+    **threshold_options: Passed to low_water_thresholds.
+
+    Returns:
+    list: One threshold per request, or None where there was too little history.
+    """
+    if not requests:
+        return []
+    _, history = fetch_history_matrix(
+        requests,
+        start_time,
+        end_time,
+        period,
+        cloudwatch_client=cloudwatch_client,
+        region_name=region_name,
+    )
+    thresholds = low_water_thresholds(history, horizon_periods, **threshold_options)
+    logger.debug(
+        f"Computed {np.count_nonzero(~np.isnan(thresholds))} of {len(requests)} thresholds"
+    )
+    return [None if np.isnan(value) else float(value) for value in thresholds]
@@ -0,0 +1,144 @@
+import warnings
+from collections import namedtuple
+import numpy as np
+from common.logging_utilities import setup_logging
+
+logger = setup_logging()
+
+DEFAULT_ITERATIONS = 10
+DEFAULT_HUBER_K = 1.345
+DEFAULT_MIN_SAMPLES = 24
+# Scales the median absolute deviation to a standard deviation for normal residuals
+MAD_SCALE = 1.4826
+
+# Per-row forecast arrays. level is the fitted value at the last period, rate the
+# fitted consumption per second (0 when the metric is flat or growing) and
+# seconds_to_exhaustion the time until level reaches 0 at that rate (inf if never).
+# All three are NaN where a row had too little history.
+Forecast = namedtuple("Forecast", ["level", "rate", "seconds_to_exhaustion"])
+
+
+def _weighted_line(t, y, weights):
+    # Closed-form weighted least squares for every row at once
+    sw = weights.sum(axis=1)
+    st = weights @ t
+    stt = weights @ (t * t)
+    sy = (weights * y).sum(axis=1)
+    sty = (weights * y) @ t
+    denominator = sw * stt - st * st
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = np.where(denominator > 0, (sw * sty - st * sy) / denominator, 0.0)
+        intercept = (sy - slope * st) / sw
+    return intercept, slope
+
+
+def robust_linear_trends(
+    history,
+    iterations=DEFAULT_ITERATIONS,
+    huber_k=DEFAULT_HUBER_K,
+    min_samples=DEFAULT_MIN_SAMPLES,
+):
+    """
+    Fits a straight line to every row of metric history in one vectorized pass.
+
+    Uses iteratively reweighted least squares with Huber weights: datapoints more than
+    huber_k robust standard deviations from a row's line are down-weighted, so spikes,
+    bulk loads and clean-ups move the trend far less than they would an ordinary
+    least-squares fit. Every iteration works on the whole matrix, so thousands of rows
+    cost a handful of array operations.
+
+    Parameters:
+    history (numpy.ndarray): Shape (targets, periods); NaN marks missing datapoints.
+    iterations (int, optional): Reweighting iterations after the first fit. Defaults to 10.
+    huber_k (float, optional): Huber tuning constant. Defaults to 1.345.
+    min_samples (int, optional): Rows with fewer datapoints get NaN. Defaults to 24.
+
+    Returns:
+    tuple: (levels, slopes). levels is each line's value at the last period and slopes
+           its change per period; both are NaN where there was too little history.
+    """
+    history = np.atleast_2d(np.asarray(history, dtype=float))
+    levels = np.full(history.shape[0], np.nan)
+    slopes = np.full(history.shape[0], np.nan)
+    present = ~np.isnan(history)
+    enough = np.count_nonzero(present, axis=1) >= max(min_samples, 2)
+    if not enough.any():
+        return levels, slopes
+
+    present = present[enough]
+    values = np.where(present, history[enough], 0.0)
+    # Periods counted back from the last one, so each intercept is the current level
+    t = np.arange(history.shape[1], dtype=float) - (history.shape[1] - 1)
+    weights = present.astype(float)
+
+    intercept, slope = _weighted_line(t, values, weights)
+    for _ in range(iterations):
+        residuals = values - (intercept[:, None] + slope[:, None] * t)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            mad = np.nanmedian(np.where(present, np.abs(residuals), np.nan), axis=1)
+        # A perfect fit has no spread; every datapoint then keeps full weight
+        scale = np.where(mad > 0, huber_k * MAD_SCALE * mad, np.inf)
+        distance = np.abs(residuals) / scale[:, None]
+        weights = np.where(present, 1.0 / np.maximum(distance, 1.0), 0.0)
+        intercept, slope = _weighted_line(t, values, weights)
+
+    levels[enough] = intercept
+    slopes[enough] = slope
+    return levels, slopes
+
+
+def forecast_exhaustion(
+    history,
+    period,
+    recent_periods=None,
+    min_samples=DEFAULT_MIN_SAMPLES,
+    **trend_options,
+):
+    """
+    Estimates when each row of a "remaining capacity" metric reaches zero.
+
+    The long-window trend gives a stable consumption rate. When recent_periods is set,
+    the last recent_periods are also fitted on their own and the faster of the two
+    rates is used, so a recent jump in growth shortens the forecast straight away
+    instead of being averaged out by weeks of slower history.
+
+    Parameters:
+    history (numpy.ndarray): Shape (targets, periods) of a metric such as
+                             FreeStorageSpace; NaN marks missing datapoints.
+    period (int): Grid spacing in seconds.
+    recent_periods (int, optional): Length of the recent window. None fits the full window only.
+    min_samples (int, optional): Rows with fewer datapoints get NaN. Defaults to 24.
+    **trend_options: Passed to robust_linear_trends.
+
+    Returns:
+    Forecast: level, rate (per second) and seconds_to_exhaustion arrays, one value per row.
+    """
+    history = np.atleast_2d(np.asarray(history, dtype=float))
+    levels, slopes = robust_linear_trends(
+        history, min_samples=min_samples, **trend_options
+    )
+    consumption = np.clip(-slopes, 0, None)
+
+    if recent_periods and recent_periods < history.shape[1]:
+        recent_levels, recent_slopes = robust_linear_trends(
+            history[:, -recent_periods:],
+            min_samples=min(min_samples, max(recent_periods // 2, 2)),
+            **trend_options,
+        )
+        fitted = ~np.isnan(levels) & ~np.isnan(recent_levels)
+        levels = np.where(fitted, recent_levels, levels)
+        consumption = np.where(
+            fitted, np.fmax(consumption, np.clip(-recent_slopes, 0, None)), consumption
+        )
+
+    levels = np.clip(levels, 0, None)
+    rate = consumption / period
+    with np.errstate(divide="ignore", invalid="ignore"):
+        seconds = np.where(rate > 0, levels / rate, np.inf)
+    seconds[np.isnan(levels)] = np.nan
+    logger.debug(
+        f"Forecast {np.count_nonzero(np.isfinite(seconds))} of {len(seconds)} series "
+        "to run out"
+    )
+    return Forecast(levels, rate, seconds)
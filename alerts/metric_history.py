@@ -0,0 +1,184 @@
+import datetime
+import time
+import numpy as np
+from cloudwatch.metric_data import get_metric_data_bulk, metric_request
+from common.logging_utilities import setup_logging
+
+logger = setup_logging()
+
+# CloudWatch keeps datapoints at a given period for a limited time: sub-minute (high
+# resolution) for 3 hours, 1 minute for 15 days, 5 minutes for 63 days and 1 hour for
+# 455 days. Older data is only returned at the coarser periods, and not at all after
+# 455 days. Each entry is (maximum age in seconds, shortest period still available).
+METRIC_RETENTION = (
+    (3 * 3600, 1),
+    (15 * 86400, 60),
+    (63 * 86400, 300),
+    (455 * 86400, 3600),
+)
+
+
+def alarm_metric_request(alarm):
+    """
+    Returns the MetricRequest an alarm evaluates.
+
+    Supports classic single-metric alarms (MetricName/Namespace/Statistic) and
+    Metrics-style alarms whose returned query is a MetricStat, as built by the alarm
+    managers. Alarms whose returned query is a math expression are not supported.
+
+    Parameters:
+    alarm (dict): A put_metric_alarm spec or describe_alarms record.
+
+    Returns:
+    MetricRequest: The metric, statistic and period the alarm evaluates.
+
+    Raises:
+    ValueError: If the alarm evaluates a metric math expression.
+    """
+    if alarm.get("Metrics"):
+        queries = alarm["Metrics"]
+        returned = [q for q in queries if q.get("ReturnData", True)]
+        query = returned[0] if returned else queries[0]
+        if "MetricStat" not in query:
+            raise ValueError(
+                f"Alarm {alarm.get('AlarmName')} evaluates an expression, not a metric"
+            )
+        stat = query["MetricStat"]
+        metric = stat["Metric"]
+        return metric_request(
+            metric["Namespace"],
+            metric["MetricName"],
+            metric.get("Dimensions", []),
+            stat=stat["Stat"],
+            period=stat["Period"],
+        )
+    return metric_request(
+        alarm["Namespace"],
+        alarm["MetricName"],
+        alarm.get("Dimensions", []),
+        stat=alarm.get("Statistic") or alarm.get("ExtendedStatistic"),
+        period=alarm["Period"],
+    )
+
+
+def minimum_period(start_time, now=None):
+    """
+    Returns the shortest period CloudWatch still returns datapoints at for start_time.
+
+    Raises:
+    ValueError: If start_time is older than CloudWatch retains any datapoints.
+    """
+    age = (now or time.time()) - start_time.timestamp()
+    for max_age, period in METRIC_RETENTION:
+        if age <= max_age:
+            return period
+    raise ValueError(
+        f"CloudWatch keeps no datapoints older than {METRIC_RETENTION[-1][0] // 86400} days"
+    )
+
+
+def check_history_period(start_time, period, now=None):
+    """
+    Raises ValueError if CloudWatch no longer has datapoints at period for the whole
+    window starting at start_time. Without this check the older part of the window
+    silently comes back empty and reads as missing data.
+    """
+    shortest = minimum_period(start_time, now=now)
+    if period < shortest:
+        raise ValueError(
+            f"A {period}s period is not retained back to {start_time.isoformat()}; "
+            f"use a period of at least {shortest}s or a shorter window"
+        )
+
+
+def history_grid(start_time, end_time, period):
+    """
+    Returns (grid_start, length): the period-aligned start of the evaluation grid, in
+    epoch seconds, and the number of periods between start_time and end_time.
+    """
+    start = int(start_time.timestamp()) // period * period
+    end = int(end_time.timestamp())
+    return start, max(0, -(-(end - start) // period))
+
+
+def grid_timestamps(grid_start, length, period):
+    """
+    Returns the UTC datetime of every grid slot.
+    """
+    return [
+        datetime.datetime.fromtimestamp(grid_start + i * period, datetime.timezone.utc)
+        for i in range(length)
+    ]
+
+
+def series_to_row(timestamps, values, grid_start, length, period):
+    """
+    Places a sparse metric series on a regular grid. Periods without a datapoint are NaN.
+    """
+    row = np.full(length, np.nan)
+    if not timestamps:
+        return row
+    epochs = np.fromiter((t.timestamp() for t in timestamps), float, len(timestamps))
+    slots = ((epochs - grid_start) // period).astype(np.int64)
+    keep = (slots >= 0) & (slots < length)
+    row[slots[keep]] = np.asarray(values, dtype=float)[keep]
+    return row
+
+
+def fetch_history_matrix(
+    requests,
+    start_time,
+    end_time,
+    period,
+    cloudwatch_client=None,
+    region_name=None,
+    raise_on_error=False,
+):
+    """
+    Fetches the history of many metrics in one bulk pass and aligns it on one grid.
+
+    Parameters:
+    requests (list): MetricRequest values. Duplicates share one GetMetricData query.
+    start_time (datetime): Start of the history window.
+    end_time (datetime): End of the history window.
+    period (int): Grid spacing in seconds, normally the requests' period.
+    cloudwatch_client (boto3.client, optional): A CloudWatch client. If None, one is initialized.
+    region_name (str, optional): The AWS region to use when a client is initialized.
+    raise_on_error (bool, optional): Raise when a GetMetricData batch fails instead of
+                                     logging a warning and leaving its rows NaN.
+
+    Returns:
+    tuple: (grid_start, matrix) where matrix has one row per request, one column per
+           period, and NaN where there was no datapoint.
+
+    Raises:
+    ValueError: If CloudWatch does not retain datapoints at period for the whole window.
+    RuntimeError: If raise_on_error is set and some history could not be fetched.
+    """
+    check_history_period(start_time, period)
+    grid_start, length = history_grid(start_time, end_time, period)
+    results = get_metric_data_bulk(
+        requests,
+        start_time,
+        end_time,
+        cloudwatch_client=cloudwatch_client,
+        region_name=region_name,
+    )
+    failed = [request for request in requests if request not in results]
+    if failed:
+        message = (
+            f"Failed to fetch history for {len(failed)} of {len(requests)} metrics"
+        )
+        if raise_on_error:
+            raise RuntimeError(message)
+        logger.warning(message)
+
+    matrix = np.full((len(requests), length), np.nan)
+    for index, request in enumerate(requests):
+        entry = results.get(request)
+        if entry is None:
+            continue
+        matrix[index] = series_to_row(
+            entry["Timestamps"], entry["Values"], grid_start, length, period
+        )
+    return grid_start, matrix
@@ -8,6 +8,13 @@ import base64
 import uuid
 from tabulate import tabulate
 import logging
+from botocore.exceptions import ClientError
+from common.network_topology import RegionTopology
+from common.cache_utilities import add_cache_arguments, configure_cache_from_args
+from common import aws_utilities
+from common.ami_resolver import resolve_latest_ami
+from common.aws_client import initialize_aws_client
+from common.concurrency_utilities import fan_out
 
 KEY_PATH = "~/.ssh"  # Path to SSH private key. The assumption is the file name and the AWS EC2 Key are the same. This is used to show a ssh command to access the Linux instance.
 
@@ -19,11 +26,37 @@ class Config:
     DEFAULT_GP2_VOL_SIZE = 5
     DEFAULT_GP3_VOL_SIZE = 5
     DEFAULT_IO2_VOL_SIZE = 5
+    LAUNCH_CHUNK_SIZE = 50  # Instances requested per RunInstances call
+    MONITOR_MIN_INTERVAL = 2  # Seconds between status polls while states change
+    MONITOR_MAX_INTERVAL = 30  # Upper bound for the backed-off poll interval
+    MONITOR_BACKOFF_FACTOR = 1.5
+    MONITOR_TIMEOUT = 900  # Seconds before monitoring gives up on unsettled instances
+    MONITOR_MAX_FAILURES = 5  # Consecutive failed describe calls before giving up
+    TERMINATE_BATCH_SIZE = 1000  # TerminateInstances accepts up to 1000 ids
+    TERMINATE_POLL_INTERVAL = 10  # Seconds between termination checks
+    VOLUME_DELETE_WORKERS = 8
+
+
+# States after which monitor_instance_status stops polling an instance: the instance
+# is no longer in a transition (pending/stopping), though not necessarily final.
+SETTLED_INSTANCE_STATES = {"running", "stopped", "shutting-down", "terminated"}
+
+# States that still need to be terminated by a teardown.
+ACTIVE_INSTANCE_STATES = ["pending", "running", "stopping", "stopped"]
+
+# RunInstances errors that mean "try another AZ/subnet" rather than "give up".
+CAPACITY_ERROR_CODES = {
+    "InsufficientInstanceCapacity",
+    "InsufficientCapacity",
+    "InsufficientFreeAddressesInSubnet",
+    "Unsupported",
+}
 
 
 def main():
     args = parse_args()
     init_logging(args)
+    configure_cache_from_args(args)
 
     if args.launchrun_list:
         if args.region:
@@ -35,23 +68,17 @@ def main():
             )
         else:
             all_unique_launch_runs = []
-            # List for all available regions
-            ec2_client_for_region_list = boto3.client("ec2", region_name="us-east-1")
-            regions = [
-                region["RegionName"]
-                for region in ec2_client_for_region_list.describe_regions()["Regions"]
-            ]
-            for region in regions:
-                ec2_client, ec2_resource = initialize_aws_clients(region)
-                print(f"--- {region}: Checking LaunchRuns")
-                unique_launch_runs = list_unique_launch_runs(
-                    ec2_client=ec2_client, ec2_resource=ec2_resource, region=region
+            # List for all available regions, one worker per region
+            regions = aws_utilities.get_regions(region_name="us-east-1") or []
+            for region, unique_launch_runs in scan_launch_runs(
+                regions, max_workers=args.max_workers
+            ):
+                print(f"--- {region}: {len(unique_launch_runs)} LaunchRuns")
+                for launch_run in sorted(unique_launch_runs):
+                    print(f"- {launch_run}")
+                all_unique_launch_runs.extend(
+                    [(region, launch_run) for launch_run in sorted(unique_launch_runs)]
                 )
-                # print("\n")
-                if unique_launch_runs:
-                    all_unique_launch_runs.extend(
-                        [(region, launch_run) for launch_run in unique_launch_runs]
-                    )
 
             print("\n=== Summary of All Unique LaunchRuns Across All Regions ===")
             python_executable = sys.executable
@@ -64,6 +91,30 @@ def main():
 
         return
 
+    if args.terminate:
+        if args.region:
+            regions = [args.region]
+        else:
+            regions = aws_utilities.get_regions(region_name="us-east-1") or []
+        summaries = teardown_launch_runs(
+            launch_run_ids=args.terminate,
+            regions=regions,
+            no_wait=args.no_wait,
+            max_workers=args.max_workers,
+        )
+        for summary in summaries:
+            if (
+                summary["instances"]
+                or summary["volumes_deleted"]
+                or summary["volumes_failed"]
+            ):
+                print(
+                    f"{summary['region']}: terminated {len(summary['instances'])} instances, "
+                    f"deleted {len(summary['volumes_deleted'])} volumes, "
+                    f"{len(summary['volumes_failed'])} volume deletions failed"
+                )
+        return
+
     if args.region is None:
         region_list = get_region_list()
         if region_list is None:
@@ -74,15 +125,6 @@ def main():
 
     ec2_client, ec2_resource = initialize_aws_clients(args.region)
 
-    if args.terminate:
-        terminate_instances_by_launch_run(
-            launch_run_id=args.terminate,
-            ec2_client=ec2_client,
-            ec2_resource=ec2_resource,
-            no_wait=args.no_wait,
-        )
-        return
-
     incoming_params = {
         "ec2_client": ec2_client,
         "ec2_resource": ec2_resource,
@@ -164,46 +206,155 @@ def initialize_aws_clients(region):
     return ec2_client, ec2_resource
 
 
-def terminate_instances_by_launch_run(launch_run_id, ec2_client, ec2_resource, no_wait):
-    instances = ec2_resource.instances.filter(
-        Filters=[{"Name": "tag:LaunchRun", "Values": [launch_run_id]}]
+def terminate_instances_by_launch_run(
+    launch_run_id, ec2_client, ec2_resource=None, no_wait=False
+):
+    return teardown_launch_runs_with_client(
+        ec2_client=ec2_client, launch_run_ids=[launch_run_id], no_wait=no_wait
     )
-    instance_ids = [instance.id for instance in instances]
 
-    if not instance_ids:
-        logging.info(f"No instances found for LaunchRun: {launch_run_id}")
-        return
 
-    response = ec2_client.describe_volumes(  # Using ec2_client here
-        Filters=[{"Name": "tag:LaunchRun", "Values": [launch_run_id]}]
-    )
-    volume_ids = [volume["VolumeId"] for volume in response["Volumes"]]
+def delete_available_volumes(ec2_client, launch_run_ids, max_workers=None):
+    """
+    Deletes 'available' volumes tagged with any of the LaunchRun ids.
+
+    Volumes that were not delete-on-termination are left behind when their instance
+    terminates; this removes them through a bounded worker pool.
+
+    :return: (deleted_volume_ids, failed_volume_ids)
+    """
+    volume_ids = [
+        volume["VolumeId"]
+        for volume in aws_utilities.iter_paginated(
+            ec2_client,
+            "describe_volumes",
+            "Volumes",
+            Filters=[
+                {"Name": "tag:LaunchRun", "Values": list(launch_run_ids)},
+                {"Name": "status", "Values": ["available"]},
+            ],
+        )
+    ]
 
-    if logging.info:
-        print("\n\nTerminating the following EC2 Instances and EBS Volumes:")
-        print(f"EC2 Instances: {', '.join(instance_ids)}")
-        print(f"EBS Volumes: {', '.join(volume_ids)}")
+    def delete_volume(volume_id):
+        ec2_client.delete_volume(VolumeId=volume_id)
+
+    deleted, failed = [], []
+    for volume_id, _, error in fan_out(
+        delete_volume,
+        volume_ids,
+        max_workers=max_workers or Config.VOLUME_DELETE_WORKERS,
+    ):
+        if error is None:
+            deleted.append(volume_id)
+        else:
+            logging.error(f"Failed to delete volume {volume_id}: {error}")
+            failed.append(volume_id)
+    return deleted, failed
+
+
+def teardown_launch_runs_with_client(ec2_client, launch_run_ids, no_wait=False):
+    """
+    Terminates every instance tagged with the LaunchRun ids, waits for them to finish
+    terminating and then deletes the LaunchRun's leftover volumes.
+
+    Waiting polls with one batched describe_instances call per tick, filtered to
+    instances that are not terminated yet.
+
+    :return: A summary dict with the terminated instances and deleted/failed volumes.
+    """
+    launch_run_ids = list(launch_run_ids)
+    region = ec2_client.meta.region_name
+    launch_run_filter = {"Name": "tag:LaunchRun", "Values": launch_run_ids}
+    summary = {
+        "region": region,
+        "instances": [],
+        "volumes_deleted": [],
+        "volumes_failed": [],
+    }
 
-    ec2_resource.instances.filter(InstanceIds=instance_ids).terminate()
-    logging.info(f"\nTerminated instances for LaunchRun: {launch_run_id}")
+    instance_ids = [
+        instance["InstanceId"]
+        for instance in aws_utilities.iter_instances(
+            ec2_client,
+            filters=[
+                launch_run_filter,
+                {"Name": "instance-state-name", "Values": ACTIVE_INSTANCE_STATES},
+            ],
+        )
+    ]
+    summary["instances"] = instance_ids
+
+    if instance_ids:
+        logging.info(
+            f"Terminating {len(instance_ids)} instances in {region}: {', '.join(instance_ids)}"
+        )
+        for start in range(0, len(instance_ids), Config.TERMINATE_BATCH_SIZE):
+            ec2_client.terminate_instances(
+                InstanceIds=instance_ids[start : start + Config.TERMINATE_BATCH_SIZE]
+            )
+    else:
+        logging.info(
+            f"No instances found in {region} for LaunchRun: {', '.join(launch_run_ids)}"
+        )
 
     if no_wait:
         logging.info(
             "Not waiting to validate termination of all instances. This can take several minutes."
         )
-        return
+    else:
+        while instance_ids:
+            instance_ids = [
+                instance["InstanceId"]
+                for instance in aws_utilities.iter_instances(
+                    ec2_client,
+                    instance_ids=instance_ids,
+                    filters=[
+                        {
+                            "Name": "instance-state-name",
+                            "Values": ACTIVE_INSTANCE_STATES + ["shutting-down"],
+                        }
+                    ],
+                )
+            ]
+            if instance_ids:
+                logging.info(
+                    f"Waiting for {len(instance_ids)} instances in {region} to terminate..."
+                )
+                time.sleep(Config.TERMINATE_POLL_INTERVAL)
+        logging.info(f"All instances in {region} have been terminated.")
+
+    # With --no-wait, volumes still attached to terminating instances are skipped;
+    # a later run picks them up once they become available.
+    summary["volumes_deleted"], summary["volumes_failed"] = delete_available_volumes(
+        ec2_client, launch_run_ids
+    )
+    return summary
 
-    all_terminated = False
-    while not all_terminated:
-        instances = ec2_resource.instances.filter(
-            Filters=[{"Name": "tag:LaunchRun", "Values": [launch_run_id]}]
+
+def teardown_launch_runs(launch_run_ids, regions, no_wait=False, max_workers=8):
+    """
+    Runs teardown_launch_runs_with_client in several regions concurrently.
+
+    :return: A list of per-region summary dicts.
+    """
+
+    def teardown_region(region):
+        return teardown_launch_runs_with_client(
+            ec2_client=initialize_aws_client("ec2", region_name=region),
+            launch_run_ids=launch_run_ids,
+            no_wait=no_wait,
         )
-        statuses = [instance.state["Name"] for instance in instances]
-        all_terminated = all(status == "terminated" for status in statuses)
-        if not all_terminated:
-            logging.info("Waiting for all instances to terminate...")
-            time.sleep(10)
-    logging.info(f"All instances for LaunchRun: {launch_run_id} have been terminated.")
+
+    summaries = []
+    for region, summary, error in fan_out(
+        teardown_region, regions, max_workers=max_workers
+    ):
+        if error is not None:
+            logging.error(f"Teardown failed in {region}: {error}")
+            continue
+        summaries.append(summary)
+    return summaries
 
 
 def prompt_for_choice(options, prompt_message, allowed_choices=None):
@@ -239,11 +390,6 @@ def prompt_for_choice(options, prompt_message, allowed_choices=None):
             print("Invalid input. Please enter a number.")
 
 
-def get_key_pairs(ec2_client):
-    response = ec2_client.describe_key_pairs()
-    return [key_pair["KeyName"] for key_pair in response["KeyPairs"]]
-
-
 def get_security_groups(ec2_client):
     response = ec2_client.describe_security_groups()
     return [f"{sg['GroupId']} - {sg['GroupName']}" for sg in response["SecurityGroups"]]
@@ -254,22 +400,6 @@ def get_vpcs(ec2_client):
     return [vpc["VpcId"] for vpc in response["Vpcs"]]
 
 
-def get_vpcs_with_names(ec2_client):
-    response = ec2_client.describe_vpcs()
-    return [
-        (vpc["VpcId"], vpc.get("Tags", [{}])[0].get("Value", "N/A"))
-        for vpc in response["Vpcs"]
-    ]
-
-
-def get_availability_zones_for_vpc(ec2_client, vpc_id):
-    response = ec2_client.describe_subnets(
-        Filters=[{"Name": "vpc-id", "Values": [vpc_id]}]
-    )
-    azs = list(set(subnet["AvailabilityZone"] for subnet in response["Subnets"]))
-    return azs
-
-
 def get_availability_zones(ec2_client):
     response = ec2_client.describe_availability_zones()
     return [az["ZoneName"] for az in response["AvailabilityZones"]]
@@ -287,38 +417,11 @@ def get_availability_zone_for_subnet(ec2_client, subnet_id):
     return response["Subnets"][0]["AvailabilityZone"]
 
 
-def get_security_groups_for_vpc(ec2_client, vpc_id):
-    response = ec2_client.describe_security_groups(
-        Filters=[{"Name": "vpc-id", "Values": [vpc_id]}]
-    )
-    return [(sg["GroupId"], sg["GroupName"]) for sg in response["SecurityGroups"]]
-
-
-def get_subnet_id_for_az_and_vpc(ec2_client, az, vpc_id):
-    response = ec2_client.describe_subnets(
-        Filters=[
-            {"Name": "availability-zone", "Values": [az]},
-            {"Name": "vpc-id", "Values": [vpc_id]},
-        ]
-    )
-    if not response["Subnets"]:
-        raise ValueError("No subnet found for the given availability zone and VPC.")
-    return response["Subnets"][0]["SubnetId"]
-
-
 def get_latest_amazon_linux_ami(ec2_client):
-    response = ec2_client.describe_images(
-        Filters=[
-            {"Name": "name", "Values": ["amzn2-ami-hvm-*"]},
-            {"Name": "architecture", "Values": ["x86_64"]},
-            {"Name": "virtualization-type", "Values": ["hvm"]},
-            {"Name": "owner-alias", "Values": ["amazon"]},
-            {"Name": "state", "Values": ["available"]},
-        ],
-        Owners=["amazon"],
-    )
-    amis = sorted(response["Images"], key=lambda x: x["CreationDate"], reverse=True)
-    return amis[0]["ImageId"]
+    ami_id = resolve_latest_ami(ec2_client=ec2_client)
+    if ami_id is None:
+        raise ValueError("No Amazon Linux AMI found in this region.")
+    return ami_id
 
 
 def get_region_list():
@@ -329,47 +432,67 @@ def get_region_list():
         return None
 
 
-def validate_sg_and_subnet(ec2_client, security_group, subnet_id):
-    sg_response = ec2_client.describe_security_groups(GroupIds=[security_group])
-    subnet_response = ec2_client.describe_subnets(SubnetIds=[subnet_id])
+def get_launch_run_tag(resource):
+    for tag in resource.get("Tags", []):
+        if tag["Key"] == "LaunchRun":
+            return tag["Value"]
+    return None
 
-    sg_vpc = sg_response["SecurityGroups"][0]["VpcId"]
-    subnet_vpc = subnet_response["Subnets"][0]["VpcId"]
 
-    if sg_vpc != subnet_vpc:
-        raise ValueError("Security group and subnet belong to different VPCs.")
+def find_launch_runs(ec2_client):
+    """
+    Returns the set of LaunchRun ids on running instances and in-use volumes.
 
+    Uses client paginators with tag-key filters, so tags come back with each page
+    instead of being lazily loaded per instance.
+    """
+    unique_launch_runs = set()
 
-def list_unique_launch_runs(ec2_client, ec2_resource, region):
-    # Fetching instances with LaunchRun tag and in 'running' state
-    instances = ec2_resource.instances.filter(
-        Filters=[
+    instances = aws_utilities.iter_instances(
+        ec2_client,
+        filters=[
             {"Name": "tag-key", "Values": ["LaunchRun"]},
             {"Name": "instance-state-name", "Values": ["running"]},
-        ]
+        ],
     )
-
-    # Fetching volumes with LaunchRun tag and in 'in-use' state
-    response = ec2_client.describe_volumes(
+    volumes = aws_utilities.iter_paginated(
+        ec2_client,
+        "describe_volumes",
+        "Volumes",
         Filters=[
             {"Name": "tag-key", "Values": ["LaunchRun"]},
             {"Name": "status", "Values": ["in-use"]},
-        ]
+        ],
     )
+    for resource in list(instances) + list(volumes):
+        launch_run = get_launch_run_tag(resource)
+        if launch_run:
+            unique_launch_runs.add(launch_run)
 
-    unique_launch_runs = set()
+    return unique_launch_runs
+
+
+def scan_launch_runs(regions, max_workers=8):
+    """
+    Scans regions concurrently and yields (region, launch_runs) as each finishes.
+
+    Regions that fail (for example because they are not enabled) are logged and skipped.
+    """
 
-    # Extracting LaunchRun IDs from instances
-    for instance in instances:
-        for tag in instance.tags:
-            if tag["Key"] == "LaunchRun":
-                unique_launch_runs.add(tag["Value"])
+    def scan_region(region):
+        return find_launch_runs(initialize_aws_client("ec2", region_name=region))
 
-    # Extracting LaunchRun IDs from volumes
-    for volume in response["Volumes"]:
-        for tag in volume["Tags"]:
-            if tag["Key"] == "LaunchRun":
-                unique_launch_runs.add(tag["Value"])
+    for region, launch_runs, error in fan_out(
+        scan_region, regions, max_workers=max_workers
+    ):
+        if error is not None:
+            logging.error(f"Failed to list LaunchRuns in {region}: {error}")
+            continue
+        yield region, launch_runs
+
+
+def list_unique_launch_runs(ec2_client, ec2_resource, region):
+    unique_launch_runs = find_launch_runs(ec2_client)
 
     if not unique_launch_runs:
         # print("No active LaunchRuns found.")
@@ -400,6 +523,7 @@ def handle_user_inputs(**kwargs):
     ec2_client = kwargs.get("ec2_client")
     vol_type = kwargs.get("vol_type")
     clustername = kwargs.get("clustername")
+    topology = kwargs.get("topology") or RegionTopology.load(ec2_client)
 
     if instance_count is None:
         instance_count = int(input("Please enter the number of instances: "))
@@ -424,7 +548,7 @@ def handle_user_inputs(**kwargs):
         print(f"ClusterName Tag: {clustername}")
 
     if key_name is None:
-        available_keys = get_key_pairs(ec2_client)
+        available_keys = aws_utilities.get_key_pairs(ec2_client)
         if available_keys:
             key_name = prompt_for_choice(
                 available_keys + ["Create new key pair", "Proceed without key pair"],
@@ -449,17 +573,17 @@ def handle_user_inputs(**kwargs):
 
     if vpc is None:
         selected_option = prompt_for_choice(
-            get_vpcs_with_names(ec2_client), "Please select a VPC (by number): "
+            topology.vpcs_with_names(), "Please select a VPC (by number): "
         )
         vpc = selected_option[0]
     if az is None:
         az = prompt_for_choice(
-            get_availability_zones_for_vpc(ec2_client, vpc),
+            topology.availability_zones_for_vpc(vpc),
             "Please select an availability zone (by number): ",
         )
     if security_group is None:
         selected_option = prompt_for_choice(
-            get_security_groups_for_vpc(ec2_client, vpc),
+            topology.security_groups_for_vpc(vpc),
             "Please select a Security Group (by number): ",
         )
         security_group = selected_option[0]
@@ -486,6 +610,7 @@ def prepare_launch_params(**kwargs):
     vpc = kwargs.get("vpc")
     vol_type = kwargs.get("vol_type", "gp3")
     key_name = kwargs.get("key_name", None)
+    topology = kwargs.get("topology") or RegionTopology.load(ec2_client)
 
     ami_id = get_latest_amazon_linux_ami(ec2_client)
     block_device_mappings = []
@@ -514,10 +639,10 @@ def prepare_launch_params(**kwargs):
             }
         )
     user_data_script = get_user_data_script()
-    subnet_id = get_subnet_id_for_az_and_vpc(ec2_client=ec2_client, az=az, vpc_id=vpc)
-    validate_sg_and_subnet(
-        ec2_client=ec2_client, security_group=security_group, subnet_id=subnet_id
-    )
+    subnet_id = topology.subnet_id_for_az_and_vpc(az=az, vpc_id=vpc)
+    if subnet_id is None:
+        raise ValueError("No subnet found for the given availability zone and VPC.")
+    topology.validate_sg_and_subnet(security_group=security_group, subnet_id=subnet_id)
     launch_params = {
         "ImageId": ami_id,
         "InstanceType": "m5.large",
@@ -537,79 +662,174 @@ def prepare_launch_params(**kwargs):
     return launch_params
 
 
+def launch_instances_in_chunks(
+    ec2_client, launch_params, instance_count, subnets, chunk_size=None
+):
+    """
+    Launches instance_count instances with as few RunInstances calls as possible.
+
+    Each call asks for up to chunk_size instances (MinCount=1, MaxCount=chunk). If a
+    subnet runs out of capacity, either through a capacity error or by returning fewer
+    instances than asked for, the shortfall is retried in the next subnet.
+
+    :param ec2_client: The boto3 EC2 client.
+    :param launch_params: RunInstances parameters; MinCount/MaxCount/SubnetId/Placement are overridden.
+    :param instance_count: Total number of instances wanted.
+    :param subnets: Ordered list of (subnet_id, availability_zone) to try.
+    :param chunk_size: Instances per call. Defaults to Config.LAUNCH_CHUNK_SIZE.
+    :return: (instance_ids, chunk_report) where chunk_report has one dict per call.
+    """
+    chunk_size = chunk_size or Config.LAUNCH_CHUNK_SIZE
+    instance_ids = []
+    chunk_report = []
+    subnet_index = 0
+
+    while len(instance_ids) < instance_count and subnet_index < len(subnets):
+        subnet_id, az = subnets[subnet_index]
+        requested = min(chunk_size, instance_count - len(instance_ids))
+        params = dict(
+            launch_params,
+            MinCount=1,
+            MaxCount=requested,
+            SubnetId=subnet_id,
+            Placement={"AvailabilityZone": az},
+        )
+        chunk = {
+            "subnet_id": subnet_id,
+            "az": az,
+            "requested": requested,
+            "launched": 0,
+            "error": None,
+        }
+        chunk_report.append(chunk)
+
+        try:
+            response = ec2_client.run_instances(**params)
+        except ClientError as e:
+            chunk["error"] = e.response["Error"]["Code"]
+            if chunk["error"] in CAPACITY_ERROR_CODES:
+                logging.warning(
+                    f"{chunk['error']} in {az} ({subnet_id}); trying the next subnet."
+                )
+                subnet_index += 1
+                continue
+            logging.error(f"RunInstances failed in {az} ({subnet_id}): {e}")
+            break
+
+        launched = [instance["InstanceId"] for instance in response["Instances"]]
+        chunk["launched"] = len(launched)
+        instance_ids.extend(launched)
+        if len(launched) < requested:
+            # EC2 filled only part of the request; treat the subnet as exhausted.
+            subnet_index += 1
+
+    return instance_ids, chunk_report
+
+
+def build_status_row(instance, key_name, region):
+    instance_id = instance["InstanceId"]
+    public_ip = instance.get("PublicIpAddress", "")
+    terminate_command = (
+        f"aws ec2 terminate-instances --instance-ids {instance_id} --region {region}"
+    )
+    ssh_command = "No SSH (no key pair)."
+    if key_name:
+        ssh_command = f"ssh -i {KEY_PATH}/{key_name}.pem ec2-user@{public_ip}"
+    return (
+        instance_id,
+        instance["State"]["Name"],
+        public_ip,
+        instance.get("PrivateIpAddress", ""),
+        terminate_command,
+        ssh_command,
+    )
+
+
 def monitor_instance_status(
     instance_ids, ec2_client, style, key_name, region, quiet=False
 ):
-    all_running = False
-    while not all_running:
-        summary_table = []
-        for instance_id in instance_ids:
-            for _ in range(2):  # Two attempts
-                try:
-                    response = ec2_client.describe_instances(InstanceIds=[instance_id])
-                    break  # Exit the loop if successful
-                except Exception as e:
-                    if _ == 0:  # First attempt
-                        time.sleep(10)
-                    else:  # Second attempt
-                        print(f"Failed to describe instance {instance_id}. Exiting.")
-                        print(f"Error: {e}")
-                        exit(1)
-
-            instance = response["Reservations"][0]["Instances"][0]
-            status = instance["State"]["Name"]
-            public_ip = instance.get("PublicIpAddress", "")
-            private_ip = instance["PrivateIpAddress"]
-            terminate_command = f"aws ec2 terminate-instances --instance-ids {instance_id} --region {region}"
-            ssh_command = "No SSH (no key pair)."
-            if key_name:
-                ssh_command = f"ssh -i {KEY_PATH}/{key_name}.pem ec2-user@{public_ip}"
-
-            summary_table.append(
-                (
-                    instance_id,
-                    status,
-                    public_ip,
-                    private_ip,
-                    terminate_command,
-                    ssh_command,
-                )
+    """
+    Polls the launched instances until each leaves its pending/stopping transition.
+
+    All tracked instances are described together in batched calls. Instances stop
+    being polled once they settle (see SETTLED_INSTANCE_STATES), only rows that
+    changed are printed on each tick, and the poll interval backs off while nothing
+    changes. Polling gives up after Config.MONITOR_TIMEOUT seconds or
+    Config.MONITOR_MAX_FAILURES consecutive failed describe calls.
+
+    Returns:
+    list: IDs of the instances that had not settled when polling stopped.
+    """
+    headers = [
+        "Instance ID",
+        "Status",
+        "Public IP",
+        "Private IP",
+        "Terminate Command",
+        "SSH Command",
+    ]
+    rows = {}
+    pending = set(instance_ids)
+    interval = Config.MONITOR_MIN_INTERVAL
+    deadline = time.monotonic() + Config.MONITOR_TIMEOUT
+    failures = 0
+
+    while pending:
+        changed = []
+        try:
+            instances = list(
+                aws_utilities.iter_instances(ec2_client, instance_ids=sorted(pending))
             )
-        all_running = all(row[1] == "running" for row in summary_table)
-        if not all_running:
-            if not quiet:
-                print("--- Progress Update ---")
-                print(
-                    tabulate(
-                        summary_table,
-                        headers=[
-                            "Instance ID",
-                            "Status",
-                            "Public IP",
-                            "Private IP",
-                            "Terminate Command",
-                            "SSH Command",
-                        ],
-                        tablefmt=style,
-                    )
-                )
-            time.sleep(3)
+            failures = 0
+        except ClientError as e:
+            failures += 1
+            logging.warning(f"Failed to describe instances, retrying: {e}")
+            instances = []
+
+        for instance in instances:
+            row = build_status_row(instance, key_name, region)
+            if rows.get(row[0]) != row:
+                rows[row[0]] = row
+                changed.append(row)
+            if row[1] in SETTLED_INSTANCE_STATES:
+                pending.discard(row[0])
+                if row[1] != "running":
+                    logging.warning(f"Instance {row[0]} entered state {row[1]}.")
+
+        if changed and not quiet:
+            print("--- Progress Update ---")
+            print(tabulate(changed, headers=headers, tablefmt=style))
+
+        if not pending:
+            break
+        if failures >= Config.MONITOR_MAX_FAILURES or time.monotonic() >= deadline:
+            logging.warning(
+                f"Stopped monitoring; {len(pending)} instances have not settled: "
+                f"{', '.join(sorted(pending))}"
+            )
+            break
+        if changed:
+            interval = Config.MONITOR_MIN_INTERVAL
+        else:
+            interval = min(
+                interval * Config.MONITOR_BACKOFF_FACTOR, Config.MONITOR_MAX_INTERVAL
+            )
+        time.sleep(interval)
+
     if not quiet:
         print("=== Summary ===")
         print(
             tabulate(
-                summary_table,
-                headers=[
-                    "Instance ID",
-                    "Status",
-                    "Public IP",
-                    "Private IP",
-                    "Terminate Command",
-                    "SSH Command",
+                [
+                    rows[instance_id]
+                    for instance_id in instance_ids
+                    if instance_id in rows
                 ],
+                headers=headers,
                 tablefmt=style,
             )
         )
+    return sorted(pending)
 
 
 def launch_instances(**kwargs):
@@ -633,6 +853,10 @@ def launch_instances(**kwargs):
     if quiet:
         print(f"{launch_run_id}")
 
+    # One snapshot of the region's network layout serves every VPC, AZ, subnet and
+    # security group lookup below.
+    topology = RegionTopology.load(ec2_client)
+
     user_inputs = {
         "instance_count": instance_count,
         "volume_count": volume_count,
@@ -643,6 +867,7 @@ def launch_instances(**kwargs):
         "ec2_client": ec2_client,
         "vol_type": vol_type,
         "clustername": clustername,
+        "topology": topology,
     }
 
     returned_user_inputs = handle_user_inputs(**user_inputs)
@@ -665,6 +890,7 @@ def launch_instances(**kwargs):
         "vpc": vpc,
         "key_name": key_name,
         "vol_type": vol_type,
+        "topology": topology,
     }
     launch_params = prepare_launch_params(**launch_params_input)
 
@@ -691,12 +917,32 @@ def launch_instances(**kwargs):
             ],
         },
     ]
-    instance_ids = []
-    for i in range(instance_count):
-        response = ec2_client.run_instances(**launch_params)
-        instance_id = response["Instances"][0]["InstanceId"]
-        instance_ids.append(instance_id)
-        logging.info(f"Launched instance {i+1}: {instance_id}")
+    # The selected AZ's subnet goes first; the VPC's other subnets are fallbacks
+    # for when that AZ runs out of capacity.
+    launch_subnets = [(launch_params["SubnetId"], az)] + [
+        (subnet_id, topology.availability_zone_for_subnet(subnet_id))
+        for subnet_id in topology.subnets_for_vpc(vpc)
+        if subnet_id != launch_params["SubnetId"]
+    ]
+    instance_ids, chunk_report = launch_instances_in_chunks(
+        ec2_client=ec2_client,
+        launch_params=launch_params,
+        instance_count=instance_count,
+        subnets=launch_subnets,
+    )
+    for chunk in chunk_report:
+        logging.info(
+            f"Chunk {chunk['subnet_id']} ({chunk['az']}): requested {chunk['requested']}, "
+            f"launched {chunk['launched']}"
+            + (f", error {chunk['error']}" if chunk["error"] else "")
+        )
+    if len(instance_ids) < instance_count:
+        logging.warning(
+            f"Launched {len(instance_ids)} of {instance_count} requested instances."
+        )
+    if not instance_ids:
+        logging.error("No instances were launched.")
+        return
 
     monitor_instance_status(
         instance_ids=instance_ids,
@@ -750,7 +996,10 @@ def parse_args():
         "--style", type=str, default="plain", help="Table style for tabulate."
     )
     parser.add_argument(
-        "--terminate", type=str, help="Terminate instances by LaunchRun ID."
+        "--terminate",
+        type=str,
+        nargs="+",
+        help="Terminate instances and leftover volumes by LaunchRun ID(s). Without --region, all regions are searched.",
     )
     parser.add_argument(
         "--launchrun-list", action="store_true", help="List all unique LaunchRun IDs."
@@ -774,6 +1023,13 @@ def parse_args():
     parser.add_argument(
         "--no-wait", action="store_true", help="Do not wait for instances to terminate."
     )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        help="Maximum regions processed concurrently by --launchrun-list and --terminate.",
+    )
+    add_cache_arguments(parser)
 
     return parser.parse_args()
 
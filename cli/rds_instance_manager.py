@@ -14,6 +14,7 @@ from common.aws_utilities import (
     get_security_groups_for_vpc,
 )
 from common.aws_client import initialize_aws_client
+from common.cache_utilities import add_cache_arguments, configure_cache_from_args
 
 logger = setup_logging()
 
@@ -100,6 +101,7 @@ def main():
     region_list = ["us-east-1", "us-east-2", "us-west-2", "eu-west-1"]
     rds_engine_list = ["postgres", "mysql", "mariadb"]
     parser = argparse.ArgumentParser(description="RDS Instance Management Tool")
+    add_cache_arguments(parser)
     subparsers = parser.add_subparsers(dest="command")
 
     # Create parser
@@ -150,6 +152,7 @@ def main():
     )
 
     args = parser.parse_args()
+    configure_cache_from_args(args)
 
     # Check if a command is provided
     if not args.command:
@@ -188,10 +191,12 @@ def main():
             vpcs = get_vpcs(region_name=args.region)
             args.vpc = prompt_for_choice(vpcs, "Choose a VPC: ")
         if not args.subnet:
-            subnets = get_subnets_for_vpc(args.vpc)
+            subnets = get_subnets_for_vpc(args.vpc, region_name=args.region)
             args.subnet = prompt_for_choice(subnets, "Choose a Subnet: ")
         if not args.security_group:
-            security_groups = get_security_groups_for_vpc(args.vpc)
+            security_groups = get_security_groups_for_vpc(
+                args.vpc, region_name=args.region
+            )
             args.security_group = prompt_for_choice(
                 security_groups, "Choose a Security Group: "
             )
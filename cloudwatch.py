@@ -1,28 +1,78 @@
 import argparse
+import json
+import sys
+from common.cache_utilities import add_cache_arguments, configure_cache_from_args
+from common.output_utilities import Column, add_output_arguments, get_output_writer
+from cloudwatch.alarm_inventory import iter_alarms
 from cloudwatch.cloudwatch_utilities import (
-    list_cloudwatch_dashboards,
-    list_cloudwatch_alarms,
+    iter_cloudwatch_dashboards,
     get_dashboard_details,
 )
 
+DASHBOARD_COLUMNS = [
+    Column("name", "Dashboard"),
+    Column("last_modified", "Last Modified"),
+    Column("size", "Size"),
+]
 
-def list_dashboards_cli(detailed=False):
-    dashboards = list_cloudwatch_dashboards()
-    for dashboard in dashboards:
-        print(dashboard)
-        if detailed:
-            details = get_dashboard_details(dashboard)
-            print("Details:", details)
+ALARM_COLUMNS = [
+    Column("name", "Alarm"),
+    Column("state", "State"),
+    Column("namespace", "Namespace"),
+    Column("metric_name", "Metric"),
+    Column("threshold", "Threshold"),
+]
 
+ALARM_FIELDS = ("AlarmName", "StateValue", "Namespace", "MetricName", "Threshold")
 
-def list_alarms_cli():
-    alarms = list_cloudwatch_alarms()
-    for alarm in alarms:
-        print(alarm)
+
+def write_rows(rows, columns, output_format):
+    try:
+        with get_output_writer(output_format, columns) as writer:
+            writer.write_rows(rows)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def list_dashboards_cli(detailed=False, output_format="table"):
+    columns = DASHBOARD_COLUMNS + (
+        [Column("details", "Details", json.dumps)] if detailed else []
+    )
+
+    def rows():
+        for dashboard in iter_cloudwatch_dashboards():
+            row = {
+                "name": dashboard["DashboardName"],
+                "last_modified": dashboard.get("LastModified"),
+                "size": dashboard.get("Size"),
+            }
+            if detailed:
+                row["details"] = get_dashboard_details(dashboard["DashboardName"])
+            yield row
+
+    write_rows(rows(), columns, output_format)
+
+
+def list_alarms_cli(output_format="table"):
+    # Only the listed fields are kept from each describe_alarms page as it streams in
+    rows = (
+        {
+            "name": alarm["AlarmName"],
+            "state": alarm.get("StateValue"),
+            "namespace": alarm.get("Namespace"),
+            "metric_name": alarm.get("MetricName"),
+            "threshold": alarm.get("Threshold"),
+        }
+        for alarm in iter_alarms(fields=ALARM_FIELDS)
+    )
+    write_rows(rows, ALARM_COLUMNS, output_format)
 
 
 def main():
     parser = argparse.ArgumentParser(description="AWS CloudWatch Management Tool")
+    add_cache_arguments(parser)
+    add_output_arguments(parser)
     subparsers = parser.add_subparsers(dest="command", help="Commands")
 
     # Command to list CloudWatch dashboards
@@ -41,11 +91,12 @@ def main():
     )
 
     args = parser.parse_args()
+    configure_cache_from_args(args)
 
     if args.command == "list-dashboards":
-        list_dashboards_cli(args.detailed)
+        list_dashboards_cli(args.detailed, output_format=args.output)
     elif args.command == "list-alarms":
-        list_alarms_cli()
+        list_alarms_cli(output_format=args.output)
     else:
         parser.print_help()
 
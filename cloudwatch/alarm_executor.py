@@ -0,0 +1,97 @@
+from common.concurrency_utilities import TokenBucket, call_with_backoff, fan_out
+from common.logging_utilities import setup_logging
+
+logger = setup_logging()
+
+# Default CloudWatch quota for PutMetricAlarm/DeleteAlarms is 3 TPS per account and
+# region. Raise these if the account has an increased quota.
+DEFAULT_WRITE_TPS = 3
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_ATTEMPTS = 6
+# DeleteAlarms accepts at most 100 alarm names per request.
+DELETE_ALARMS_BATCH_SIZE = 100
+
+
+class AlarmWriteExecutor:
+    """
+    Runs CloudWatch alarm writes on a thread pool behind a shared token bucket.
+
+    Every call, whichever worker makes it, draws from the same limiter, so the
+    executor as a whole stays at or below `rate` requests per second. Throttling
+    errors are retried with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        cloudwatch_client,
+        rate=DEFAULT_WRITE_TPS,
+        max_workers=DEFAULT_MAX_WORKERS,
+        max_attempts=DEFAULT_MAX_ATTEMPTS,
+    ):
+        self.cloudwatch = cloudwatch_client
+        self.limiter = TokenBucket(rate)
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+
+    def _call(self, func, **kwargs):
+        def attempt():
+            self.limiter.acquire()
+            return func(**kwargs)
+
+        return call_with_backoff(attempt, max_attempts=self.max_attempts)
+
+    def put_metric_alarms(self, alarm_specs):
+        """
+        Creates or updates alarms concurrently.
+
+        Parameters:
+        alarm_specs (iterable): put_metric_alarm keyword dicts, each with an AlarmName.
+
+        Returns:
+        dict: Maps each AlarmName to None on success or the error message on failure.
+        """
+
+        def put(spec):
+            self._call(self.cloudwatch.put_metric_alarm, **spec)
+
+        results = {}
+        for spec, _, error in fan_out(
+            put, list(alarm_specs), max_workers=self.max_workers
+        ):
+            name = spec["AlarmName"]
+            if error is None:
+                logger.info(f"Alarm {name} written.")
+                results[name] = None
+            else:
+                logger.error(f"Error writing alarm {name}: {error}")
+                results[name] = str(error)
+        return results
+
+    def delete_alarms(self, alarm_names, batch_size=DELETE_ALARMS_BATCH_SIZE):
+        """
+        Deletes alarms in batches of up to 100 names, running the batches concurrently.
+
+        Parameters:
+        alarm_names (iterable): The alarm names to delete.
+        batch_size (int, optional): Names per DeleteAlarms request. Defaults to 100.
+
+        Returns:
+        dict: Maps each alarm name to None on success or the error message on failure.
+        """
+        names = sorted(set(alarm_names))
+        batches = [
+            tuple(names[i : i + batch_size]) for i in range(0, len(names), batch_size)
+        ]
+
+        def delete(batch):
+            self._call(self.cloudwatch.delete_alarms, AlarmNames=list(batch))
+
+        results = {}
+        for batch, _, error in fan_out(delete, batches, max_workers=self.max_workers):
+            if error is None:
+                logger.info(f"Deleted {len(batch)} alarms.")
+            else:
+                logger.error(f"Error deleting {len(batch)} alarms: {error}")
+            for name in batch:
+                results[name] = None if error is None else str(error)
+        return results
@@ -0,0 +1,114 @@
+from common.aws_client import initialize_aws_client
+from common.logging_utilities import setup_logging
+
+logger = setup_logging()
+
+# describe_alarms response keys per AlarmTypes value.
+ALARM_RESULT_KEYS = {
+    "MetricAlarm": "MetricAlarms",
+    "CompositeAlarm": "CompositeAlarms",
+}
+DEFAULT_PAGE_SIZE = 100
+
+
+def iter_alarms(
+    cloudwatch_client=None,
+    region_name=None,
+    prefix=None,
+    alarm_types=("MetricAlarm",),
+    state=None,
+    action_prefix=None,
+    fields=None,
+    page_size=DEFAULT_PAGE_SIZE,
+):
+    """
+    Streams alarms from describe_alarms with the filters applied server side.
+
+    Name prefix, alarm type, state and action prefix are all sent as describe_alarms
+    parameters, so alarms owned by other tools or teams are never paged in. Each page
+    is projected down to `fields` before the next one is requested.
+
+    Parameters:
+    cloudwatch_client (boto3.client, optional): A CloudWatch client. If None, one is initialized.
+    region_name (str, optional): The AWS region to use when a client is initialized.
+    prefix (str, optional): AlarmNamePrefix filter.
+    alarm_types (iterable, optional): "MetricAlarm" and/or "CompositeAlarm". Defaults to metric alarms.
+    state (str, optional): StateValue filter: "OK", "ALARM" or "INSUFFICIENT_DATA".
+    action_prefix (str, optional): ActionPrefix filter, e.g. an SNS topic ARN.
+    fields (iterable, optional): Keys to keep from each alarm. None keeps the full record.
+    page_size (int, optional): MaxRecords per page (1-100). Defaults to 100.
+
+    Yields:
+    dict: One (projected) alarm record per alarm.
+    """
+    if cloudwatch_client is None:
+        cloudwatch_client = initialize_aws_client("cloudwatch", region_name=region_name)
+    if cloudwatch_client is None:
+        raise RuntimeError("Failed to initialize CloudWatch client.")
+
+    alarm_types = list(alarm_types or ALARM_RESULT_KEYS)
+    unknown = set(alarm_types) - set(ALARM_RESULT_KEYS)
+    if unknown:
+        raise ValueError(f"Unsupported alarm types: {', '.join(sorted(unknown))}")
+
+    kwargs = {"AlarmTypes": alarm_types, "MaxRecords": page_size}
+    if prefix:
+        kwargs["AlarmNamePrefix"] = prefix
+    if state:
+        kwargs["StateValue"] = state
+    if action_prefix:
+        kwargs["ActionPrefix"] = action_prefix
+
+    fields = tuple(fields) if fields else None
+    result_keys = [ALARM_RESULT_KEYS[alarm_type] for alarm_type in alarm_types]
+    paginator = cloudwatch_client.get_paginator("describe_alarms")
+    for page in paginator.paginate(**kwargs):
+        for result_key in result_keys:
+            for alarm in page.get(result_key, []):
+                if fields is None:
+                    yield alarm
+                else:
+                    yield {field: alarm[field] for field in fields if field in alarm}
+
+
+def get_alarm_names(cloudwatch_client=None, region_name=None, **filters):
+    """
+    Returns the names of the alarms matching the iter_alarms filters.
+
+    Returns:
+    set: Alarm names, for O(1) membership checks.
+    """
+    names = {
+        alarm["AlarmName"]
+        for alarm in iter_alarms(
+            cloudwatch_client=cloudwatch_client,
+            region_name=region_name,
+            fields=("AlarmName",),
+            **filters,
+        )
+    }
+    logger.debug(f"Found {len(names)} alarms matching {filters}")
+    return names
+
+
+def get_alarm_index(cloudwatch_client=None, region_name=None, fields=None, **filters):
+    """
+    Returns the alarms matching the iter_alarms filters keyed by name.
+
+    Parameters:
+    fields (iterable, optional): Keys to keep per alarm; AlarmName is always kept.
+
+    Returns:
+    dict: Maps AlarmName to the projected alarm record.
+    """
+    if fields is not None:
+        fields = ("AlarmName",) + tuple(f for f in fields if f != "AlarmName")
+    return {
+        alarm["AlarmName"]: alarm
+        for alarm in iter_alarms(
+            cloudwatch_client=cloudwatch_client,
+            region_name=region_name,
+            fields=fields,
+            **filters,
+        )
+    }
@@ -0,0 +1,215 @@
+import hashlib
+import json
+from cloudwatch.alarm_executor import AlarmWriteExecutor
+from cloudwatch.alarm_inventory import get_alarm_index
+from common.logging_utilities import setup_logging
+
+logger = setup_logging()
+
+# put_metric_alarm fields that define an alarm. Everything else describe_alarms
+# returns (ARN, state, timestamps) is read-only and ignored when comparing.
+RECONCILED_FIELDS = (
+    "AlarmName",
+    "AlarmDescription",
+    "ActionsEnabled",
+    "OKActions",
+    "AlarmActions",
+    "InsufficientDataActions",
+    "MetricName",
+    "Namespace",
+    "Statistic",
+    "ExtendedStatistic",
+    "Dimensions",
+    "Period",
+    "Unit",
+    "EvaluationPeriods",
+    "DatapointsToAlarm",
+    "Threshold",
+    "ComparisonOperator",
+    "TreatMissingData",
+    "EvaluateLowSampleCountPercentile",
+    "Metrics",
+    "ThresholdMetricId",
+)
+# Fields CloudWatch unions as sets, so their order carries no meaning.
+_UNORDERED_FIELDS = ("OKActions", "AlarmActions", "InsufficientDataActions")
+
+
+def _normalize_value(value):
+    if isinstance(value, dict):
+        normalized = {key: _normalize_value(item) for key, item in value.items()}
+        if "Id" in normalized and "ReturnData" not in normalized:
+            # A metric query without ReturnData defaults to returning data
+            normalized["ReturnData"] = True
+        if "Dimensions" in normalized:
+            normalized["Dimensions"] = sorted(
+                normalized["Dimensions"], key=lambda d: (d["Name"], d["Value"])
+            )
+        return {
+            key: item for key, item in normalized.items() if item not in (None, [], {})
+        }
+    if isinstance(value, list):
+        return [_normalize_value(item) for item in value]
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    return value
+
+
+def normalize_alarm(alarm):
+    """
+    Reduces an alarm to the fields in RECONCILED_FIELDS in a canonical form.
+
+    Accepts either a put_metric_alarm spec or a describe_alarms record. Empty values
+    and defaults are dropped, numbers become floats, and action lists and dimensions
+    are sorted, so the two shapes of the same alarm normalize identically.
+
+    Parameters:
+    alarm (dict): A put_metric_alarm spec or describe_alarms MetricAlarms entry.
+
+    Returns:
+    dict: The canonical alarm configuration.
+    """
+    normalized = {}
+    for field in RECONCILED_FIELDS:
+        value = alarm.get(field)
+        if value in (None, [], ""):
+            continue
+        if field in _UNORDERED_FIELDS:
+            value = sorted(set(value))
+        normalized[field] = _normalize_value(value)
+    if normalized.get("ActionsEnabled") is True:
+        del normalized["ActionsEnabled"]
+    return normalized
+
+
+def alarm_fingerprint(alarm):
+    """
+    Returns a stable SHA-256 hex digest of the alarm's canonical configuration.
+    """
+    payload = json.dumps(normalize_alarm(alarm), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def fetch_actual_alarms(cloudwatch_client, prefix=None, page_size=100):
+    """
+    Reads the existing metric alarms, optionally limited to a name prefix, in bulk.
+
+    Only the fields used for comparison are kept from each describe_alarms page.
+
+    Returns:
+    dict: Maps AlarmName to its projected describe_alarms record.
+    """
+    return get_alarm_index(
+        cloudwatch_client=cloudwatch_client,
+        prefix=prefix,
+        fields=RECONCILED_FIELDS,
+        page_size=page_size,
+    )
+
+
+def plan_reconciliation(desired_specs, actual_alarms, delete_extra=True, keep=None):
+    """
+    Diffs desired alarm specs against existing alarms by content hash.
+
+    Parameters:
+    desired_specs (iterable): put_metric_alarm keyword dicts, each with an AlarmName.
+    actual_alarms (dict): AlarmName -> describe_alarms record, e.g. from fetch_actual_alarms.
+    delete_extra (bool, optional): Plan deletes for existing alarms that are not desired.
+    keep (iterable, optional): Alarm names that are never deleted, even when not desired.
+
+    Returns:
+    dict: {"create": [specs], "update": [specs], "delete": [names], "unchanged": [names]}
+    """
+    plan = {"create": [], "update": [], "delete": [], "unchanged": []}
+    desired_names = set()
+    for spec in desired_specs:
+        name = spec["AlarmName"]
+        desired_names.add(name)
+        actual = actual_alarms.get(name)
+        if actual is None:
+            plan["create"].append(spec)
+        elif alarm_fingerprint(actual) != alarm_fingerprint(spec):
+            logger.debug(f"Alarm {name} drifted from its desired configuration")
+            plan["update"].append(spec)
+        else:
+            plan["unchanged"].append(name)
+    if delete_extra:
+        plan["delete"] = sorted(set(actual_alarms) - desired_names - set(keep or ()))
+    return plan
+
+
+def apply_reconciliation(plan, cloudwatch_client=None, executor=None):
+    """
+    Issues the writes in a plan: put_metric_alarm for creates and updates, and
+    batched delete_alarms for deletes. An empty plan makes no API calls.
+
+    Returns:
+    dict: Maps each written alarm name to None on success or the error message.
+    """
+    writes = plan["create"] + plan["update"]
+    if not writes and not plan["delete"]:
+        return {}
+    if executor is None:
+        executor = AlarmWriteExecutor(cloudwatch_client)
+    results = {}
+    if writes:
+        results.update(executor.put_metric_alarms(writes))
+    if plan["delete"]:
+        results.update(executor.delete_alarms(plan["delete"]))
+    return results
+
+
+def reconcile_alarms(
+    cloudwatch_client,
+    desired_specs,
+    prefix=None,
+    delete_extra=True,
+    dry_run=False,
+    executor=None,
+    keep=None,
+):
+    """
+    Brings the alarms under prefix in line with desired_specs.
+
+    Parameters:
+    cloudwatch_client (boto3.client): A CloudWatch client.
+    desired_specs (iterable): put_metric_alarm keyword dicts, each with an AlarmName.
+    prefix (str, optional): Only alarms with this name prefix are considered managed.
+    delete_extra (bool, optional): Delete managed alarms that are no longer desired.
+    dry_run (bool, optional): Plan only; make no write calls.
+    executor (AlarmWriteExecutor, optional): Executor to issue writes with.
+    keep (iterable, optional): Managed alarm names that must not be deleted.
+
+    Returns:
+    tuple: (plan, results) as returned by plan_reconciliation and apply_reconciliation.
+    """
+    actual_alarms = fetch_actual_alarms(cloudwatch_client, prefix=prefix)
+    plan = plan_reconciliation(
+        desired_specs, actual_alarms, delete_extra=delete_extra, keep=keep
+    )
+    logger.info(
+        f"Reconcile plan: {len(plan['create'])} create, {len(plan['update'])} update, "
+        f"{len(plan['delete'])} delete, {len(plan['unchanged'])} unchanged"
+    )
+    if dry_run:
+        return plan, {}
+    executor = executor or AlarmWriteExecutor(cloudwatch_client)
+    return plan, apply_reconciliation(plan, executor=executor)
+
+
+def print_reconciliation(label, plan, results=None):
+    """
+    Prints a plan as a diff: + create, ~ update, - delete, with any write failures.
+    """
+    results = results or {}
+    print(
+        f"Plan for {label}: {len(plan['create'])} to create, {len(plan['update'])} to update, "
+        f"{len(plan['delete'])} to delete, {len(plan['unchanged'])} unchanged."
+    )
+    for action, symbol in (("create", "+"), ("update", "~"), ("delete", "-")):
+        for item in plan[action]:
+            name = item if action == "delete" else item["AlarmName"]
+            error = results.get(name)
+            print(f"  {symbol} {name}" + (f" (failed: {error})" if error else ""))
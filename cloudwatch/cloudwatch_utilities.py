@@ -1,30 +1,40 @@
-import boto3
 import json
+from cloudwatch.alarm_inventory import iter_alarms
 from common.aws_client import initialize_aws_client
+from common.aws_utilities import iter_paginated
 
 
 def list_cloudwatch_alarms(region_name=None):
-    client = initialize_aws_client("cloudwatch", region_name=region_name)
-    if client is None:
-        return []
-
     try:
-        response = client.describe_alarms()
-        return [alarm["AlarmName"] for alarm in response["MetricAlarms"]]
+        return [
+            alarm["AlarmName"]
+            for alarm in iter_alarms(region_name=region_name, fields=("AlarmName",))
+        ]
     except Exception as e:
         print(f"Error listing CloudWatch alarms: {e}")
         return []
 
 
-def list_cloudwatch_dashboards(region_name=None):
-    client = initialize_aws_client("cloudwatch", region_name=region_name)
-    if client is None:
-        return []
+def iter_cloudwatch_dashboards(region_name=None, cloudwatch_client=None, **kwargs):
+    """
+    Yields dashboard entries across all list_dashboards pages.
 
+    Extra keyword arguments (e.g. DashboardNamePrefix) are passed to list_dashboards.
+    """
+    if cloudwatch_client is None:
+        cloudwatch_client = initialize_aws_client("cloudwatch", region_name=region_name)
+    if cloudwatch_client is None:
+        return
+    yield from iter_paginated(
+        cloudwatch_client, "list_dashboards", "DashboardEntries", **kwargs
+    )
+
+
+def list_cloudwatch_dashboards(region_name=None):
     try:
-        response = client.list_dashboards()
         return [
-            dashboard["DashboardName"] for dashboard in response["DashboardEntries"]
+            dashboard["DashboardName"]
+            for dashboard in iter_cloudwatch_dashboards(region_name=region_name)
         ]
     except Exception as e:
         print(f"Error listing CloudWatch dashboards: {e}")
@@ -0,0 +1,155 @@
+import datetime
+from collections import namedtuple
+from common.aws_client import initialize_aws_client
+from common.logging_utilities import setup_logging
+
+logger = setup_logging()
+
+# GetMetricData accepts at most 500 MetricDataQueries per request.
+MAX_QUERIES_PER_REQUEST = 500
+
+# A single metric to fetch. Dimensions are stored as a sorted tuple of (name, value)
+# pairs so requests are hashable and can be used as keys in the result dict.
+MetricRequest = namedtuple(
+    "MetricRequest", ["namespace", "metric_name", "dimensions", "stat", "period"]
+)
+
+
+def metric_request(namespace, metric_name, dimensions, stat="Average", period=300):
+    """
+    Builds a MetricRequest.
+
+    Parameters:
+    namespace (str): The CloudWatch namespace, e.g. "AWS/RDS".
+    metric_name (str): The metric name, e.g. "FreeStorageSpace".
+    dimensions (dict or list): Either a {name: value} dict or a list of {"Name": ..., "Value": ...} dicts.
+    stat (str, optional): The statistic to retrieve. Defaults to "Average".
+    period (int, optional): The period in seconds. Defaults to 300.
+
+    Returns:
+    MetricRequest: A hashable request that can be passed to get_metric_data_bulk.
+    """
+    if isinstance(dimensions, dict):
+        pairs = dimensions.items()
+    else:
+        pairs = [(d["Name"], d["Value"]) for d in dimensions]
+    return MetricRequest(namespace, metric_name, tuple(sorted(pairs)), stat, period)
+
+
+def _build_query(query_id, request):
+    return {
+        "Id": query_id,
+        "MetricStat": {
+            "Metric": {
+                "Namespace": request.namespace,
+                "MetricName": request.metric_name,
+                "Dimensions": [
+                    {"Name": name, "Value": value} for name, value in request.dimensions
+                ],
+            },
+            "Period": request.period,
+            "Stat": request.stat,
+        },
+        "ReturnData": True,
+    }
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def get_metric_data_bulk(
+    requests,
+    start_time,
+    end_time,
+    cloudwatch_client=None,
+    region_name=None,
+    scan_by="TimestampAscending",
+):
+    """
+    Fetches many metrics with as few GetMetricData calls as possible.
+
+    Requests are de-duplicated and packed into batches of up to 500 queries. Each batch
+    follows NextToken until CloudWatch has returned every datapoint.
+
+    Parameters:
+    requests (iterable): MetricRequest values, typically built with metric_request().
+    start_time (datetime): Start of the time range.
+    end_time (datetime): End of the time range.
+    cloudwatch_client (boto3.client, optional): A CloudWatch client. If None, one is initialized.
+    region_name (str, optional): The AWS region to use when a client is initialized.
+    scan_by (str, optional): "TimestampAscending" (default) or "TimestampDescending".
+
+    Returns:
+    dict: Maps each MetricRequest to {"Timestamps": [...], "Values": [...], "StatusCode": str}.
+          Requests whose batch failed are absent from the result.
+    """
+    if cloudwatch_client is None:
+        cloudwatch_client = initialize_aws_client("cloudwatch", region_name=region_name)
+    if cloudwatch_client is None:
+        logger.error("Failed to initialize CloudWatch client.")
+        return {}
+
+    unique_requests = list(dict.fromkeys(requests))
+    results = {}
+
+    for batch in _chunks(unique_requests, MAX_QUERIES_PER_REQUEST):
+        ids = {f"q{index}": request for index, request in enumerate(batch)}
+        queries = [_build_query(query_id, request) for query_id, request in ids.items()]
+        series = {
+            request: {"Timestamps": [], "Values": [], "StatusCode": "Complete"}
+            for request in batch
+        }
+
+        kwargs = {
+            "MetricDataQueries": queries,
+            "StartTime": start_time,
+            "EndTime": end_time,
+            "ScanBy": scan_by,
+        }
+        try:
+            while True:
+                response = cloudwatch_client.get_metric_data(**kwargs)
+                for result in response.get("MetricDataResults", []):
+                    entry = series[ids[result["Id"]]]
+                    entry["Timestamps"].extend(result.get("Timestamps", []))
+                    entry["Values"].extend(result.get("Values", []))
+                    entry["StatusCode"] = result.get("StatusCode", "Complete")
+                next_token = response.get("NextToken")
+                if not next_token:
+                    break
+                kwargs["NextToken"] = next_token
+        except Exception as e:
+            logger.error(f"Error retrieving metric data for {len(batch)} queries: {e}")
+            continue
+
+        results.update(series)
+
+    return results
+
+
+def latest_values(results):
+    """
+    Reduces get_metric_data_bulk output to the most recent value per request.
+
+    Parameters:
+    results (dict): The dict returned by get_metric_data_bulk.
+
+    Returns:
+    dict: Maps each MetricRequest to its newest value, or None if there were no datapoints.
+    """
+    latest = {}
+    for request, entry in results.items():
+        pairs = zip(entry["Timestamps"], entry["Values"])
+        newest = max(pairs, key=lambda pair: pair[0], default=None)
+        latest[request] = newest[1] if newest else None
+    return latest
+
+
+def recent_window(minutes):
+    """
+    Returns a (start_time, end_time) tuple covering the last `minutes` minutes in UTC.
+    """
+    end_time = datetime.datetime.now(datetime.timezone.utc)
+    return end_time - datetime.timedelta(minutes=minutes), end_time
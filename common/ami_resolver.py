@@ -0,0 +1,151 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from common.aws_client import initialize_aws_client
+from common.aws_utilities import iter_paginated
+from common.logging_utilities import setup_logging
+
+logger = setup_logging()
+
+# Image name patterns per (family, architecture). Architecture is also passed as its
+# own describe_images filter, so the patterns only need to pick the right family.
+AMI_NAME_PATTERNS = {
+    ("amzn2", "x86_64"): "amzn2-ami-hvm-*",
+    ("amzn2", "arm64"): "amzn2-ami-hvm-*",
+    ("al2023", "x86_64"): "al2023-ami-2023.*",
+    ("al2023", "arm64"): "al2023-ami-2023.*",
+}
+DEFAULT_AMI_TTL = 3600
+DEFAULT_MAX_WORKERS = 8
+
+
+def newest_image(images):
+    """
+    Returns the image with the latest CreationDate in a single pass, or None.
+
+    CreationDate is an ISO-8601 string, so string comparison orders it correctly.
+    """
+    return max(images, key=lambda image: image["CreationDate"], default=None)
+
+
+class AmiResolver:
+    """
+    Resolves the newest Amazon Linux AMI per region, family and architecture.
+
+    Results are kept in memory for ttl seconds, so repeated launches in one process
+    make a single describe_images call per (region, family, architecture).
+    """
+
+    def __init__(self, ttl=DEFAULT_AMI_TTL):
+        self.ttl = ttl
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def resolve(
+        self, region_name=None, family="amzn2", architecture="x86_64", ec2_client=None
+    ):
+        """
+        Returns the newest AMI id for the given region, family and architecture.
+
+        Parameters:
+        region_name (str, optional): The AWS region. Ignored when ec2_client is given.
+        family (str, optional): "amzn2" (default) or "al2023".
+        architecture (str, optional): "x86_64" (default) or "arm64".
+        ec2_client (boto3.client, optional): An EC2 client. If None, one is initialized.
+
+        Returns:
+        str: The AMI id, or None if no image matched.
+
+        Raises:
+        ValueError: If the family/architecture combination is not supported.
+        """
+        pattern = AMI_NAME_PATTERNS.get((family, architecture))
+        if pattern is None:
+            raise ValueError(
+                f"Unsupported AMI family/architecture: {family}/{architecture}"
+            )
+
+        if ec2_client is None:
+            ec2_client = initialize_aws_client("ec2", region_name=region_name)
+        if ec2_client is None:
+            raise RuntimeError("Failed to initialize EC2 client.")
+
+        key = (ec2_client.meta.region_name, family, architecture)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[1] > now:
+                return cached[0]
+
+        images = iter_paginated(
+            ec2_client,
+            "describe_images",
+            "Images",
+            Filters=[
+                {"Name": "name", "Values": [pattern]},
+                {"Name": "architecture", "Values": [architecture]},
+                {"Name": "virtualization-type", "Values": ["hvm"]},
+                {"Name": "owner-alias", "Values": ["amazon"]},
+                {"Name": "state", "Values": ["available"]},
+            ],
+            Owners=["amazon"],
+        )
+        image = newest_image(images)
+        ami_id = image["ImageId"] if image else None
+
+        if ami_id is not None:
+            with self._lock:
+                self._cache[key] = (ami_id, now + self.ttl)
+        return ami_id
+
+    def resolve_many(
+        self,
+        regions,
+        family="amzn2",
+        architecture="x86_64",
+        max_workers=DEFAULT_MAX_WORKERS,
+    ):
+        """
+        Resolves the newest AMI for several regions concurrently.
+
+        Returns:
+        dict: Maps each region to its AMI id, or None if resolution failed.
+        """
+        regions = list(regions)
+
+        def resolve_region(region):
+            try:
+                return self.resolve(
+                    region_name=region, family=family, architecture=architecture
+                )
+            except Exception as e:
+                logger.error(f"Error resolving AMI in {region}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(regions, executor.map(resolve_region, regions)))
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_resolver = AmiResolver()
+
+
+def get_ami_resolver():
+    return _resolver
+
+
+def resolve_latest_ami(
+    region_name=None, family="amzn2", architecture="x86_64", ec2_client=None
+):
+    """
+    Returns the newest Amazon Linux AMI id using the process-wide AmiResolver.
+    """
+    return _resolver.resolve(
+        region_name=region_name,
+        family=family,
+        architecture=architecture,
+        ec2_client=ec2_client,
+    )
@@ -1,50 +1,205 @@
+import hashlib
+import threading
 import boto3
-from botocore.exceptions import NoCredentialsError
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import NoCredentialsError, ProfileNotFound
 from common.logging_utilities import setup_logging
 
 # Initialize the logger
 logger = setup_logging()
 
+# Size of the HTTP connection pool for every client built by the registry. The
+# botocore default (10) is too small once helpers start fanning out work across
+# a thread pool, so keep this in step with the largest worker pool in use.
+DEFAULT_MAX_POOL_CONNECTIONS = 50
 
-def initialize_aws_client(service_name, region_name=None):
+
+class ClientRegistry:
+    """
+    Process-wide cache of boto3 clients.
+
+    Clients are keyed by (service, region, endpoint_url, profile) and built at most
+    once. boto3 sessions are not thread-safe, so each thread resolves credentials
+    through its own session, while the resulting clients (which are thread-safe) are
+    shared by every thread.
+    """
+
+    def __init__(self, max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS):
+        self.max_pool_connections = max_pool_connections
+        self._clients = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+
+    def get_session(self, profile_name=None):
+        """
+        Returns the boto3 session owned by the calling thread for the given profile.
+        """
+        sessions = getattr(self._local, "sessions", None)
+        if sessions is None:
+            sessions = self._local.sessions = {}
+        session = sessions.get(profile_name)
+        if session is None:
+            session = boto3.session.Session(profile_name=profile_name)
+            sessions[profile_name] = session
+        return session
+
+    def get_client(
+        self, service_name, region_name=None, endpoint_url=None, profile_name=None
+    ):
+        """
+        Returns a cached client, creating it on first use.
+        """
+        key = (service_name, region_name, endpoint_url, profile_name)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.hits += 1
+                return client
+
+        # Build outside the lock; client construction loads endpoint and service
+        # models and is the expensive part we are trying to do only once.
+        client = self.get_session(profile_name).client(
+            service_name,
+            region_name=region_name,
+            endpoint_url=endpoint_url,
+            config=BotoConfig(max_pool_connections=self.max_pool_connections),
+        )
+        with self._lock:
+            existing = self._clients.get(key)
+            if existing is not None:
+                self.hits += 1
+                return existing
+            self._clients[key] = client
+            self.misses += 1
+        return client
+
+    def set_max_pool_connections(self, max_pool_connections):
+        """
+        Changes the connection pool size. Cached clients are dropped so new ones pick it up.
+        """
+        with self._lock:
+            self.max_pool_connections = max_pool_connections
+            self._clients.clear()
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+            self.hits = 0
+            self.misses = 0
+        self._local = threading.local()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_registry = ClientRegistry()
+
+
+def get_client_registry():
+    """
+    Returns the process-wide ClientRegistry used by initialize_aws_client.
+    """
+    return _registry
+
+
+def fingerprint_credentials(credentials):
+    """
+    Returns a short, non-reversible key for a set of credentials, or None if there are
+    none. Two credential sources that resolve to the same access key share a key.
+    """
+    access_key = getattr(credentials, "access_key", None)
+    if not isinstance(access_key, str):
+        return None
+    return hashlib.sha256(access_key.encode("utf-8")).hexdigest()[:16]
+
+
+def client_credential_fingerprint(client):
+    """
+    Returns fingerprint_credentials for the credentials a client signs requests with.
+    """
+    get_credentials = getattr(client, "_get_credentials", None)
+    return fingerprint_credentials(get_credentials() if get_credentials else None)
+
+
+def initialize_aws_client(
+    service_name, region_name=None, endpoint_url=None, profile_name=None
+):
     """
     Initializes and returns an AWS service client.
 
+    Clients are served from the process-wide ClientRegistry, so repeated calls with the
+    same arguments return the same client instead of building a new one.
+
     Parameters:
     service_name (str): The name of the AWS service for which to create the client.
     region_name (str, optional): The AWS region to use. Defaults to None, which will use the default configured region.
+    endpoint_url (str, optional): A custom endpoint URL, such as a VPC endpoint. Defaults to None.
+    profile_name (str, optional): The named AWS profile to use. Defaults to None, which uses the default credential chain.
 
     Returns:
     boto3.client: An initialized AWS service client, or None if an error occurs.
     """
     try:
-        if region_name:
-            client = boto3.client(service_name, region_name=region_name)
-        else:
-            client = boto3.client(service_name)
-        return client
+        return _registry.get_client(
+            service_name,
+            region_name=region_name,
+            endpoint_url=endpoint_url,
+            profile_name=profile_name,
+        )
     except NoCredentialsError:
         logger.error("Credentials not available")
         return None
+    except ProfileNotFound as e:
+        logger.error(f"AWS profile not found: {e}")
+        return None
 
 
-def initialize_aws_resource(service_name, region_name=None):
+def initialize_aws_resource(service_name, region_name=None, profile_name=None):
     """
     Initializes and returns an AWS service resource.
 
+    Resources are not thread-safe, so they are not cached, but they are built from the
+    calling thread's shared session to avoid repeated credential resolution.
+
     Parameters:
     service_name (str): The name of the AWS service for which to create the resource.
     region_name (str, optional): The AWS region to use. Defaults to None, which will use the default configured region.
+    profile_name (str, optional): The named AWS profile to use. Defaults to None, which uses the default credential chain.
 
     Returns:
     boto3.resource: An initialized AWS service resource, or None if an error occurs.
     """
     try:
+        session = _registry.get_session(profile_name)
         if region_name:
-            resource = boto3.resource(service_name, region_name=region_name)
+            resource = session.resource(service_name, region_name=region_name)
         else:
-            resource = boto3.resource(service_name)
+            resource = session.resource(service_name)
         return resource
     except NoCredentialsError:
         logger.error("Credentials not available for the AWS resource")
         return None
+    except ProfileNotFound as e:
+        logger.error(f"AWS profile not found: {e}")
+        return None
+
+
+def get_client_cache_stats():
+    """
+    Returns a dict with the number of cached clients and the hit/miss counters.
+    """
+    return _registry.stats()
+
+
+def clear_client_cache():
+    """
+    Drops every cached client and thread session and resets the counters.
+    """
+    _registry.clear()
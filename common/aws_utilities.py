@@ -1,41 +1,195 @@
 from common.aws_client import initialize_aws_client
+from common.cache_utilities import cached_describe
 from common.logging_utilities import setup_logging
 
 logger = setup_logging()
 
 
-def get_latest_amazon_linux_ami(region_name=None):
+def iter_paginated(client, operation_name, result_key, **kwargs):
+    """
+    Yields items from every page of a describe/list operation.
+
+    Uses the botocore paginator when the operation has one, otherwise makes a single
+    call. Items are yielded as each page arrives, so memory stays bounded by the page
+    size. API errors propagate to the caller when the iterator is consumed.
+
+    Parameters:
+    client (boto3.client): The client to call.
+    operation_name (str): The snake_case operation name, e.g. "describe_security_groups".
+    result_key (str): The response key holding the items, e.g. "SecurityGroups".
+    **kwargs: Parameters passed through to the operation.
+    """
+    if client.can_paginate(operation_name):
+        paginator = client.get_paginator(operation_name)
+        for page in paginator.paginate(**kwargs):
+            yield from page.get(result_key, [])
+    else:
+        response = getattr(client, operation_name)(**kwargs)
+        yield from response.get(result_key, [])
+
+
+def batched(items, size):
+    """
+    Yields lists of up to size items from any iterable, consuming it lazily.
+
+    Used to process a streamed describe pass page by page, e.g. to run one bulk
+    metric fetch per page of instances.
+    """
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _resolve_client(client, service_name, region_name, profile_name=None):
+    if client is None:
+        client = initialize_aws_client(
+            service_name, region_name=region_name, profile_name=profile_name
+        )
+    if client is None:
+        raise RuntimeError(f"Failed to initialize {service_name} client.")
+    return client
+
+
+def iter_vpcs(ec2_client=None, region_name=None, filters=None):
+    """
+    Yields VPC records across all describe_vpcs pages.
+    """
+    ec2_client = _resolve_client(ec2_client, "ec2", region_name)
+    yield from iter_paginated(
+        ec2_client, "describe_vpcs", "Vpcs", Filters=filters or []
+    )
+
+
+def iter_subnets(ec2_client=None, region_name=None, filters=None):
+    """
+    Yields subnet records across all describe_subnets pages.
+    """
+    ec2_client = _resolve_client(ec2_client, "ec2", region_name)
+    yield from iter_paginated(
+        ec2_client, "describe_subnets", "Subnets", Filters=filters or []
+    )
+
+
+def iter_security_groups(ec2_client=None, region_name=None, filters=None):
+    """
+    Yields security group records across all describe_security_groups pages.
+    """
+    ec2_client = _resolve_client(ec2_client, "ec2", region_name)
+    yield from iter_paginated(
+        ec2_client, "describe_security_groups", "SecurityGroups", Filters=filters or []
+    )
+
+
+def iter_key_pairs(ec2_client=None, region_name=None):
+    """
+    Yields key pair records. describe_key_pairs is not paginated, so this is a single call.
+    """
+    ec2_client = _resolve_client(ec2_client, "ec2", region_name)
+    yield from iter_paginated(ec2_client, "describe_key_pairs", "KeyPairs")
+
+
+# Maximum number of values accepted by a single EC2 describe filter.
+MAX_FILTER_VALUES = 200
+
+
+def iter_instances(ec2_client=None, region_name=None, instance_ids=None, filters=None):
+    """
+    Yields EC2 instance records across all describe_instances pages.
+
+    When instance_ids is given, the ids are sent as instance-id filter values in
+    batches of MAX_FILTER_VALUES. Unlike InstanceIds, a filter does not fail when an
+    id is not visible yet, which is common right after RunInstances.
+
+    Parameters:
+    ec2_client (boto3.client, optional): An EC2 client. If None, one is initialized.
+    region_name (str, optional): The AWS region to use when a client is initialized.
+    instance_ids (list, optional): Restrict results to these instance ids.
+    filters (list, optional): Additional describe_instances filters.
+    """
+    ec2_client = _resolve_client(ec2_client, "ec2", region_name)
+    filters = list(filters or [])
+    if instance_ids is None:
+        batches = [filters]
+    else:
+        instance_ids = list(instance_ids)
+        batches = [
+            filters
+            + [
+                {
+                    "Name": "instance-id",
+                    "Values": instance_ids[start : start + MAX_FILTER_VALUES],
+                }
+            ]
+            for start in range(0, len(instance_ids), MAX_FILTER_VALUES)
+        ]
+
+    for batch_filters in batches:
+        for reservation in iter_paginated(
+            ec2_client, "describe_instances", "Reservations", Filters=batch_filters
+        ):
+            yield from reservation["Instances"]
+
+
+def iter_db_subnet_groups(rds_client=None, region_name=None):
+    """
+    Yields DB subnet group records across all describe_db_subnet_groups pages.
+    """
+    rds_client = _resolve_client(rds_client, "rds", region_name)
+    yield from iter_paginated(rds_client, "describe_db_subnet_groups", "DBSubnetGroups")
+
+
+@cached_describe("regions")
+def get_regions(ec2_client=None, region_name=None, profile_name=None):
+    """
+    Retrieves the names of the regions enabled for the account.
+
+    Parameters:
+    ec2_client (boto3.client, optional): An initialized boto3 EC2 client. If None, a new client is created.
+    region_name (str, optional): The AWS region used to make the call. If None, the default region is used.
+    profile_name (str, optional): The AWS profile (account) to list regions for.
+
+    Returns:
+    list: A list of region names (strings). Returns None if an error occurs.
+    """
+    try:
+        ec2_client = _resolve_client(ec2_client, "ec2", region_name, profile_name)
+        response = ec2_client.describe_regions()
+        return [region["RegionName"] for region in response["Regions"]]
+    except Exception as e:
+        logger.error(f"Error retrieving regions: {e}")
+        return None
+
+
+def get_latest_amazon_linux_ami(
+    region_name=None, family="amzn2", architecture="x86_64"
+):
     """
     Retrieves the latest Amazon Linux AMI ID for a given region.
 
     :param region_name: AWS region name. If None, will use the default configured region.
+    :param family: "amzn2" (default) or "al2023".
+    :param architecture: "x86_64" (default) or "arm64".
     :return: The latest Amazon Linux AMI ID or None if not found or an error occurs.
     """
-    ec2_client = initialize_aws_client("ec2", region_name=region_name)
-
-    if ec2_client is None:
-        logger.error("Failed to initialize EC2 client.")
-        return None
+    # Imported here because ami_resolver builds on this module's pagination helpers.
+    # Not wrapped in cached_describe: the resolver keeps its own TTL cache.
+    from common.ami_resolver import resolve_latest_ami
 
     try:
-        response = ec2_client.describe_images(
-            Filters=[
-                {"Name": "name", "Values": ["amzn2-ami-hvm-*"]},
-                {"Name": "architecture", "Values": ["x86_64"]},
-                {"Name": "virtualization-type", "Values": ["hvm"]},
-                {"Name": "owner-alias", "Values": ["amazon"]},
-                {"Name": "state", "Values": ["available"]},
-            ],
-            Owners=["amazon"],
+        return resolve_latest_ami(
+            region_name=region_name, family=family, architecture=architecture
         )
-
-        amis = sorted(response["Images"], key=lambda x: x["CreationDate"], reverse=True)
-        return amis[0]["ImageId"] if amis else None
     except Exception as e:
         logger.error(f"Error retrieving the latest Amazon Linux AMI: {e}")
         return None
 
 
+@cached_describe("subnets")
 def get_subnet_id_for_az_and_vpc(az, vpc_id, ec2_client=None, region_name=None):
     """
     Retrieves the Subnet ID for a specified Availability Zone and VPC ID.
@@ -53,19 +207,21 @@ def get_subnet_id_for_az_and_vpc(az, vpc_id, ec2_client=None, region_name=None):
         return None
 
     try:
-        response = ec2_client.describe_subnets(
-            Filters=[
+        subnets = iter_subnets(
+            ec2_client,
+            filters=[
                 {"Name": "availability-zone", "Values": [az]},
                 {"Name": "vpc-id", "Values": [vpc_id]},
-            ]
+            ],
         )
-        subnets = response.get("Subnets", [])
-        return subnets[0]["SubnetId"] if subnets else None
+        subnet = next(subnets, None)
+        return subnet["SubnetId"] if subnet else None
     except Exception as e:
         logger.error(f"Error retrieving subnet ID for AZ {az} and VPC {vpc_id}: {e}")
         return None
 
 
+@cached_describe("key_pairs")
 def get_key_pairs(ec2_client=None, region_name=None):
     """
     Retrieves a list of EC2 key pairs available in a specified AWS region.
@@ -91,16 +247,17 @@ def get_key_pairs(ec2_client=None, region_name=None):
     The function prints an error message to the console if an exception occurs during the retrieval process.
     """
 
-    if ec2_client is None:
-        ec2_client = initialize_aws_client("ec2", region_name=region_name)
     try:
-        response = ec2_client.describe_key_pairs()
-        return [key_pair["KeyName"] for key_pair in response["KeyPairs"]]
+        return [
+            key_pair["KeyName"]
+            for key_pair in iter_key_pairs(ec2_client, region_name=region_name)
+        ]
     except Exception as e:
         logger.error(f"Error retrieving key pairs: {e}")
         return None
 
 
+@cached_describe("security_groups")
 def get_security_groups(ec2_client=None, region_name=None):
     """
     Retrieves a list of security group IDs from AWS EC2.
@@ -119,16 +276,17 @@ def get_security_groups(ec2_client=None, region_name=None):
     Raises:
     Exception: Propagates any exceptions encountered during the EC2 client operation.
     """
-    if ec2_client is None:
-        ec2_client = initialize_aws_client("ec2", region_name=region_name)
     try:
-        response = ec2_client.describe_security_groups()
-        return [sg["GroupId"] for sg in response["SecurityGroups"]]
+        return [
+            sg["GroupId"]
+            for sg in iter_security_groups(ec2_client, region_name=region_name)
+        ]
     except Exception as e:
         logger.error(f"Error retrieving security groups: {e}")
         return None
 
 
+@cached_describe("security_groups")
 def get_security_groups_with_names(ec2_client=None, region_name=None):
     """
     Retrieves a list of security group IDs from AWS EC2.
@@ -147,19 +305,17 @@ def get_security_groups_with_names(ec2_client=None, region_name=None):
     Raises:
     Exception: Propagates any exceptions encountered during the EC2 client operation.
     """
-    if ec2_client is None:
-        ec2_client = initialize_aws_client("ec2", region_name=region_name)
     try:
-        response = ec2_client.describe_security_groups()
         return [
             {"GroupId": sg["GroupId"], "GroupName": sg["GroupName"]}
-            for sg in response["SecurityGroups"]
+            for sg in iter_security_groups(ec2_client, region_name=region_name)
         ]
     except Exception as e:
         logger.error(f"Error retrieving security groups: {e}")
         return None
 
 
+@cached_describe("vpcs")
 def get_vpcs(ec2_client=None, region_name=None):
     """
     Retrieves a list of VPC IDs from AWS EC2.
@@ -178,16 +334,14 @@ def get_vpcs(ec2_client=None, region_name=None):
     Raises:
     Exception: Propagates any exceptions encountered during the EC2 client operation.
     """
-    if ec2_client is None:
-        ec2_client = initialize_aws_client("ec2", region_name=region_name)
     try:
-        response = ec2_client.describe_vpcs()
-        return [vpc["VpcId"] for vpc in response["Vpcs"]]
+        return [vpc["VpcId"] for vpc in iter_vpcs(ec2_client, region_name=region_name)]
     except Exception as e:
         logger.error(f"Error retrieving VPCs: {e}")
         return None
 
 
+@cached_describe("vpcs")
 def get_vpcs_with_names(ec2_client=None, region_name=None):
     """
     Retrieves a list of VPCs along with their names from AWS EC2.
@@ -206,12 +360,9 @@ def get_vpcs_with_names(ec2_client=None, region_name=None):
     Raises:
     Exception: Propagates any exceptions encountered during the EC2 client operation.
     """
-    if ec2_client is None:
-        ec2_client = initialize_aws_client("ec2", region_name=region_name)
     try:
-        response = ec2_client.describe_vpcs()
         vpcs = []
-        for vpc in response["Vpcs"]:
+        for vpc in iter_vpcs(ec2_client, region_name=region_name):
             name = ""
             for tag in vpc.get("Tags", []):
                 if tag["Key"] == "Name":
@@ -224,6 +375,7 @@ def get_vpcs_with_names(ec2_client=None, region_name=None):
         return None
 
 
+@cached_describe("security_groups")
 def get_security_groups_for_vpc(vpc_id, ec2_client=None, region_name=None):
     """
     Retrieves a list of security group IDs associated with a specific VPC.
@@ -243,18 +395,21 @@ def get_security_groups_for_vpc(vpc_id, ec2_client=None, region_name=None):
     Raises:
     Exception: Propagates any exceptions encountered during the EC2 client operation.
     """
-    if ec2_client is None:
-        ec2_client = initialize_aws_client("ec2", region_name=region_name)
     try:
-        response = ec2_client.describe_security_groups(
-            Filters=[{"Name": "vpc-id", "Values": [vpc_id]}]
-        )
-        return [sg["GroupId"] for sg in response["SecurityGroups"]]
+        return [
+            sg["GroupId"]
+            for sg in iter_security_groups(
+                ec2_client,
+                region_name=region_name,
+                filters=[{"Name": "vpc-id", "Values": [vpc_id]}],
+            )
+        ]
     except Exception as e:
         logger.error(f"Error retrieving security groups for VPC {vpc_id}: {e}")
         return None
 
 
+@cached_describe("subnets")
 def get_availability_zones_for_vpc(vpc_id, ec2_client=None, region_name=None):
     """
     Retrieves a list of availability zones for the subnets associated with a specific VPC.
@@ -274,18 +429,19 @@ def get_availability_zones_for_vpc(vpc_id, ec2_client=None, region_name=None):
     Raises:
     Exception: Propagates any exceptions encountered during the EC2 client operation.
     """
-    if ec2_client is None:
-        ec2_client = initialize_aws_client("ec2", region_name=region_name)
     try:
-        response = ec2_client.describe_subnets(
-            Filters=[{"Name": "vpc-id", "Values": [vpc_id]}]
+        subnets = iter_subnets(
+            ec2_client,
+            region_name=region_name,
+            filters=[{"Name": "vpc-id", "Values": [vpc_id]}],
         )
-        return list(set([subnet["AvailabilityZone"] for subnet in response["Subnets"]]))
+        return list(set([subnet["AvailabilityZone"] for subnet in subnets]))
     except Exception as e:
         logger.error(f"Error retrieving availability zones for VPC {vpc_id}: {e}")
         return None
 
 
+@cached_describe("subnets")
 def get_subnets_for_vpc(vpc_id, ec2_client=None, region_name=None):
     """
     Retrieves a list of subnet IDs associated with a specific VPC.
@@ -305,13 +461,13 @@ def get_subnets_for_vpc(vpc_id, ec2_client=None, region_name=None):
     Raises:
     Exception: Propagates any exceptions encountered during the EC2 client operation.
     """
-    if ec2_client is None:
-        ec2_client = initialize_aws_client("ec2", region_name=region_name)
     try:
-        response = ec2_client.describe_subnets(
-            Filters=[{"Name": "vpc-id", "Values": [vpc_id]}]
+        subnets = iter_subnets(
+            ec2_client,
+            region_name=region_name,
+            filters=[{"Name": "vpc-id", "Values": [vpc_id]}],
         )
-        return [subnet["SubnetId"] for subnet in response["Subnets"]]
+        return [subnet["SubnetId"] for subnet in subnets]
     except Exception as e:
         logger.error(f"Error retrieving subnets for VPC {vpc_id}: {e}")
         return None
@@ -339,6 +495,7 @@ def create_db_subnet_group(name, description, subnet_ids, rds_client):
         return None
 
 
+@cached_describe("db_subnet_groups")
 def get_db_subnet_groups(rds_client):
     """
     Lists DB subnet groups.
@@ -347,8 +504,7 @@ def get_db_subnet_groups(rds_client):
     :return: A list of DB subnet group names.
     """
     try:
-        response = rds_client.describe_db_subnet_groups()
-        return [sg["DBSubnetGroupName"] for sg in response["DBSubnetGroups"]]
+        return [sg["DBSubnetGroupName"] for sg in iter_db_subnet_groups(rds_client)]
     except Exception as e:
         logger.error(f"Error listing DB subnet groups: {e}")
         return None
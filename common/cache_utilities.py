@@ -0,0 +1,294 @@
+import atexit
+import functools
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from common.aws_client import (
+    client_credential_fingerprint,
+    fingerprint_credentials,
+    get_client_registry,
+)
+from common.logging_utilities import setup_logging
+
+logger = setup_logging()
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "cw-examples",
+    "describe_cache.sqlite3",
+)
+DEFAULT_MAX_ENTRIES = 5000
+
+# Time-to-live in seconds per resource type. These are read-only lookups of data that
+# changes rarely; anything that tracks live state (instances, alarms, metrics) is
+# deliberately not cached.
+RESOURCE_TTLS = {
+    "regions": 7 * 24 * 3600,
+    "vpcs": 3600,
+    "subnets": 3600,
+    "security_groups": 900,
+    "key_pairs": 900,
+    "db_subnet_groups": 3600,
+    "topology": 900,
+    "identity": 12 * 3600,
+}
+DEFAULT_TTL = 900
+
+
+class DescribeCache:
+    """
+    Size-bounded, TTL-aware key/value store backed by a single sqlite file.
+
+    Values are stored as JSON. When the number of entries exceeds max_entries the least
+    recently used entries are evicted.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        """
+        Returns (True, value) on a fresh hit and (False, None) otherwise.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return False, None
+            self._conn.execute(
+                "UPDATE cache SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return True, json.loads(row[0])
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, now + ttl, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def stats(self):
+        return {"entries": len(self), "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Caching is off unless a CLI turns it on with configure_cache(), so library callers
+# and tests always see live data by default.
+_settings = {"enabled": False, "refresh": False}
+_cache = None
+
+
+def configure_cache(
+    enabled=True,
+    refresh=False,
+    path=DEFAULT_CACHE_PATH,
+    max_entries=DEFAULT_MAX_ENTRIES,
+):
+    """
+    Enables or disables the persistent describe cache for this process.
+
+    Parameters:
+    enabled (bool): Whether cached results may be served. Maps to the CLIs' --no-cache flag.
+    refresh (bool): Ignore cached values but store fresh results. Maps to --refresh.
+    path (str, optional): Location of the sqlite file. Defaults to ~/.cache/cw-examples/.
+    max_entries (int, optional): Maximum entries kept before LRU eviction.
+    """
+    global _cache
+    _settings["enabled"] = enabled
+    _settings["refresh"] = refresh
+    if not enabled:
+        return
+    if _cache is None or _cache.path != path:
+        try:
+            _cache = DescribeCache(path=path, max_entries=max_entries)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Describe cache unavailable at {path}: {e}")
+            _settings["enabled"] = False
+            return
+    _cache.max_entries = max_entries
+
+
+def get_cache_stats():
+    """
+    Returns a dict with entry count and hit/miss counters, or None if the cache is disabled.
+    """
+    if _cache is None or not _settings["enabled"]:
+        return None
+    return _cache.stats()
+
+
+def clear_cache():
+    if _cache is not None:
+        _cache.clear()
+
+
+def add_cache_arguments(parser):
+    """
+    Adds the shared --no-cache and --refresh flags to an argparse parser.
+    """
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the local describe cache.",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached describe results and refetch them.",
+    )
+
+
+def configure_cache_from_args(args):
+    configure_cache(
+        enabled=not getattr(args, "no_cache", False),
+        refresh=getattr(args, "refresh", False),
+    )
+
+
+@atexit.register
+def _log_cache_stats():
+    stats = get_cache_stats()
+    if stats:
+        logger.debug(f"Describe cache stats: {stats}")
+
+
+def _cache_scope(bound_arguments):
+    """
+    Works out the region and credentials a cached call applies to, and the remaining
+    arguments that distinguish one call from another. Client objects are left out of
+    the key; their region and credentials are used instead.
+
+    Returns:
+    tuple: (region, credential_key, key_args). credential_key fingerprints the access
+           key of the client, or of the session for the profile_name argument.
+    """
+    region = None
+    credential_key = None
+    key_args = {}
+    for name, value in bound_arguments.items():
+        if name.endswith("_client"):
+            if value is not None:
+                region = value.meta.region_name
+                credential_key = client_credential_fingerprint(value)
+            continue
+        if name == "region_name":
+            region = region or value
+            continue
+        key_args[name] = value
+    if region is None or credential_key is None:
+        session = get_client_registry().get_session(key_args.get("profile_name"))
+        region = region or session.region_name
+        credential_key = credential_key or fingerprint_credentials(
+            session.get_credentials()
+        )
+    return region, credential_key, key_args
+
+
+def cached_describe(resource, ttl=None):
+    """
+    Decorator that serves a read-only describe helper from the persistent cache.
+
+    The cache key is built from the function name, the region (taken from a *_client
+    argument or region_name), a fingerprint of the credentials in use and the remaining
+    arguments, so results are never shared between accounts. None results are treated
+    as errors and never cached.
+
+    Parameters:
+    resource (str): The resource type, used to look up the TTL in RESOURCE_TTLS.
+    ttl (int, optional): Overrides the TTL for this function.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        entry_ttl = ttl or RESOURCE_TTLS.get(resource, DEFAULT_TTL)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _settings["enabled"] or _cache is None:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            region, credential_key, key_args = _cache_scope(bound.arguments)
+            try:
+                key = json.dumps(
+                    [
+                        func.__module__,
+                        func.__qualname__,
+                        region,
+                        credential_key,
+                        key_args,
+                    ],
+                    sort_keys=True,
+                )
+            except TypeError:
+                return func(*args, **kwargs)
+
+            if not _settings["refresh"]:
+                hit, value = _cache.get(key)
+                if hit:
+                    return value
+
+            value = func(*args, **kwargs)
+            if value is not None:
+                try:
+                    _cache.set(key, value, entry_ttl)
+                except (TypeError, sqlite3.Error) as e:
+                    logger.debug(f"Not caching {func.__qualname__}: {e}")
+            return value
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,158 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from botocore.exceptions import ClientError
+from common.logging_utilities import setup_logging
+
+logger = setup_logging()
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def fan_out(func, items, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Runs func(item) for every item on a bounded thread pool.
+
+    Results are yielded as soon as each call finishes, not in input order, so callers
+    can start printing or merging while slower items are still running. An exception
+    raised by func is returned in place of the result rather than stopping the others.
+
+    Parameters:
+    func (callable): Called once per item.
+    items (iterable): The work items, e.g. region names.
+    max_workers (int, optional): Maximum concurrent calls. Defaults to 8.
+
+    Yields:
+    tuple: (item, result, error) where error is None on success.
+    """
+    items = list(items)
+    if not items:
+        return
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(items)))
+    ) as executor:
+        futures = {executor.submit(func, item): item for item in items}
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                yield item, future.result(), None
+            except Exception as e:
+                logger.debug(f"Worker for {item} failed: {e}")
+                yield item, None, e
+
+
+# Default concurrent calls per (service, account). Workers share one pool, but each
+# service's describe quota applies per account, so every account gets its own slots.
+DEFAULT_SERVICE_CONCURRENCY = {"rds": 4, "ec2": 8, "cloudwatch": 8, "sts": 4}
+DEFAULT_CONCURRENCY_PER_SERVICE = 4
+
+
+class ServiceConcurrencyLimits:
+    """
+    Per-service concurrency caps for work spread over a shared thread pool.
+
+    slot(service, scope) blocks while `limit` calls for that service and scope (for
+    example an account or profile) are already running.
+    """
+
+    def __init__(self, limits=None, default=DEFAULT_CONCURRENCY_PER_SERVICE):
+        self.limits = dict(DEFAULT_SERVICE_CONCURRENCY)
+        self.limits.update(limits or {})
+        self.default = default
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, service, scope):
+        key = (service, scope)
+        with self._lock:
+            semaphore = self._semaphores.get(key)
+            if semaphore is None:
+                limit = self.limits.get(service, self.default)
+                semaphore = self._semaphores[key] = threading.BoundedSemaphore(limit)
+        return semaphore
+
+    def slot(self, service, scope=None):
+        """
+        Returns a context manager holding one of the service's slots for scope.
+        """
+        return self._semaphore(service, scope)
+
+
+# Error codes AWS services use when a caller exceeds its request rate.
+THROTTLING_ERROR_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestLimitExceeded",
+    "TooManyRequestsException",
+    "RequestThrottled",
+    "RequestThrottledException",
+}
+
+
+def is_throttling_error(error):
+    if not isinstance(error, ClientError):
+        return False
+    return error.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`. acquire() blocks
+    until a token is available, so every thread sharing the bucket together stays
+    within the rate.
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def call_with_backoff(
+    func, max_attempts=5, base_delay=0.5, max_delay=20, should_retry=is_throttling_error
+):
+    """
+    Calls func(), retrying with full-jitter exponential backoff while should_retry(error).
+
+    Parameters:
+    func (callable): The zero-argument call to make.
+    max_attempts (int, optional): Total attempts including the first. Defaults to 5.
+    base_delay (float, optional): Backoff base in seconds. Defaults to 0.5.
+    max_delay (float, optional): Upper bound for a single sleep. Defaults to 20.
+    should_retry (callable, optional): Decides whether an exception is retryable.
+                                       Defaults to is_throttling_error.
+
+    Returns:
+    The value returned by func. The last exception is re-raised once attempts run out.
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt == max_attempts or not should_retry(e):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+            logger.debug(f"Retrying after {e} in {delay:.2f}s (attempt {attempt})")
+            time.sleep(delay)
@@ -0,0 +1,179 @@
+import threading
+from common.aws_client import (
+    fingerprint_credentials,
+    get_client_registry,
+    initialize_aws_client,
+)
+from common.cache_utilities import cached_describe
+from common.logging_utilities import setup_logging
+
+logger = setup_logging()
+
+# Region name prefixes of the non-commercial partitions. More specific prefixes first.
+PARTITION_PREFIXES = (
+    ("cn-", "aws-cn"),
+    ("us-gov-", "aws-us-gov"),
+    ("us-isob-", "aws-iso-b"),
+    ("us-iso-", "aws-iso"),
+)
+DEFAULT_PARTITION = "aws"
+
+
+def partition_for_region(region_name):
+    """
+    Returns the AWS partition a region belongs to, without any network call.
+    """
+    for prefix, partition in PARTITION_PREFIXES:
+        if region_name and region_name.startswith(prefix):
+            return partition
+    return DEFAULT_PARTITION
+
+
+def credential_fingerprint(profile_name=None):
+    """
+    Returns a short, non-reversible key for the credentials a profile resolves to.
+
+    Two profiles that resolve to the same access key share one identity entry, and a
+    rotated or re-assumed credential gets a new one. Returns None when no credentials
+    are configured.
+    """
+    session = get_client_registry().get_session(profile_name)
+    return fingerprint_credentials(session.get_credentials())
+
+
+@cached_describe("identity")
+def fetch_caller_identity(profile_name=None, credential_key=None):
+    """
+    Calls STS GetCallerIdentity. credential_key only scopes the persistent cache entry.
+
+    Returns:
+    dict: 'account_id', 'arn', 'user_id' and 'partition', or None on error.
+    """
+    try:
+        sts = initialize_aws_client("sts", profile_name=profile_name)
+        response = sts.get_caller_identity()
+        return {
+            "account_id": response["Account"],
+            "arn": response["Arn"],
+            "user_id": response["UserId"],
+            "partition": response["Arn"].split(":")[1],
+        }
+    except Exception as e:
+        logger.error(f"Error getting caller identity: {e}")
+        return None
+
+
+class IdentityResolver:
+    """
+    Process-wide memo of the caller identity per credential source.
+
+    GetCallerIdentity is called at most once per set of credentials in a process. When
+    the describe cache is enabled, the result is also persisted with the "identity" TTL
+    so later runs skip the call entirely.
+    """
+
+    def __init__(self):
+        self._identities = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def identity(self, profile_name=None):
+        """
+        Returns the caller identity dict for a profile (None for the default chain).
+
+        The STS call is made under a lock for that credential source only, so
+        concurrent lookups for different profiles run in parallel while repeated
+        lookups for the same one still make a single call.
+
+        Raises:
+        RuntimeError: If the identity could not be resolved.
+        """
+        key = (profile_name, credential_fingerprint(profile_name))
+        identity = self._identities.get(key)
+        if identity is not None:
+            return identity
+        with self._key_lock(key):
+            identity = self._identities.get(key)
+            if identity is None:
+                identity = fetch_caller_identity(
+                    profile_name=profile_name, credential_key=key[1]
+                )
+                if identity is None:
+                    raise RuntimeError("Failed to resolve the caller identity.")
+                self._identities[key] = identity
+        return identity
+
+    def account_id(self, profile_name=None):
+        return self.identity(profile_name)["account_id"]
+
+    def clear(self):
+        with self._lock:
+            self._identities.clear()
+            self._key_locks.clear()
+
+
+_resolver = IdentityResolver()
+
+
+def get_identity_resolver():
+    return _resolver
+
+
+def get_account_id(profile_name=None):
+    return _resolver.account_id(profile_name)
+
+
+def build_arn(service, region_name, account_id, resource, partition=None):
+    """
+    Builds an ARN locally.
+
+    Parameters:
+    service (str): The service namespace, e.g. "rds".
+    region_name (str): The region, or "" for global resources.
+    account_id (str): The 12-digit account id, or "" where the ARN has none.
+    resource (str): The service-specific resource part, e.g. "db:mydb".
+    partition (str, optional): Defaults to the partition of region_name.
+    """
+    partition = partition or partition_for_region(region_name)
+    return f"arn:{partition}:{service}:{region_name}:{account_id}:{resource}"
+
+
+def _arn_scope(region_name, account_id, profile_name):
+    # Missing region or account fall back to the session region and the memoized
+    # caller identity, so repeated calls make no network requests
+    if region_name is None:
+        region_name = get_client_registry().get_session(profile_name).region_name
+    if account_id is None:
+        account_id = get_account_id(profile_name)
+    return region_name, account_id
+
+
+def rds_db_arn(instance_id, region_name=None, account_id=None, profile_name=None):
+    region_name, account_id = _arn_scope(region_name, account_id, profile_name)
+    return build_arn("rds", region_name, account_id, f"db:{instance_id}")
+
+
+def ec2_instance_arn(instance_id, region_name=None, account_id=None, profile_name=None):
+    region_name, account_id = _arn_scope(region_name, account_id, profile_name)
+    return build_arn("ec2", region_name, account_id, f"instance/{instance_id}")
+
+
+def ec2_volume_arn(volume_id, region_name=None, account_id=None, profile_name=None):
+    region_name, account_id = _arn_scope(region_name, account_id, profile_name)
+    return build_arn("ec2", region_name, account_id, f"volume/{volume_id}")
+
+
+def cloudwatch_alarm_arn(
+    alarm_name, region_name=None, account_id=None, profile_name=None
+):
+    region_name, account_id = _arn_scope(region_name, account_id, profile_name)
+    return build_arn("cloudwatch", region_name, account_id, f"alarm:{alarm_name}")
+
+
+def sns_topic_arn(topic_name, region_name=None, account_id=None, profile_name=None):
+    region_name, account_id = _arn_scope(region_name, account_id, profile_name)
+    return build_arn("sns", region_name, account_id, topic_name)
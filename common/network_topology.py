@@ -0,0 +1,129 @@
+from collections import defaultdict
+from common.aws_client import initialize_aws_client
+from common.aws_utilities import iter_vpcs, iter_subnets, iter_security_groups
+from common.cache_utilities import cached_describe
+from common.logging_utilities import setup_logging
+
+logger = setup_logging()
+
+
+def get_name_tag(resource, default="N/A"):
+    for tag in resource.get("Tags", []):
+        if tag["Key"] == "Name":
+            return tag["Value"]
+    return default
+
+
+@cached_describe("topology")
+def describe_network(ec2_client):
+    """
+    Returns the raw VPC, subnet and security group records for the client's region.
+    """
+    return {
+        "vpcs": list(iter_vpcs(ec2_client)),
+        "subnets": list(iter_subnets(ec2_client)),
+        "security_groups": list(iter_security_groups(ec2_client)),
+    }
+
+
+class RegionTopology:
+    """
+    In-memory snapshot of the VPCs, subnets and security groups in one region.
+
+    The snapshot costs three paginated describe calls (or none when the describe cache
+    is enabled and warm). Every lookup after that is a dictionary access, so a launch
+    that needs several VPC/subnet/security group lookups no longer makes a round trip
+    for each one.
+    """
+
+    def __init__(self, region_name, vpcs, subnets, security_groups):
+        self.region_name = region_name
+        self.vpcs = {vpc["VpcId"]: vpc for vpc in vpcs}
+        self.subnets = {subnet["SubnetId"]: subnet for subnet in subnets}
+        self.security_groups = {sg["GroupId"]: sg for sg in security_groups}
+
+        self.subnets_by_vpc = defaultdict(list)
+        self.subnets_by_vpc_and_az = defaultdict(list)
+        for subnet in self.subnets.values():
+            self.subnets_by_vpc[subnet["VpcId"]].append(subnet)
+            self.subnets_by_vpc_and_az[
+                (subnet["VpcId"], subnet["AvailabilityZone"])
+            ].append(subnet)
+
+        self.security_groups_by_vpc = defaultdict(list)
+        for sg in self.security_groups.values():
+            self.security_groups_by_vpc[sg.get("VpcId")].append(sg)
+
+    @classmethod
+    def load(cls, ec2_client=None, region_name=None):
+        """
+        Fetches VPCs, subnets and security groups for a region and indexes them.
+
+        Parameters:
+        ec2_client (boto3.client, optional): An EC2 client. If None, one is initialized.
+        region_name (str, optional): The AWS region to use when a client is initialized.
+
+        Returns:
+        RegionTopology: The indexed snapshot.
+        """
+        if ec2_client is None:
+            ec2_client = initialize_aws_client("ec2", region_name=region_name)
+        if ec2_client is None:
+            raise RuntimeError("Failed to initialize EC2 client.")
+
+        network = describe_network(ec2_client)
+        topology = cls(
+            region_name=ec2_client.meta.region_name,
+            vpcs=network["vpcs"],
+            subnets=network["subnets"],
+            security_groups=network["security_groups"],
+        )
+        logger.debug(
+            f"Loaded topology for {topology.region_name}: {len(topology.vpcs)} VPCs, "
+            f"{len(topology.subnets)} subnets, {len(topology.security_groups)} security groups"
+        )
+        return topology
+
+    def vpc_ids(self):
+        return list(self.vpcs)
+
+    def vpcs_with_names(self):
+        return [(vpc_id, get_name_tag(vpc)) for vpc_id, vpc in self.vpcs.items()]
+
+    def availability_zones_for_vpc(self, vpc_id):
+        return sorted(
+            {
+                subnet["AvailabilityZone"]
+                for subnet in self.subnets_by_vpc.get(vpc_id, [])
+            }
+        )
+
+    def subnets_for_vpc(self, vpc_id):
+        return [subnet["SubnetId"] for subnet in self.subnets_by_vpc.get(vpc_id, [])]
+
+    def subnet_id_for_az_and_vpc(self, az, vpc_id):
+        subnets = self.subnets_by_vpc_and_az.get((vpc_id, az))
+        return subnets[0]["SubnetId"] if subnets else None
+
+    def availability_zone_for_subnet(self, subnet_id):
+        subnet = self.subnets.get(subnet_id)
+        return subnet["AvailabilityZone"] if subnet else None
+
+    def security_groups_for_vpc(self, vpc_id):
+        return [
+            (sg["GroupId"], sg["GroupName"])
+            for sg in self.security_groups_by_vpc.get(vpc_id, [])
+        ]
+
+    def validate_sg_and_subnet(self, security_group, subnet_id):
+        """
+        Raises ValueError if the security group and subnet are unknown or in different VPCs.
+        """
+        sg = self.security_groups.get(security_group)
+        subnet = self.subnets.get(subnet_id)
+        if sg is None:
+            raise ValueError(f"Security group {security_group} not found.")
+        if subnet is None:
+            raise ValueError(f"Subnet {subnet_id} not found.")
+        if sg.get("VpcId") != subnet["VpcId"]:
+            raise ValueError("Security group and subnet belong to different VPCs.")
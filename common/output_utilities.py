@@ -0,0 +1,180 @@
+import abc
+import csv
+import datetime
+import json
+import sys
+from collections import namedtuple
+from tabulate import tabulate
+
+OUTPUT_FORMATS = ("table", "csv", "ndjson", "json")
+DEFAULT_OUTPUT_FORMAT = "table"
+
+# One output column. `field` is the row dict key and the machine-readable name used by
+# csv/ndjson/json; `header` and `format` are only used by the human-readable table.
+Column = namedtuple("Column", ["field", "header", "format"], defaults=(None, None))
+
+
+def _plain_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return value
+
+
+class OutputWriter(abc.ABC):
+    """
+    Base class for row writers. Use as a context manager, call write_row() once per
+    row dict as it becomes available, and the writer finishes the output on exit.
+    """
+
+    def __init__(self, columns, stream=None):
+        self.columns = [
+            column if isinstance(column, Column) else Column(column)
+            for column in columns
+        ]
+        self.stream = stream or sys.stdout
+        self.rows_written = 0
+
+    def write_row(self, row):
+        self._write(row)
+        self.rows_written += 1
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.write_row(row)
+
+    @abc.abstractmethod
+    def _write(self, row):
+        """
+        Writes one row dict to the stream.
+        """
+
+    def close(self):
+        self.stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class TableWriter(OutputWriter):
+    """
+    Buffers rows and prints one tabulate table on close. Meant for small results.
+    """
+
+    def __init__(self, columns, stream=None):
+        super().__init__(columns, stream)
+        self._rows = []
+
+    def _write(self, row):
+        self._rows.append(
+            [
+                (
+                    column.format(row.get(column.field))
+                    if column.format
+                    else row.get(column.field)
+                )
+                for column in self.columns
+            ]
+        )
+
+    def close(self):
+        headers = [column.header or column.field for column in self.columns]
+        print(tabulate(self._rows, headers=headers), file=self.stream)
+        super().close()
+
+
+class CsvWriter(OutputWriter):
+    """
+    Streams rows as CSV, with a header line of field names.
+    """
+
+    def __init__(self, columns, stream=None):
+        super().__init__(columns, stream)
+        self._writer = csv.writer(self.stream)
+        self._writer.writerow([column.field for column in self.columns])
+
+    def _write(self, row):
+        values = []
+        for column in self.columns:
+            value = _plain_value(row.get(column.field))
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value, default=str)
+            values.append(value)
+        self._writer.writerow(values)
+        self.stream.flush()
+
+
+class NdjsonWriter(OutputWriter):
+    """
+    Streams one JSON object per line.
+    """
+
+    def _record(self, row):
+        return {
+            column.field: _plain_value(row.get(column.field)) for column in self.columns
+        }
+
+    def _write(self, row):
+        self.stream.write(json.dumps(self._record(row), default=str) + "\n")
+        self.stream.flush()
+
+
+class JsonWriter(NdjsonWriter):
+    """
+    Streams a single JSON array, writing each element as it arrives.
+    """
+
+    def __init__(self, columns, stream=None):
+        super().__init__(columns, stream)
+        self.stream.write("[")
+
+    def _write(self, row):
+        separator = ",\n" if self.rows_written else "\n"
+        self.stream.write(separator + json.dumps(self._record(row), default=str))
+        self.stream.flush()
+
+    def close(self):
+        self.stream.write("\n]\n" if self.rows_written else "]\n")
+        super().close()
+
+
+WRITERS = {
+    "table": TableWriter,
+    "csv": CsvWriter,
+    "ndjson": NdjsonWriter,
+    "json": JsonWriter,
+}
+
+
+def get_output_writer(output_format, columns, stream=None):
+    """
+    Returns the writer for an output format.
+
+    Parameters:
+    output_format (str): One of OUTPUT_FORMATS.
+    columns (list): Column tuples, or plain field names.
+    stream (file, optional): Where to write. Defaults to sys.stdout.
+
+    Raises:
+    ValueError: If the format is not supported.
+    """
+    writer_class = WRITERS.get(output_format)
+    if writer_class is None:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    return writer_class(columns, stream=stream)
+
+
+def add_output_arguments(parser):
+    """
+    Adds the shared --output flag to an argparse parser.
+    """
+    parser.add_argument(
+        "--output",
+        choices=OUTPUT_FORMATS,
+        default=DEFAULT_OUTPUT_FORMAT,
+        help="Output format. csv, ndjson and json stream rows as they are fetched; "
+        "table waits for every row (default: table).",
+    )
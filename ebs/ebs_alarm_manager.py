@@ -0,0 +1,330 @@
+import argparse
+import logging
+import sys
+from cloudwatch.alarm_executor import AlarmWriteExecutor
+from cloudwatch.alarm_reconciler import print_reconciliation, reconcile_alarms
+from common.aws_client import initialize_aws_client
+from ebs.ebs_utilities import (
+    get_attached_instance_id,
+    get_volume_name,
+    iter_ebs_volumes,
+)
+
+# Uses the repo packages, so run it from the repository root:
+#   python -m ebs.ebs_alarm_manager --help
+
+
+class Config:
+    DEFAULT_REGION = "us-west-2"
+    PAGINATION_COUNT = 500  # describe_volumes page size
+    SNS_ALARM_ACTION_ARN = None  # Set, or pass --sns-topic, to notify on ALARM
+    INCLUDE_OK_ACTION = True  # Also notify the SNS topic on the return to OK
+    ALARM_IMPAIREDVOL_NAME_PREFIX = "ImpairedVol_"
+    ALARM_READLATENCY_NAME_PREFIX = "ReadLatency_"
+    ALARM_WRITELATENCY_NAME_PREFIX = "WriteLatency_"
+    ALARM_METRIC_PERIOD = 60
+    ALARM_IMPAIREDVOL_EVALUATION_PERIODS = 5
+    ALARM_IMPAIREDVOL_DATAPOINTS_TO_ALARM = 5
+    ALARM_READLATENCY_THRESHOLD_MS = 50  # Average milliseconds per read op
+    ALARM_WRITELATENCY_THRESHOLD_MS = 50  # Average milliseconds per write op
+    ALARM_LATENCY_EVALUATION_PERIODS = 5
+    ALARM_LATENCY_DATAPOINTS_TO_ALARM = 3
+    ALARM_WRITE_TPS = 3  # Default CloudWatch PutMetricAlarm/DeleteAlarms quota
+    ALARM_WRITE_WORKERS = 8
+
+
+ALARM_TYPES = ("impairedvol", "readlatency", "writelatency")
+
+
+def alarm_name_prefix(alarm_type):
+    return {
+        "impairedvol": Config.ALARM_IMPAIREDVOL_NAME_PREFIX,
+        "readlatency": Config.ALARM_READLATENCY_NAME_PREFIX,
+        "writelatency": Config.ALARM_WRITELATENCY_NAME_PREFIX,
+    }[alarm_type]
+
+
+def volume_metric(metric_id, volume_id, metric_name, stat="Sum"):
+    return {
+        "Id": metric_id,
+        "MetricStat": {
+            "Metric": {
+                "Namespace": "AWS/EBS",
+                "MetricName": metric_name,
+                "Dimensions": [{"Name": "VolumeId", "Value": volume_id}],
+            },
+            "Period": Config.ALARM_METRIC_PERIOD,
+            "Stat": stat,
+        },
+        "ReturnData": False,
+    }
+
+
+def generate_alarm_description(volume):
+    volume_id = volume["VolumeId"]
+    name = get_volume_name(volume)
+    description = (
+        f"Alarm for EBS volume {volume_id}"
+        + (f" ({name})" if name else "")
+        + f": {volume.get('VolumeType', 'N/A')}, {volume.get('Size', 'N/A')} GiB"
+        + f" in {volume.get('AvailabilityZone', 'N/A')}"
+    )
+    instance_id = get_attached_instance_id(volume)
+    if instance_id:
+        description += f", attached to {instance_id}"
+    return description + "."
+
+
+def build_base_spec(volume, alarm_type):
+    spec = {
+        "AlarmName": alarm_name_prefix(alarm_type) + volume["VolumeId"],
+        "AlarmDescription": generate_alarm_description(volume),
+        "ComparisonOperator": "GreaterThanOrEqualToThreshold",
+    }
+    if Config.SNS_ALARM_ACTION_ARN:
+        spec["AlarmActions"] = [Config.SNS_ALARM_ACTION_ARN]
+        if Config.INCLUDE_OK_ACTION:
+            spec["OKActions"] = [Config.SNS_ALARM_ACTION_ARN]
+    return spec
+
+
+def build_impaired_volume_alarm(volume):
+    # A volume is treated as impaired when I/O is queued but none completes
+    volume_id = volume["VolumeId"]
+    spec = build_base_spec(volume, "impairedvol")
+    spec.update(
+        {
+            "EvaluationPeriods": Config.ALARM_IMPAIREDVOL_EVALUATION_PERIODS,
+            "DatapointsToAlarm": Config.ALARM_IMPAIREDVOL_DATAPOINTS_TO_ALARM,
+            "Threshold": 1,
+            "TreatMissingData": "notBreaching",
+            "Metrics": [
+                {
+                    "Id": "e1",
+                    "Expression": "IF(m3>0 AND m1+m2==0, 1, 0)",
+                    "Label": "ImpairedVolume",
+                    "ReturnData": True,
+                },
+                volume_metric("m1", volume_id, "VolumeReadOps"),
+                volume_metric("m2", volume_id, "VolumeWriteOps"),
+                volume_metric("m3", volume_id, "VolumeQueueLength", stat="Average"),
+            ],
+        }
+    )
+    return spec
+
+
+def build_latency_alarm(volume, alarm_type):
+    # VolumeTotal*Time is in seconds, so (time / ops) * 1000 is milliseconds per op
+    volume_id = volume["VolumeId"]
+    if alarm_type == "readlatency":
+        time_metric, ops_metric, label = "VolumeTotalReadTime", "VolumeReadOps", "Read"
+        threshold = Config.ALARM_READLATENCY_THRESHOLD_MS
+    else:
+        time_metric, ops_metric, label = (
+            "VolumeTotalWriteTime",
+            "VolumeWriteOps",
+            "Write",
+        )
+        threshold = Config.ALARM_WRITELATENCY_THRESHOLD_MS
+
+    spec = build_base_spec(volume, alarm_type)
+    spec.update(
+        {
+            "EvaluationPeriods": Config.ALARM_LATENCY_EVALUATION_PERIODS,
+            "DatapointsToAlarm": Config.ALARM_LATENCY_DATAPOINTS_TO_ALARM,
+            "Threshold": threshold,
+            "TreatMissingData": "notBreaching",
+            "Metrics": [
+                {
+                    "Id": "e1",
+                    "Expression": "IF(m2>0, (m1/m2)*1000, 0)",
+                    "Label": f"{label}LatencyMs",
+                    "ReturnData": True,
+                },
+                volume_metric("m1", volume_id, time_metric),
+                volume_metric("m2", volume_id, ops_metric),
+            ],
+        }
+    )
+    return spec
+
+
+def build_alarm_spec(volume, alarm_type):
+    if alarm_type == "impairedvol":
+        return build_impaired_volume_alarm(volume)
+    if alarm_type in ("readlatency", "writelatency"):
+        return build_latency_alarm(volume, alarm_type)
+    raise ValueError(f"Unknown EBS alarm type: {alarm_type}")
+
+
+def build_desired_alarms(volumes, alarm_types=ALARM_TYPES):
+    """
+    Builds the desired alarm specs for every volume in a single pass over the stream.
+
+    Parameters:
+    volumes (iterable): describe_volumes records, e.g. from iter_ebs_volumes.
+    alarm_types (iterable, optional): Which alarm types to build. Defaults to all.
+
+    Returns:
+    tuple: (volume_count, {alarm_type: [put_metric_alarm specs]})
+    """
+    desired = {alarm_type: [] for alarm_type in alarm_types}
+    volume_count = 0
+    for volume in volumes:
+        volume_count += 1
+        for alarm_type in alarm_types:
+            desired[alarm_type].append(build_alarm_spec(volume, alarm_type))
+    return volume_count, desired
+
+
+def reconcile_ebs_alarms(
+    ec2_client,
+    cloudwatch_client,
+    alarm_types=ALARM_TYPES,
+    tag_predicates=None,
+    dry_run=False,
+    executor=None,
+):
+    """
+    Brings the EBS alarms of every alarm type in line with the current volumes.
+
+    API calls scale with pages, not volumes: one describe_volumes call per page of
+    up to 500 volumes, one describe_alarms call per 100 existing alarms, and writes
+    only for alarms that are missing, drifted or orphaned.
+
+    Alarms are created for attached volumes only, but an alarm is only deleted when
+    its volume no longer exists, so a briefly detached volume keeps its alarms. With
+    tag_predicates nothing is deleted, because volumes outside the selection cannot
+    be told apart from deleted ones.
+
+    Parameters:
+    ec2_client (boto3.client): An EC2 client.
+    cloudwatch_client (boto3.client): A CloudWatch client.
+    alarm_types (iterable, optional): Which alarm types to reconcile. Defaults to all.
+    tag_predicates (list, optional): (key, value) pairs volumes must match.
+    dry_run (bool, optional): Plan only; make no write calls.
+    executor (AlarmWriteExecutor, optional): Executor to issue writes with.
+
+    Returns:
+    tuple: (volume_count, {alarm_type: (plan, results)})
+    """
+    detached_ids = set()
+
+    def attached_volumes():
+        # One pass over every state; volumes that are not attached are only noted
+        for volume in iter_ebs_volumes(
+            ec2_client=ec2_client,
+            states=None,
+            tag_predicates=tag_predicates,
+            page_size=Config.PAGINATION_COUNT,
+        ):
+            if volume.get("State") == "in-use":
+                yield volume
+            else:
+                detached_ids.add(volume["VolumeId"])
+
+    volume_count, desired = build_desired_alarms(
+        attached_volumes(), alarm_types=alarm_types
+    )
+    if executor is None:
+        executor = AlarmWriteExecutor(
+            cloudwatch_client,
+            rate=Config.ALARM_WRITE_TPS,
+            max_workers=Config.ALARM_WRITE_WORKERS,
+        )
+    outcomes = {}
+    for alarm_type, specs in desired.items():
+        prefix = alarm_name_prefix(alarm_type)
+        outcomes[alarm_type] = reconcile_alarms(
+            cloudwatch_client,
+            specs,
+            prefix=prefix,
+            delete_extra=not tag_predicates,
+            dry_run=dry_run,
+            executor=executor,
+            keep=[prefix + volume_id for volume_id in detached_ids],
+        )
+    return volume_count, outcomes
+
+
+def main():
+    args = parse_args()
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+    elif args.verbose:
+        logging.basicConfig(level=logging.INFO)
+    else:
+        logging.basicConfig(level=logging.WARNING)
+
+    if args.sns_topic:
+        Config.SNS_ALARM_ACTION_ARN = args.sns_topic
+    if args.write_tps:
+        Config.ALARM_WRITE_TPS = args.write_tps
+
+    ec2 = initialize_aws_client("ec2", region_name=args.region)
+    cloudwatch = initialize_aws_client("cloudwatch", region_name=args.region)
+    if ec2 is None or cloudwatch is None:
+        logging.error("Failed to initialize AWS clients. Exiting.")
+        sys.exit(1)
+
+    alarm_types = ALARM_TYPES if args.alarm_type == "all" else (args.alarm_type,)
+    tag_predicates = [tuple(tag) for tag in args.tag] if args.tag else None
+
+    volume_count, outcomes = reconcile_ebs_alarms(
+        ec2_client=ec2,
+        cloudwatch_client=cloudwatch,
+        alarm_types=alarm_types,
+        tag_predicates=tag_predicates,
+        dry_run=args.dry_run,
+    )
+
+    failed = 0
+    for alarm_type, (plan, results) in outcomes.items():
+        print_reconciliation(alarm_type, plan, results)
+        failed += sum(1 for error in results.values() if error is not None)
+    print(f"EBS Volumes Processed: {volume_count}, Alarm Writes Failed: {failed}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Reconcile CloudWatch Alarms for EBS Volumes."
+    )
+    parser.add_argument(
+        "--region",
+        default=Config.DEFAULT_REGION,
+        help=f"AWS Region (defaults to {Config.DEFAULT_REGION}).",
+    )
+    parser.add_argument(
+        "--alarm-type",
+        type=lambda x: x.lower(),
+        choices=("all",) + ALARM_TYPES,
+        default="all",
+        help="Which alarm type to process. Default is all.",
+    )
+    parser.add_argument(
+        "--tag",
+        nargs=2,
+        action="append",
+        metavar=("TagName", "TagValue"),
+        help="TagName and TagValue to filter volumes. Repeat to require several tags.",
+    )
+    parser.add_argument("--sns-topic", help="SNS Topic ARN to notify on alarm and ok.")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the plan without writing any alarms.",
+    )
+    parser.add_argument(
+        "--write-tps",
+        type=float,
+        help=f"Maximum PutMetricAlarm/DeleteAlarms calls per second (defaults to {Config.ALARM_WRITE_TPS}).",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Verbose logging.")
+    parser.add_argument("--debug", action="store_true", help="Debug logging.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
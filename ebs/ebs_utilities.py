@@ -0,0 +1,70 @@
+from common.aws_utilities import _resolve_client, iter_paginated
+from common.logging_utilities import setup_logging
+
+logger = setup_logging()
+
+# describe_volumes accepts MaxResults between 5 and 500.
+DEFAULT_VOLUME_PAGE_SIZE = 500
+
+
+def volume_tag_filters(tag_predicates):
+    """
+    Turns (key, value) tag predicates into describe_volumes filters.
+
+    A None value becomes a tag-key filter, so it matches any value.
+    """
+    filters = []
+    for key, value in tag_predicates or []:
+        if value is None:
+            filters.append({"Name": "tag-key", "Values": [key]})
+        else:
+            filters.append({"Name": f"tag:{key}", "Values": [value]})
+    return filters
+
+
+def iter_ebs_volumes(
+    ec2_client=None,
+    region_name=None,
+    states=("in-use",),
+    tag_predicates=None,
+    filters=None,
+    page_size=DEFAULT_VOLUME_PAGE_SIZE,
+):
+    """
+    Yields EBS volume records one describe_volumes page at a time.
+
+    State and tag filtering happen server side, so only matching volumes are paged in.
+
+    Parameters:
+    ec2_client (boto3.client, optional): An EC2 client. If None, one is initialized.
+    region_name (str, optional): The AWS region to use when a client is initialized.
+    states (iterable, optional): Volume states to include. Defaults to attached
+                                 ("in-use") volumes, the only ones that publish metrics.
+                                 None includes every state.
+    tag_predicates (list, optional): (key, value) pairs that must all match.
+    filters (list, optional): Additional describe_volumes filters.
+    page_size (int, optional): MaxResults per page (5-500). Defaults to 500.
+    """
+    ec2_client = _resolve_client(ec2_client, "ec2", region_name)
+    filters = list(filters or []) + volume_tag_filters(tag_predicates)
+    if states:
+        filters.append({"Name": "status", "Values": list(states)})
+    yield from iter_paginated(
+        ec2_client,
+        "describe_volumes",
+        "Volumes",
+        Filters=filters,
+        PaginationConfig={"PageSize": page_size},
+    )
+
+
+def get_volume_name(volume):
+    for tag in volume.get("Tags", []):
+        if tag["Key"] == "Name":
+            return tag["Value"]
+    return None
+
+
+def get_attached_instance_id(volume):
+    attachments = volume.get("Attachments") or []
+    return attachments[0].get("InstanceId") if attachments else None
@@ -1,109 +1,216 @@
 import sys
 import argparse
-from tabulate import tabulate
 from common.logging_utilities import setup_logging
 from common.aws_client import initialize_aws_client
+from common.cache_utilities import add_cache_arguments, configure_cache_from_args
+from common.output_utilities import Column, add_output_arguments, get_output_writer
+from rds.rds_forecast import (
+    DEFAULT_FORECAST_PERIOD,
+    DEFAULT_HISTORY_DAYS,
+    DEFAULT_RECENT_DAYS,
+    build_rds_storage_forecast,
+)
+from rds.rds_inventory import iter_rds_inventory, resolve_inventory_targets
 from rds.rds_utilities import (
-    list_rds_instances,
-    get_rds_allocated_storage,
-    get_rds_free_storage,
-    get_rds_instance_details,
+    iter_rds_detail_report,
+    iter_rds_instances,
+    iter_rds_storage_report,
 )
 
 
-def list_rds_instances_cli(region_name=None):
-    print("Listing RDS Instances:")
+def format_storage_gb(value_bytes):
+    if value_bytes is None:
+        return "N/A"
+    return f"{value_bytes / (1024**3):,.2f} GB"
+
+
+def format_allocated_gb(value_gib):
+    return f"{value_gib:,.2f} GB"  # AllocatedStorage is already in GiB
+
+
+def format_percentage(value):
+    return "N/A" if value is None else f"{value:.1f}%"
+
+
+def format_created_at(value):
+    return value.strftime("%Y-%m-%d %H:%M:%S") if value else "N/A"
+
+
+def format_days(value):
+    return "N/A" if value is None else f"{value:,.1f}"
+
+
+def format_date(value):
+    return value.strftime("%Y-%m-%d") if value else "N/A"
+
+
+def format_tags(tags):
+    # Formatting tags as a comma-separated list
+    return ", ".join([f"{k}: {v}" for k, v in (tags or {}).items()])
+
+
+LIST_COLUMNS = [
+    Column("instance_id", "Instance Identifier"),
+    Column("engine", "Engine"),
+    Column("instance_class", "Class"),
+    Column("status", "Status"),
+    Column("availability_zone", "AZ"),
+]
+
+FORECAST_COLUMNS = [
+    Column("instance_id", "RDS Instance"),
+    Column("allocated_storage", "Allocated (GB)", format_allocated_gb),
+    Column("free_storage", "Free", format_storage_gb),
+    Column("used_percentage", "Used", format_percentage),
+    Column("growth_per_day", "Growth/Day", format_storage_gb),
+    Column("days_to_full", "Days to Full", format_days),
+    Column("full_at", "Full By", format_date),
+    Column("max_allocated_storage", "Max Allocated (GB)"),
+    Column("days_to_max_allocated", "Days to Max", format_days),
+]
+
+# Added in front of the list columns when several regions or accounts are listed
+SCOPE_COLUMNS = [Column("account_id", "Account"), Column("region", "Region")]
+
+STORAGE_COLUMNS = [
+    Column("instance_id", "RDS Instance"),
+    Column("allocated_storage", "Allocated Storage (GB)", format_allocated_gb),
+    Column("used_storage", "Used Storage (GB)", format_storage_gb),
+    Column("free_storage", "Free Storage (GB)", format_storage_gb),
+    Column("free_storage_percentage", "Free Storage (%)", format_percentage),
+]
+
+DETAIL_COLUMNS = [
+    Column("instance_id", "Instance"),
+    Column("allocated_storage", "Allocated Storage", format_allocated_gb),
+    Column("free_storage", "Free Storage", format_storage_gb),
+    Column("engine", "Engine"),
+    Column("availability_zone", "AZ"),
+    Column("created_at", "Created At", format_created_at),
+    Column("tags", "Tags", format_tags),
+]
+
+
+def write_rows(rows, columns, output_format, title=None):
+    # Titles go to stderr for the machine-readable formats so stdout stays parseable
+    if title:
+        print(title, file=sys.stdout if output_format == "table" else sys.stderr)
     try:
-        instances = list_rds_instances(region_name=region_name)
-        for instance in instances:
-            print(f"Instance Identifier: {instance['DBInstanceIdentifier']}")
+        with get_output_writer(output_format, columns) as writer:
+            writer.write_rows(rows)
     except Exception as e:
-        print(f"Error: {e}")
+        print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
 
-def display_cloudwatch_data(region_name=None):
-    print("Fetching RDS CloudWatch Data:")
-    try:
-        instances = list_rds_instances(region_name=region_name)
-        data = []
-        for instance in instances:
-            instance_id = instance["DBInstanceIdentifier"]
-            allocated_storage_gb = get_rds_allocated_storage(
-                instance_id, region_name=region_name
-            )
-            free_storage_bytes = get_rds_free_storage(
-                instance_id, region_name=region_name
-            )  # Now in bytes
+def display_storage_forecast(
+    region_name=None,
+    output_format="table",
+    history_days=DEFAULT_HISTORY_DAYS,
+    period=DEFAULT_FORECAST_PERIOD,
+    recent_days=DEFAULT_RECENT_DAYS,
+    within_days=None,
+):
+    # Ranking needs every row first; building it inside a generator lets write_rows
+    # report a failed fetch the same way as for the streamed commands
+    def rows():
+        yield from build_rds_storage_forecast(
+            region_name=region_name,
+            history_days=history_days,
+            period=period,
+            recent_days=recent_days,
+            within_days=within_days,
+        )
 
-            # Convert bytes to GB and format numbers
-            allocated_storage_str = f"{allocated_storage_gb:,.2f} GB"
-            free_storage_gb = free_storage_bytes / (1024**3)
-            free_storage_str = f"{free_storage_gb:,.2f} GB"
+    write_rows(
+        rows(),
+        FORECAST_COLUMNS,
+        output_format,
+        title="Forecasting RDS Storage Exhaustion:",
+    )
 
-            data.append([instance_id, allocated_storage_str, free_storage_str])
 
-        print(
-            tabulate(
-                data,
-                headers=["RDS Instance", "Allocated Storage (GB)", "Free Storage (GB)"],
-            )
+def list_row(instance, region=None, account_id=None):
+    return {
+        "instance_id": instance["DBInstanceIdentifier"],
+        "account_id": account_id,
+        "region": region,
+        "engine": instance.get("Engine"),
+        "instance_class": instance.get("DBInstanceClass"),
+        "status": instance.get("DBInstanceStatus"),
+        "availability_zone": instance.get("AvailabilityZone"),
+    }
+
+
+def list_rds_instances_cli(
+    region_name=None, output_format="table", regions=None, profiles=None, max_workers=16
+):
+    if not regions and not profiles:
+        rows = (
+            list_row(instance, region=region_name)
+            for instance in iter_rds_instances(region_name=region_name)
         )
-    except Exception as e:
-        print(f"Error: {e}")
-        sys.exit(1)
+        columns = LIST_COLUMNS
+    else:
+        rows = iter_inventory_rows(regions, profiles, region_name, max_workers)
+        columns = SCOPE_COLUMNS + LIST_COLUMNS
+    write_rows(rows, columns, output_format, title="Listing RDS Instances:")
 
 
-def display_detailed_rds_data(region_name=None):
-    print("Fetching Detailed RDS Data:")
+def iter_inventory_rows(regions, profiles, default_region, max_workers):
+    # Region/account pairs are listed concurrently and rows are merged as each pair
+    # finishes; failed pairs are reported on stderr and the rest still complete
     try:
-        instances = list_rds_instances(region_name=region_name)
-        data = []
-        for instance in instances:
-            details = get_rds_instance_details(instance["DBInstanceIdentifier"])
-            allocated_storage_gb = details["allocated_storage"]  # Already in GiB
-            free_storage_bytes = get_rds_free_storage(
-                details["instance_id"], region_name=region_name
-            )  # In bytes
-            free_storage_gb = free_storage_bytes / (1024**3)  # Convert to GB
-
-            # Formatting tags as a comma-separated list
-            tag_str = ", ".join([f"{k}: {v}" for k, v in details["tags"].items()])
-
-            data.append(
-                [
-                    details["instance_id"],
-                    f"{allocated_storage_gb:,.2f} GB",
-                    f"{free_storage_gb:,.2f} GB",
-                    details["engine"],
-                    details["availability_zone"],
-                    details["created_at"].strftime("%Y-%m-%d %H:%M:%S"),
-                    tag_str,
-                ]
+        pairs = resolve_inventory_targets(
+            regions=regions, profiles=profiles, default_region=default_region
+        )
+    except RuntimeError as e:
+        print(f"Error resolving regions: {e}", file=sys.stderr)
+        return
+    failed = 0
+    for profile, region, account_id, instances, error in iter_rds_inventory(
+        pairs, max_workers=max_workers
+    ):
+        if error is not None:
+            failed += 1
+            print(
+                f"Error listing {profile or 'default'}/{region}: {error}",
+                file=sys.stderr,
             )
+            continue
+        for instance in instances:
+            yield list_row(instance, region=region, account_id=account_id)
+    if failed:
+        print(f"{failed} of {len(pairs)} region/account pairs failed.", file=sys.stderr)
+
+
+def split_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def display_cloudwatch_data(region_name=None, output_format="table"):
+    write_rows(
+        iter_rds_storage_report(region_name=region_name),
+        STORAGE_COLUMNS,
+        output_format,
+        title="Fetching RDS CloudWatch Data:",
+    )
 
-        print(
-            tabulate(
-                data,
-                headers=[
-                    "Instance",
-                    "Allocated Storage",
-                    "Free Storage",
-                    "Engine",
-                    "AZ",
-                    "Created At",
-                    "Tags",
-                ],
-            )
-        )
-    except Exception as e:
-        print(f"Error: {e}")
-        sys.exit(1)
+
+def display_detailed_rds_data(region_name=None, max_workers=8, output_format="table"):
+    write_rows(
+        iter_rds_detail_report(region_name=region_name, max_workers=max_workers),
+        DETAIL_COLUMNS,
+        output_format,
+        title="Fetching Detailed RDS Data:",
+    )
 
 
 def parse_global_args(argv):
     global_parser = argparse.ArgumentParser(add_help=False)
     global_parser.add_argument("--region", help="Specify AWS region", default=None)
+    add_cache_arguments(global_parser)
+    add_output_arguments(global_parser)
 
     # Parse only the global args
     global_args, remaining_argv = global_parser.parse_known_args(argv)
@@ -116,12 +223,29 @@ def main(argv=None):
         argv = sys.argv[1:]
 
     global_args, remaining_argv = parse_global_args(argv)
+    configure_cache_from_args(global_args)
 
     parser = argparse.ArgumentParser(description="AWS RDS Management Tool")
     subparsers = parser.add_subparsers(dest="command", help="Commands")
 
     # Command to list RDS instances
     list_parser = subparsers.add_parser("list", help="List RDS instances")
+    list_parser.add_argument(
+        "--regions",
+        type=split_list,
+        help="Comma-separated regions to list, or 'all' for every enabled region.",
+    )
+    list_parser.add_argument(
+        "--profiles",
+        type=split_list,
+        help="Comma-separated AWS profiles (accounts) to list.",
+    )
+    list_parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=16,
+        help="Concurrent region/account workers (default: 16)",
+    )
 
     # Command to display CloudWatch data
     cw_parser = subparsers.add_parser(
@@ -130,15 +254,68 @@ def main(argv=None):
     detail_parser = subparsers.add_parser(
         "detail", help="Display detailed information for RDS instances"
     )
+    detail_parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        help="Maximum concurrent per-instance lookups (default: 8)",
+    )
+
+    forecast_parser = subparsers.add_parser(
+        "forecast", help="Rank RDS instances by forecast time until storage is full"
+    )
+    forecast_parser.add_argument(
+        "--history-days",
+        type=float,
+        default=DEFAULT_HISTORY_DAYS,
+        help=f"Days of FreeStorageSpace history to fit (default: {DEFAULT_HISTORY_DAYS})",
+    )
+    forecast_parser.add_argument(
+        "--period",
+        type=int,
+        default=DEFAULT_FORECAST_PERIOD,
+        help=f"Metric period in seconds (default: {DEFAULT_FORECAST_PERIOD})",
+    )
+    forecast_parser.add_argument(
+        "--recent-days",
+        type=float,
+        default=DEFAULT_RECENT_DAYS,
+        help="Window used to catch recent growth spikes; 0 disables it "
+        f"(default: {DEFAULT_RECENT_DAYS})",
+    )
+    forecast_parser.add_argument(
+        "--within-days",
+        type=float,
+        help="Only show instances forecast to fill within this many days.",
+    )
 
     args = parser.parse_args(remaining_argv)
 
     if args.command == "list":
-        list_rds_instances_cli(global_args.region)
+        list_rds_instances_cli(
+            global_args.region,
+            output_format=global_args.output,
+            regions=args.regions,
+            profiles=args.profiles,
+            max_workers=args.max_workers,
+        )
     elif args.command == "cw":
-        display_cloudwatch_data(global_args.region)
+        display_cloudwatch_data(global_args.region, output_format=global_args.output)
     elif args.command == "detail":
-        display_detailed_rds_data(global_args.region)
+        display_detailed_rds_data(
+            global_args.region,
+            max_workers=args.max_workers,
+            output_format=global_args.output,
+        )
+    elif args.command == "forecast":
+        display_storage_forecast(
+            global_args.region,
+            output_format=global_args.output,
+            history_days=args.history_days,
+            period=args.period,
+            recent_days=args.recent_days,
+            within_days=args.within_days,
+        )
     else:
         parser.print_help()
 
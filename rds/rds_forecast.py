@@ -0,0 +1,168 @@
+import datetime
+import math
+from alerts.forecasting import forecast_exhaustion
+from alerts.metric_history import fetch_history_matrix, minimum_period
+from common.logging_utilities import setup_logging
+from rds.rds_utilities import free_storage_request, iter_rds_instances
+
+logger = setup_logging()
+
+DEFAULT_HISTORY_DAYS = 28
+DEFAULT_FORECAST_PERIOD = 3600
+DEFAULT_RECENT_DAYS = 3
+GIB = 1024**3
+SECONDS_PER_DAY = 86400
+
+
+def _finite(value):
+    return None if value is None or not math.isfinite(value) else float(value)
+
+
+def storage_forecast_row(instance, free_bytes, rate, seconds_to_full, now):
+    """
+    Builds one forecast row from an instance record and its fitted trend.
+
+    Parameters:
+    instance (dict): A describe_db_instances record.
+    free_bytes (float): Fitted current FreeStorageSpace, NaN if unknown.
+    rate (float): Fitted consumption in bytes per second, NaN if unknown.
+    seconds_to_full (float): Seconds until free space runs out; inf if never, NaN if unknown.
+    now (datetime): The time the forecast is measured from.
+
+    Returns:
+    dict: 'instance_id', 'allocated_storage' and 'max_allocated_storage' (GiB),
+          'free_storage' (bytes), 'used_percentage', 'growth_per_day' (bytes),
+          'growth_percentage_per_day', 'days_to_full', 'full_at', and
+          'days_to_max_allocated' for instances with storage autoscaling. Values are
+          None when unknown, and the days/full_at fields are None when the instance
+          is not running out.
+    """
+    allocated_gib = instance["AllocatedStorage"]
+    max_allocated_gib = instance.get("MaxAllocatedStorage")
+    total_bytes = allocated_gib * GIB
+    free_bytes = _finite(free_bytes)
+    rate = _finite(rate)
+    seconds_to_full = _finite(seconds_to_full)
+    growth_per_day = None if rate is None else rate * SECONDS_PER_DAY
+
+    days_to_max_allocated = None
+    if max_allocated_gib and free_bytes is not None and rate:
+        headroom = free_bytes + (max_allocated_gib - allocated_gib) * GIB
+        days_to_max_allocated = headroom / growth_per_day
+
+    return {
+        "instance_id": instance["DBInstanceIdentifier"],
+        "allocated_storage": allocated_gib,
+        "max_allocated_storage": max_allocated_gib,
+        "free_storage": free_bytes,
+        "used_percentage": (
+            None
+            if free_bytes is None or not total_bytes
+            else (total_bytes - free_bytes) / total_bytes * 100
+        ),
+        "growth_per_day": growth_per_day,
+        "growth_percentage_per_day": (
+            None
+            if growth_per_day is None or not total_bytes
+            else growth_per_day / total_bytes * 100
+        ),
+        "days_to_full": (
+            None if seconds_to_full is None else seconds_to_full / SECONDS_PER_DAY
+        ),
+        "full_at": (
+            None
+            if seconds_to_full is None
+            else now + datetime.timedelta(seconds=seconds_to_full)
+        ),
+        "days_to_max_allocated": days_to_max_allocated,
+    }
+
+
+def _forecast_sort_key(row):
+    # Soonest to fill first; instances that are not running out, then those without
+    # enough history, go last
+    if row["days_to_full"] is not None:
+        return (0, row["days_to_full"])
+    return (1 if row["free_storage"] is not None else 2, 0)
+
+
+def build_rds_storage_forecast(
+    region_name=None,
+    rds_client=None,
+    cloudwatch_client=None,
+    history_days=DEFAULT_HISTORY_DAYS,
+    period=DEFAULT_FORECAST_PERIOD,
+    recent_days=DEFAULT_RECENT_DAYS,
+    within_days=None,
+    now=None,
+    **trend_options,
+):
+    """
+    Ranks every RDS instance in a region by how soon its storage fills up.
+
+    FreeStorageSpace history for the whole fleet is fetched with batched GetMetricData
+    calls and aligned into one matrix, then a robust linear trend is fitted to every
+    row in a single vectorized pass (see alerts.forecasting). The time to full is the
+    fitted free space divided by the fitted consumption rate; a burst of growth in the
+    last recent_days shortens it even when the longer history grew slowly.
+
+    Parameters:
+    region_name (str, optional): The AWS region to use.
+    rds_client (boto3.client, optional): An RDS client. If None, one is initialized.
+    cloudwatch_client (boto3.client, optional): A CloudWatch client. If None, one is initialized.
+    history_days (float, optional): Days of history to fit. Defaults to 28.
+    period (int, optional): Metric period in seconds, raised to the shortest period
+                            CloudWatch retains for the window. Defaults to 3600.
+    recent_days (float, optional): Length of the recent-growth window. 0 disables it. Defaults to 3.
+    within_days (float, optional): Only return instances forecast to fill within this many days.
+    now (datetime, optional): End of the history window. Defaults to the current time.
+    **trend_options: Passed to forecast_exhaustion, e.g. min_samples.
+
+    Returns:
+    list of dict: storage_forecast_row dicts, soonest to fill first.
+    """
+    instances = list(iter_rds_instances(region_name=region_name, rds_client=rds_client))
+    if not instances:
+        return []
+
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    start_time = now - datetime.timedelta(days=history_days)
+    # Long windows are only retained at coarse periods; a trend does not need more
+    shortest = minimum_period(start_time)
+    if period < shortest:
+        logger.info(f"Using a {shortest}s period to cover {history_days} days")
+        period = shortest
+    requests = [
+        free_storage_request(instance["DBInstanceIdentifier"], period=period)
+        for instance in instances
+    ]
+    _, history = fetch_history_matrix(
+        requests,
+        start_time,
+        now,
+        period,
+        cloudwatch_client=cloudwatch_client,
+        region_name=region_name,
+    )
+    recent_periods = int(recent_days * SECONDS_PER_DAY // period) or None
+    forecast = forecast_exhaustion(
+        history, period, recent_periods=recent_periods, **trend_options
+    )
+
+    rows = [
+        storage_forecast_row(instance, free_bytes, rate, seconds, now)
+        for instance, free_bytes, rate, seconds in zip(
+            instances,
+            forecast.level.tolist(),
+            forecast.rate.tolist(),
+            forecast.seconds_to_exhaustion.tolist(),
+        )
+    ]
+    if within_days is not None:
+        rows = [
+            row
+            for row in rows
+            if row["days_to_full"] is not None and row["days_to_full"] <= within_days
+        ]
+    rows.sort(key=_forecast_sort_key)
+    return rows
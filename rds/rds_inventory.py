@@ -0,0 +1,256 @@
+from collections import defaultdict
+from common.aws_client import initialize_aws_client
+from common.aws_utilities import get_regions
+from common.concurrency_utilities import ServiceConcurrencyLimits, fan_out
+from common.identity_utilities import get_account_id
+from common.logging_utilities import setup_logging
+from rds.rds_utilities import iter_rds_instances
+
+logger = setup_logging()
+
+
+def tags_to_dict(tag_list):
+    return {tag["Key"]: tag["Value"] for tag in tag_list or []}
+
+
+class RdsInstanceRecord:
+    """
+    Compact, read-only view of the describe_db_instances fields the tools use.
+
+    __slots__ keeps thousands of records small compared with the full describe dicts.
+    """
+
+    __slots__ = (
+        "db_instance_identifier",
+        "db_instance_arn",
+        "db_instance_class",
+        "engine",
+        "availability_zone",
+        "allocated_storage",
+        "status",
+        "created_at",
+        "tags",
+    )
+
+    def __init__(
+        self,
+        db_instance_identifier,
+        db_instance_arn=None,
+        db_instance_class=None,
+        engine=None,
+        availability_zone=None,
+        allocated_storage=None,
+        status=None,
+        created_at=None,
+        tags=None,
+    ):
+        self.db_instance_identifier = db_instance_identifier
+        self.db_instance_arn = db_instance_arn
+        self.db_instance_class = db_instance_class
+        self.engine = engine
+        self.availability_zone = availability_zone
+        self.allocated_storage = allocated_storage
+        self.status = status
+        self.created_at = created_at
+        self.tags = tags or {}
+
+    @classmethod
+    def from_describe(cls, instance):
+        return cls(
+            db_instance_identifier=instance["DBInstanceIdentifier"],
+            db_instance_arn=instance.get("DBInstanceArn"),
+            db_instance_class=instance.get("DBInstanceClass"),
+            engine=instance.get("Engine"),
+            availability_zone=instance.get("AvailabilityZone"),
+            allocated_storage=instance.get("AllocatedStorage"),
+            status=instance.get("DBInstanceStatus"),
+            created_at=instance.get("InstanceCreateTime"),
+            tags=tags_to_dict(instance.get("TagList")),
+        )
+
+    def to_target_details(self):
+        """
+        Returns the dict shape used by the alarm managers' description builders.
+        """
+        return {
+            "db_instance_identifier": self.db_instance_identifier,
+            "db_instance_class": self.db_instance_class,
+            "engine": self.engine,
+            "availability_zone": self.availability_zone,
+            "tags": dict(self.tags),
+        }
+
+    def __repr__(self):
+        return f"RdsInstanceRecord({self.db_instance_identifier!r})"
+
+
+class TagIndex:
+    """
+    Inverted index of tags: key -> value -> set of resource ids.
+
+    Built once from describe output (RDS returns TagList with every instance), so tag
+    filtering needs no list_tags_for_resource calls.
+    """
+
+    def __init__(self):
+        self._index = defaultdict(lambda: defaultdict(set))
+        self._all_ids = set()
+
+    def add(self, resource_id, tags):
+        self._all_ids.add(resource_id)
+        for key, value in tags.items():
+            self._index[key][value].add(resource_id)
+
+    def ids_for(self, key, value=None):
+        """
+        Returns ids tagged with key=value, or with key set to anything when value is None.
+        """
+        values = self._index.get(key)
+        if not values:
+            return set()
+        if value is None:
+            return set().union(*values.values())
+        return set(values.get(value, ()))
+
+    def select(self, predicates):
+        """
+        Returns the ids matching every (key, value) predicate. No predicates selects all.
+        """
+        selected = set(self._all_ids)
+        for key, value in predicates or []:
+            selected &= self.ids_for(key, value)
+            if not selected:
+                break
+        return selected
+
+
+def build_rds_inventory(rds_client=None, region_name=None, page_size=100):
+    """
+    Reads every DB instance in one paginated pass and indexes their tags.
+
+    Parameters:
+    rds_client (boto3.client, optional): An RDS client. If None, one is initialized.
+    region_name (str, optional): The AWS region to use when a client is initialized.
+    page_size (int, optional): MaxRecords per describe_db_instances page.
+
+    Returns:
+    tuple: (instances, tag_index) where instances maps DBInstanceIdentifier to the
+           describe record, in describe order.
+    """
+    instances = {}
+    tag_index = TagIndex()
+    for instance in iter_rds_instances(
+        region_name=region_name, rds_client=rds_client, page_size=page_size
+    ):
+        instance_id = instance["DBInstanceIdentifier"]
+        instances[instance_id] = instance
+        tag_index.add(instance_id, tags_to_dict(instance.get("TagList")))
+    logger.debug(f"Indexed {len(instances)} RDS instances")
+    return instances, tag_index
+
+
+def select_rds_targets(
+    rds_client=None, region_name=None, tag_predicates=None, page_size=100
+):
+    """
+    Selects DB instances matching all tag predicates.
+
+    Parameters:
+    rds_client (boto3.client, optional): An RDS client. If None, one is initialized.
+    region_name (str, optional): The AWS region to use when a client is initialized.
+    tag_predicates (list, optional): (key, value) pairs; a None value matches any value.
+    page_size (int, optional): MaxRecords per describe_db_instances page.
+
+    Returns:
+    tuple: (target_ids, records) where target_ids keeps describe order and records
+           maps each selected id to an RdsInstanceRecord.
+    """
+    instances, tag_index = build_rds_inventory(
+        rds_client=rds_client, region_name=region_name, page_size=page_size
+    )
+    selected = tag_index.select(tag_predicates)
+    target_ids = [instance_id for instance_id in instances if instance_id in selected]
+    return target_ids, {
+        instance_id: RdsInstanceRecord.from_describe(instances[instance_id])
+        for instance_id in target_ids
+    }
+
+
+def resolve_inventory_targets(regions=None, profiles=None, default_region=None):
+    """
+    Expands --regions/--profiles style input into (profile, region) pairs.
+
+    Parameters:
+    regions (list, optional): Region names, or ["all"] for every enabled region of
+                              each profile. None uses default_region.
+    profiles (list, optional): Profile names. None uses the default credential chain.
+    default_region (str, optional): The region used when regions is None, and the
+                                    region the enabled regions are listed from.
+
+    Returns:
+    list: (profile, region) tuples, in profile then region order.
+
+    Raises:
+    RuntimeError: If the enabled regions of a profile cannot be listed.
+    """
+    pairs = []
+    for profile in profiles or [None]:
+        if regions and "all" in regions:
+            profile_regions = get_regions(
+                region_name=default_region, profile_name=profile
+            )
+            if not profile_regions:
+                raise RuntimeError(
+                    f"Failed to list regions for profile {profile or 'default'}."
+                )
+        else:
+            profile_regions = regions or [default_region]
+        pairs.extend((profile, region) for region in profile_regions)
+    return pairs
+
+
+def iter_rds_inventory(pairs, max_workers=16, limits=None, page_size=100):
+    """
+    Lists DB instances for many (profile, region) pairs concurrently.
+
+    Every pair's paginated describe runs on one shared pool, while limits caps the
+    concurrent calls per service and profile so no single account is throttled.
+    Results are yielded as each pair finishes.
+
+    Parameters:
+    pairs (list): (profile, region) tuples, e.g. from resolve_inventory_targets.
+    max_workers (int, optional): Size of the shared worker pool. Defaults to 16.
+    limits (ServiceConcurrencyLimits, optional): Per-service caps. Defaults to
+                                                 DEFAULT_SERVICE_CONCURRENCY.
+    page_size (int, optional): MaxRecords per describe_db_instances page.
+
+    Yields:
+    tuple: (profile, region, account_id, instances, error). On failure instances is
+           empty and error holds the exception.
+    """
+    limits = limits or ServiceConcurrencyLimits()
+
+    def list_pair(pair):
+        profile, region = pair
+        with limits.slot("sts", profile):
+            account_id = get_account_id(profile)
+        with limits.slot("rds", profile):
+            client = initialize_aws_client(
+                "rds", region_name=region, profile_name=profile
+            )
+            if client is None:
+                raise RuntimeError(f"Failed to initialize RDS client in {region}.")
+            instances = list(iter_rds_instances(rds_client=client, page_size=page_size))
+        return account_id, instances
+
+    for (profile, region), result, error in fan_out(
+        list_pair, pairs, max_workers=max_workers
+    ):
+        if error is not None:
+            logger.error(
+                f"Failed to list RDS instances for {profile or 'default'} in {region}: {error}"
+            )
+            yield profile, region, None, [], error
+            continue
+        account_id, instances = result
+        yield profile, region, account_id, instances, None
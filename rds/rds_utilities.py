@@ -1,19 +1,43 @@
-import boto3
 import datetime
 from common.aws_client import initialize_aws_client
+from common.aws_utilities import _resolve_client, batched, iter_paginated
+from cloudwatch.metric_data import (
+    metric_request,
+    get_metric_data_bulk,
+    latest_values,
+    recent_window,
+)
+from common.concurrency_utilities import fan_out
+from common.identity_utilities import rds_db_arn
 from common.logging_utilities import setup_logging
 
 logger = setup_logging()
 
 
-def list_rds_instances(region_name=None):
-    client = initialize_aws_client("rds", region_name=region_name)
-    if client is None:
-        return []
+def iter_rds_instances(region_name=None, rds_client=None, page_size=100):
+    """
+    Yields DB instance records from a paginated describe_db_instances pass.
 
+    Parameters:
+    region_name (str, optional): The AWS region to use.
+    rds_client (boto3.client, optional): An RDS client. If None, one is initialized.
+    page_size (int, optional): MaxRecords per page. Defaults to 100.
+
+    Raises:
+    RuntimeError: If no client was passed and one could not be initialized.
+    """
+    rds_client = _resolve_client(rds_client, "rds", region_name)
+    yield from iter_paginated(
+        rds_client,
+        "describe_db_instances",
+        "DBInstances",
+        PaginationConfig={"PageSize": page_size},
+    )
+
+
+def list_rds_instances(region_name=None):
     try:
-        response = client.describe_db_instances()
-        return response["DBInstances"]
+        return list(iter_rds_instances(region_name=region_name))
     except Exception as e:
         logger.error(f"Error in listing RDS instances: {e}")
         return []
@@ -60,8 +84,87 @@ def get_rds_free_storage(instance_id, region_name=None):
         return f"Error getting free storage: {e}"
 
 
+def free_storage_request(instance_id, period=60):
+    return metric_request(
+        "AWS/RDS",
+        "FreeStorageSpace",
+        {"DBInstanceIdentifier": instance_id},
+        stat="Average",
+        period=period,
+    )
+
+
+def get_rds_free_storage_bulk(
+    instance_ids, region_name=None, minutes=5, period=60, cloudwatch_client=None
+):
+    """
+    Retrieves the latest FreeStorageSpace (bytes) for many RDS instances.
+
+    Uses GetMetricData, so N instances cost ceil(N/500) API calls instead of N.
+
+    Parameters:
+    instance_ids (iterable): DB instance identifiers.
+    region_name (str, optional): The AWS region to use.
+    minutes (int, optional): How far back to look for datapoints. Defaults to 5.
+    period (int, optional): Metric period in seconds. Defaults to 60.
+    cloudwatch_client (boto3.client, optional): A CloudWatch client. If None, one is initialized.
+
+    Returns:
+    dict: Maps each instance id to its latest free storage in bytes, or None if no datapoints were found.
+    """
+    requests = {
+        instance_id: free_storage_request(instance_id, period=period)
+        for instance_id in instance_ids
+    }
+    start_time, end_time = recent_window(minutes)
+    results = get_metric_data_bulk(
+        requests.values(),
+        start_time,
+        end_time,
+        cloudwatch_client=cloudwatch_client,
+        region_name=region_name,
+    )
+    latest = latest_values(results)
+    return {
+        instance_id: latest.get(request) for instance_id, request in requests.items()
+    }
+
+
+def get_rds_free_storage_percentage_bulk(
+    allocated_storage_by_instance, region_name=None, minutes=60, period=3600
+):
+    """
+    Retrieves free storage as a percentage of AllocatedStorage for many RDS instances.
+
+    Parameters:
+    allocated_storage_by_instance (dict): Maps DB instance identifiers to AllocatedStorage in GiB.
+    region_name (str, optional): The AWS region to use.
+    minutes (int, optional): How far back to look for datapoints. Defaults to 60.
+    period (int, optional): Metric period in seconds. Defaults to 3600.
+
+    Returns:
+    dict: Maps each instance id to its free storage percentage, or None if unknown.
+    """
+    free_storage = get_rds_free_storage_bulk(
+        allocated_storage_by_instance.keys(),
+        region_name=region_name,
+        minutes=minutes,
+        period=period,
+    )
+    percentages = {}
+    for instance_id, allocated_gib in allocated_storage_by_instance.items():
+        free_bytes = free_storage.get(instance_id)
+        if free_bytes is None or not allocated_gib:
+            percentages[instance_id] = None
+        else:
+            percentages[instance_id] = free_bytes / (allocated_gib * 1024**3) * 100
+    return percentages
+
+
 def get_rds_free_storage_percentage(instance_id, region_name=None):
-    client = boto3.client("rds", region_name=region_name)
+    client = initialize_aws_client("rds", region_name=region_name)
+    if client is None:
+        return "AWS client initialization failed"
 
     try:
         # Fetch details of the RDS instance
@@ -76,7 +179,7 @@ def get_rds_free_storage_percentage(instance_id, region_name=None):
         )  # Convert from GiB to bytes
 
         # Fetch CloudWatch metrics for FreeStorageSpace
-        cloudwatch = boto3.client("cloudwatch")
+        cloudwatch = initialize_aws_client("cloudwatch", region_name=region_name)
         metrics = cloudwatch.get_metric_statistics(
             Namespace="AWS/RDS",
             MetricName="FreeStorageSpace",
@@ -106,12 +209,10 @@ def get_rds_instance_tags(instance_id, region_name=None):
         return {}
 
     try:
-        # Fetch the AWS account ID
-        sts_client = initialize_aws_client("sts", region_name=region_name)
-        account_id = sts_client.get_caller_identity()["Account"]
-
+        # The account id is memoized per credential source, so this builds the ARN
+        # without an STS call after the first lookup
         response = client.list_tags_for_resource(
-            ResourceName=f"arn:aws:rds:{client.meta.region_name}:{account_id}:db:{instance_id}"
+            ResourceName=rds_db_arn(instance_id, region_name=client.meta.region_name)
         )
         return {tag["Key"]: tag["Value"] for tag in response["TagList"]}
     except Exception as e:
@@ -119,6 +220,25 @@ def get_rds_instance_tags(instance_id, region_name=None):
         return {}
 
 
+def instance_details_from_describe(instance, tags=None):
+    """
+    Builds the detail dict from a describe_db_instances record.
+
+    Tags default to the record's own TagList, which describe_db_instances returns.
+    """
+    if tags is None:
+        tags = {tag["Key"]: tag["Value"] for tag in instance.get("TagList", [])}
+    return {
+        "instance_id": instance["DBInstanceIdentifier"],
+        "allocated_storage": instance["AllocatedStorage"],
+        "engine": instance["Engine"],
+        "availability_zone": instance.get("AvailabilityZone"),
+        "created_at": instance.get("InstanceCreateTime"),
+        "tags": tags,
+        # Add more fields as needed
+    }
+
+
 def get_rds_instance_details(instance_id, region_name=None):
     client = initialize_aws_client("rds", region_name=region_name)
     if client is None:
@@ -126,17 +246,161 @@ def get_rds_instance_details(instance_id, region_name=None):
 
     try:
         response = client.describe_db_instances(DBInstanceIdentifier=instance_id)
-        instance = response["DBInstances"][0]
-        tags = get_rds_instance_tags(instance_id)
-
-        return {
-            "instance_id": instance["DBInstanceIdentifier"],
-            "allocated_storage": instance["AllocatedStorage"],
-            "engine": instance["Engine"],
-            "availability_zone": instance["AvailabilityZone"],
-            "created_at": instance["InstanceCreateTime"],
-            "tags": tags
-            # Add more fields as needed
-        }
+        return instance_details_from_describe(response["DBInstances"][0])
     except Exception as e:
         return f"Error: {e}"
+
+
+def _resolve_instance_tags(rds_client, instances, max_workers):
+    # Only instances whose describe record has no TagList need a tag lookup. The ARN
+    # comes from the record itself, so no account id lookup is needed.
+    missing = [instance for instance in instances if "TagList" not in instance]
+    if not missing:
+        return {}
+
+    def list_tags(instance):
+        response = rds_client.list_tags_for_resource(
+            ResourceName=instance["DBInstanceArn"]
+        )
+        return {tag["Key"]: tag["Value"] for tag in response["TagList"]}
+
+    tags = {}
+    for instance, result, error in fan_out(list_tags, missing, max_workers=max_workers):
+        instance_id = instance["DBInstanceIdentifier"]
+        if error is not None:
+            logger.error(f"Error in getting tags for {instance_id}: {error}")
+        tags[instance_id] = result or {}
+    return tags
+
+
+def iter_rds_detail_report(
+    region_name=None,
+    rds_client=None,
+    cloudwatch_client=None,
+    max_workers=8,
+    page_size=100,
+):
+    """
+    Yields detailed rows for every RDS instance in a region, one page at a time.
+
+    Attributes and tags come from the paginated describe_db_instances pass, and free
+    storage from one bulk GetMetricData fetch per page. Any tag lookups the describe
+    output could not answer run on a bounded thread pool. The cost is O(pages) calls
+    rather than several per instance, and the first rows are available after the
+    first page.
+
+    Parameters:
+    region_name (str, optional): The AWS region to use.
+    rds_client (boto3.client, optional): An RDS client. If None, one is initialized.
+    cloudwatch_client (boto3.client, optional): A CloudWatch client. If None, one is initialized.
+    max_workers (int, optional): Maximum concurrent per-instance lookups. Defaults to 8.
+    page_size (int, optional): Instances per describe page and metric batch. Defaults to 100.
+
+    Yields:
+    dict: The get_rds_instance_details fields plus 'free_storage' (bytes, None if
+          unknown), in describe order.
+
+    Raises:
+    RuntimeError: If no client was passed and one could not be initialized.
+    """
+    rds_client = _resolve_client(rds_client, "rds", region_name)
+
+    pages = batched(
+        iter_rds_instances(rds_client=rds_client, page_size=page_size), page_size
+    )
+    for instances in pages:
+        tags = _resolve_instance_tags(rds_client, instances, max_workers)
+        free_storage = get_rds_free_storage_bulk(
+            [instance["DBInstanceIdentifier"] for instance in instances],
+            region_name=rds_client.meta.region_name,
+            cloudwatch_client=cloudwatch_client,
+        )
+        for instance in instances:
+            instance_id = instance["DBInstanceIdentifier"]
+            details = instance_details_from_describe(instance, tags.get(instance_id))
+            details["free_storage"] = free_storage.get(instance_id)
+            yield details
+
+
+def build_rds_detail_report(
+    region_name=None, rds_client=None, cloudwatch_client=None, max_workers=8
+):
+    """
+    Returns iter_rds_detail_report as a list.
+    """
+    return list(
+        iter_rds_detail_report(
+            region_name=region_name,
+            rds_client=rds_client,
+            cloudwatch_client=cloudwatch_client,
+            max_workers=max_workers,
+        )
+    )
+
+
+def storage_report_row(instance_id, allocated_gib, free_bytes):
+    total_bytes = allocated_gib * 1024**3
+    return {
+        "instance_id": instance_id,
+        "allocated_storage": allocated_gib,
+        "free_storage": free_bytes,
+        "used_storage": None if free_bytes is None else total_bytes - free_bytes,
+        "free_storage_percentage": (
+            None
+            if free_bytes is None or not total_bytes
+            else free_bytes / total_bytes * 100
+        ),
+    }
+
+
+def iter_rds_storage_report(
+    region_name=None, rds_client=None, cloudwatch_client=None, page_size=100
+):
+    """
+    Yields storage report rows for every RDS instance in a region, one page at a time.
+
+    AllocatedStorage comes from the paginated describe_db_instances pass and
+    FreeStorageSpace from one bulk GetMetricData fetch per page, so rows stream out
+    as pages arrive and the fleet costs a few API calls rather than two per instance.
+
+    Parameters:
+    region_name (str, optional): The AWS region to use.
+    rds_client (boto3.client, optional): An RDS client. If None, one is initialized.
+    cloudwatch_client (boto3.client, optional): A CloudWatch client. If None, one is
+                                                initialized in the RDS client's region.
+    page_size (int, optional): Instances per describe page and metric batch. Defaults to 100.
+
+    Yields:
+    dict: 'instance_id', 'allocated_storage' (GiB), 'free_storage' and 'used_storage'
+          (bytes, None if unknown) and 'free_storage_percentage' (None if unknown).
+
+    Raises:
+    RuntimeError: If no client was passed and one could not be initialized.
+    """
+    rds_client = _resolve_client(rds_client, "rds", region_name)
+
+    instances = iter_rds_instances(rds_client=rds_client, page_size=page_size)
+    for page in batched(instances, page_size):
+        allocated = {
+            instance["DBInstanceIdentifier"]: instance["AllocatedStorage"]
+            for instance in page
+        }
+        free_storage = get_rds_free_storage_bulk(
+            allocated.keys(),
+            region_name=rds_client.meta.region_name,
+            cloudwatch_client=cloudwatch_client,
+        )
+        for instance_id, allocated_gib in allocated.items():
+            yield storage_report_row(
+                instance_id, allocated_gib, free_storage.get(instance_id)
+            )
+
+
+def build_rds_storage_report(region_name=None):
+    """
+    Builds a storage report for every RDS instance in a region.
+
+    Returns:
+    list of dict: The rows yielded by iter_rds_storage_report.
+    """
+    return list(iter_rds_storage_report(region_name=region_name))
@@ -4,8 +4,17 @@ import sys
 import os
 import json
 import logging
+import datetime
+from rds.rds_inventory import select_rds_targets
+from cloudwatch.alarm_executor import AlarmWriteExecutor
+from cloudwatch.alarm_reconciler import print_reconciliation, reconcile_alarms
+from cloudwatch.alarm_inventory import get_alarm_index, get_alarm_names
+from alerts.dynamic_thresholds import fetch_low_water_thresholds, stable_thresholds
+from rds.rds_utilities import free_storage_request
 
 ## STATUS: Not Working
+# Uses the repo packages, so run it from the repository root:
+#   python -m starting_points.rds_alarm_manager --help
 
 
 # Make changes to how you want the alarm parameters in this class. The use of a Config data class is for simplicity in the script. It is not the best Python practice.
@@ -29,6 +38,18 @@ class Config:
     ALARM_RDS_STORAGE_DATAPOINTS_TO_ALARM = 1
     ALARM_RDS_STORAGE_EVALUATION_PERIODS = 1
     ALARM_RDS_STORAGE_METRIC_PERIOD = 300  # 5 minutes
+    # --dynamic-thresholds: per-instance thresholds from FreeStorageSpace history
+    DYNAMIC_THRESHOLD_HISTORY_DAYS = 14
+    DYNAMIC_THRESHOLD_PERIOD = 3600  # 1 hour history resolution
+    DYNAMIC_THRESHOLD_HORIZON_HOURS = 48  # Headroom at a high hourly consumption rate
+    DYNAMIC_THRESHOLD_MINIMUM = 1024000  # Never alarm below this many bytes
+    DYNAMIC_THRESHOLD_STEP = 1024**3  # Round up to whole GiB
+    DYNAMIC_THRESHOLD_TOLERANCE = 0.1  # Relative change before a threshold is updated
+    ## Alarm writes ##
+    ALARM_WRITE_TPS = (
+        3  # PutMetricAlarm/DeleteAlarms quota; raise if your account has an increase
+    )
+    ALARM_WRITE_WORKERS = 8
 
 
 def main():
@@ -51,14 +72,22 @@ def main():
         Config.VPC_ENDPOINT_SNS = f"https://sns.{args.region}.amazonaws.com"
 
     rds, cloudwatch, sns = initialize_aws_clients(args.region)
-    # if --tag is used, it requires two values passed (tag_name, tag_value)
-    tag_name, tag_value = args.tag if args.tag else (None, None)
-    targets = get_target_ids(client=rds, tag_name=tag_name, tag_value=tag_value)
-    alarm_names = get_all_alarm_names(cloudwatch=cloudwatch)
-
-    stats = {"created": 0, "deleted": 0, "volumes_processed": 0}
+    # each --tag takes two values (tag_name, tag_value); repeated --tag flags must all match
+    tag_predicates = [tuple(tag) for tag in args.tag] if args.tag else None
+    targets, target_records = select_targets(client=rds, tag_predicates=tag_predicates)
+
+    stats = {
+        "created": 0,
+        "updated": 0,
+        "deleted": 0,
+        "failed": 0,
+        "volumes_processed": 0,
+    }
     without_alarm = []
 
+    if args.write_tps:
+        Config.ALARM_WRITE_TPS = args.write_tps
+
     if args.sns_topic:
         Config.SNS_ALARM_ACTION_ARN = args.sns_topic
         Config.SNS_OK_ACTION_ARN = args.sns_topic
@@ -68,8 +97,8 @@ def main():
     else:
         alarm_type = args.alarm_type
 
-    # Check SNS existence here only for --all and --create
-    if args.create:
+    # Check SNS existence here only for --all, --create and --reconcile
+    if args.create or args.reconcile:
         if not check_sns_exists(sns=sns, sns_topic_arn=Config.SNS_ALARM_ACTION_ARN):
             logging.error(
                 f"Invalid SNS ARN provided: {Config.SNS_ALARM_ACTION_ARN}. Exiting."
@@ -89,38 +118,76 @@ def main():
     else:
         alarm_types_list = [alarm_type]
 
+    thresholds = None
+    if args.dynamic_thresholds and (args.create or args.reconcile):
+        thresholds = compute_dynamic_thresholds(targets=targets, cloudwatch=cloudwatch)
+
     if args.create:
         for alarm_type in alarm_types_list:
             logging.info(f"Creating {alarm_type} alarms...")
             print(f"Creating {alarm_type} alarms...")
+            alarm_names = get_all_alarm_names(
+                cloudwatch=cloudwatch, prefix=ALARM_NAME_PREFIXES[alarm_type]
+            )
             stats["created"] += create_alarms(
                 targets=targets,
                 alarm_names=alarm_names,
                 cloudwatch=cloudwatch,
                 client=rds,
                 alarm_type=alarm_type,
+                target_records=target_records,
+                stats=stats,
+                thresholds=thresholds,
+            )
+
+    if args.reconcile:
+        for alarm_type in alarm_types_list:
+            logging.info(f"Reconciling {alarm_type} alarms...")
+            print(f"Reconciling {alarm_type} alarms...")
+            reconcile_alarm_type(
+                targets=targets,
+                cloudwatch=cloudwatch,
+                client=rds,
+                alarm_type=alarm_type,
+                target_records=target_records,
+                dry_run=args.dry_run,
+                stats=stats,
+                thresholds=thresholds,
+                # Only a full (unfiltered) target set can tell which alarms are orphaned
+                delete_extra=not tag_predicates,
             )
 
     if args.cleanup:
+        # An alarm is only orphaned when its instance is gone, so the cleanup plan
+        # needs every live instance, not just the ones matching --tag
+        live_targets = targets
+        if tag_predicates:
+            live_targets, _ = select_targets(client=rds)
         for alarm_type in alarm_types_list:
             logging.info(f"Cleanup {alarm_type} alarms...")
             print(f"Cleaning up {alarm_type} alarms...")
             stats["deleted"] += cleanup_alarms(
-                targets=targets,
-                alarm_names=alarm_names,
+                targets=live_targets,
                 cloudwatch=cloudwatch,
                 alarm_type=alarm_type,
+                dry_run=args.dry_run,
+                stats=stats,
             )
 
     print(
-        f"RDS Processed: {len(targets)}, Alarms Created: {stats['created']}, Alarms Deleted: {stats['deleted']}"
+        f"RDS Processed: {len(targets)}, Alarms Created: {stats['created']}, Alarms Updated: {stats['updated']}, Alarms Deleted: {stats['deleted']}, Alarm Writes Failed: {stats['failed']}"
     )
     if without_alarm:
         print(f"The following do not have an Alarm: {', '.join(without_alarm)}")
 
 
-def generate_alarm_description(target, client):
-    target_details = fetch_target_info(target=target, client=client, service="rds")
+def generate_alarm_description(target, client, record=None):
+    # Prefer the record from the inventory pass; only describe the target again when
+    # it was not part of that pass
+    if record is not None:
+        target_details = record.to_target_details()
+    else:
+        target_details = fetch_target_info(target=target, client=client, service="rds")
 
     if not target_details:
         return f"Alarm description not available for target: {target}"
@@ -139,94 +206,211 @@ def generate_alarm_description(target, client):
     return alarm_description
 
 
-def get_target_ids(client, tag_name=None, tag_value=None):
-    paginator = client.get_paginator("describe_db_instances")
-    target_ids = []
-
-    for page in paginator.paginate(MaxRecords=Config.PAGINATION_COUNT):
-        for instance in page["DBInstances"]:
-            if tag_name and tag_value:
-                # Manually filter the instances based on tags
-                # Tags are fetched separately for each instance
-                response = client.list_tags_for_resource(
-                    ResourceName=instance["DBInstanceArn"]
-                )
-                tags = {tag["Key"]: tag["Value"] for tag in response.get("TagList", [])}
-                if tags.get(tag_name) == tag_value:
-                    target_ids.append(instance["DBInstanceIdentifier"])
-            else:
-                target_ids.append(instance["DBInstanceIdentifier"])
-
+def select_targets(client, tag_predicates=None):
+    # describe_db_instances already returns TagList, so tag filtering is done against
+    # an index built from the describe pages rather than one list_tags call per instance
+    target_ids, target_records = select_rds_targets(
+        rds_client=client,
+        tag_predicates=tag_predicates,
+        page_size=Config.PAGINATION_COUNT,
+    )
     logging.debug(f"RDS Instance IDs:\n{target_ids}")
+    return target_ids, target_records
+
+
+def get_target_ids(client, tag_name=None, tag_value=None):
+    tag_predicates = [(tag_name, tag_value)] if tag_name and tag_value else None
+    target_ids, _ = select_targets(client=client, tag_predicates=tag_predicates)
     return target_ids
 
 
-def cleanup_alarms(targets, alarm_names, cloudwatch, alarm_type):
-    deleted_count = 0
+ALARM_NAME_PREFIXES = {
+    "freestoragespace": Config.ALARM_RDS_STORAGE_NAME_PREFIX,
+}
 
-    if alarm_type == "impairedvol":
-        search_prefix = Config.ALARM_IMPAIREDVOL_NAME_PREFIX
-    if alarm_type == "readlatency":
-        search_prefix = Config.ALARM_READLATENCY_NAME_PREFIX
-    if alarm_type == "writelatency":
-        search_prefix = Config.ALARM_WRITELATENCY_NAME_PREFIX
-    if alarm_type == "freestoragespace":
-        search_prefix = Config.ALARM_RDS_STORAGE_NAME_PREFIX
 
-    for alarm_name in alarm_names:
-        # Only consider alarms that start with the prefix defined in the Config class
-        if alarm_name.startswith(search_prefix):
-            # Extract target from the alarm name
-            target_id = alarm_name[len(search_prefix) :]
+def plan_alarm_cleanup(targets, alarm_names, prefix):
+    """
+    Works out which alarms belong to targets that no longer exist.
 
-            if target_id not in targets:
-                logging.info(
-                    f"Deleting {alarm_type} alarm {alarm_name} as volume {id} no longer exists"
-                )
-                try:
-                    cloudwatch.delete_alarms(AlarmNames=[alarm_name])
-                    deleted_count += 1
-                except cloudwatch.exceptions.ClientError as e:
-                    logging.error(
-                        f"Failed to delete {alarm_type} alarm {alarm_name}: {e}"
-                    )
-                except Exception as e:
-                    logging.error(f"Unknown error when deleting {alarm_name}: {e}")
-
-            else:
-                logging.info(
-                    f"No change to {alarm_type} alarm {alarm_name} as {id} still exists"
-                )
+    Parameters:
+    targets (iterable): The current target ids.
+    alarm_names (iterable): Existing alarm names that start with prefix.
+    prefix (str): The alarm name prefix for the alarm type.
+
+    Returns:
+    dict: {"delete": sorted names whose target is gone, "keep": sorted names still in use}
+    """
+    target_set = set(targets)
+    plan = {"delete": [], "keep": []}
+    for alarm_name in sorted(alarm_names):
+        if not alarm_name.startswith(prefix):
+            continue
+        target_id = alarm_name[len(prefix) :]
+        plan["keep" if target_id in target_set else "delete"].append(alarm_name)
+    return plan
+
+
+def print_cleanup_plan(plan, alarm_type, results=None):
+    print(
+        f"Plan for {alarm_type}: {len(plan['delete'])} to delete, {len(plan['keep'])} unchanged."
+    )
+    for alarm_name in plan["delete"]:
+        if results is None:
+            print(f"  - {alarm_name}")
+        elif results.get(alarm_name) is None:
+            print(f"  - {alarm_name} (deleted)")
+        else:
+            print(f"  ! {alarm_name} (failed: {results[alarm_name]})")
+
+
+def cleanup_alarms(targets, cloudwatch, alarm_type, dry_run=False, stats=None):
+    search_prefix = ALARM_NAME_PREFIXES.get(alarm_type)
+    if search_prefix is None:
+        logging.error(f"Unknown alarm type for cleanup: {alarm_type}")
+        return 0
+
+    plan = plan_alarm_cleanup(
+        targets=targets,
+        alarm_names=get_all_alarm_names(cloudwatch, prefix=search_prefix),
+        prefix=search_prefix,
+    )
+    logging.info(
+        f"{alarm_type} cleanup plan: {len(plan['delete'])} to delete, {len(plan['keep'])} unchanged"
+    )
+    if dry_run or not plan["delete"]:
+        print_cleanup_plan(plan, alarm_type)
+        return 0
+
+    # DeleteAlarms takes up to 100 names per call; batches run concurrently
+    executor = AlarmWriteExecutor(
+        cloudwatch,
+        rate=Config.ALARM_WRITE_TPS,
+        max_workers=Config.ALARM_WRITE_WORKERS,
+    )
+    results = executor.delete_alarms(plan["delete"])
+    print_cleanup_plan(plan, alarm_type, results=results)
 
+    deleted_count = sum(1 for error in results.values() if error is None)
+    if stats is not None:
+        stats["failed"] = stats.get("failed", 0) + len(results) - deleted_count
     return deleted_count
 
 
+def reconcile_alarm_type(
+    targets,
+    cloudwatch,
+    client,
+    alarm_type,
+    target_records=None,
+    dry_run=False,
+    stats=None,
+    thresholds=None,
+    delete_extra=True,
+):
+    # Desired specs are compared with the live alarms by content hash, so Config
+    # changes (threshold, period, SNS actions) reach existing alarms and an unchanged
+    # fleet results in no write calls at all. delete_extra must be False when the
+    # targets are only a subset (e.g. --tag), or the other instances' alarms go too
+    target_records = target_records or {}
+    desired_specs = [
+        build_alarm_spec(
+            target=target,
+            client=client,
+            alarm_name=generate_alarm_name(target=target, alarm_type=alarm_type),
+            alarm_type=alarm_type,
+            record=target_records.get(target),
+            threshold=(thresholds or {}).get(target),
+        )
+        for target in targets
+    ]
+    executor = AlarmWriteExecutor(
+        cloudwatch,
+        rate=Config.ALARM_WRITE_TPS,
+        max_workers=Config.ALARM_WRITE_WORKERS,
+    )
+    plan, results = reconcile_alarms(
+        cloudwatch,
+        desired_specs,
+        prefix=ALARM_NAME_PREFIXES[alarm_type],
+        delete_extra=delete_extra,
+        dry_run=dry_run,
+        executor=executor,
+    )
+
+    print_reconciliation(alarm_type, plan, results)
+
+    if stats is not None and not dry_run:
+        for action, key in (
+            ("create", "created"),
+            ("update", "updated"),
+            ("delete", "deleted"),
+        ):
+            names = (
+                plan[action]
+                if action == "delete"
+                else [spec["AlarmName"] for spec in plan[action]]
+            )
+            stats[key] += sum(1 for name in names if results.get(name) is None)
+        stats["failed"] += sum(1 for error in results.values() if error is not None)
+    return plan, results
+
+
 def generate_alarm_name(target, alarm_type):
     if alarm_type == "freestoragespace":
         return Config.ALARM_RDS_STORAGE_NAME_PREFIX + target
 
 
-def create_alarms(targets, alarm_names, cloudwatch, client, alarm_type):
-    created_count = 0
+def create_alarms(
+    targets,
+    alarm_names,
+    cloudwatch,
+    client,
+    alarm_type,
+    target_records=None,
+    stats=None,
+    thresholds=None,
+):
+    target_records = target_records or {}
+    thresholds = thresholds or {}
+    alarm_specs = []
     for target in targets:
         alarm_name = generate_alarm_name(target=target, alarm_type=alarm_type)
         if alarm_name not in alarm_names:
-            create_alarm(
-                target=target,
-                cloudwatch=cloudwatch,
-                client=client,
-                alarm_name=alarm_name,
-                alarm_type=alarm_type,
+            alarm_specs.append(
+                build_alarm_spec(
+                    target=target,
+                    client=client,
+                    alarm_name=alarm_name,
+                    alarm_type=alarm_type,
+                    record=target_records.get(target),
+                    threshold=thresholds.get(target),
+                )
             )
-            created_count += 1
         else:
             logging.info(f"CW Alarm {alarm_name} already exists.")
 
+    # PutMetricAlarm calls run concurrently behind a shared rate limiter
+    executor = AlarmWriteExecutor(
+        cloudwatch,
+        rate=Config.ALARM_WRITE_TPS,
+        max_workers=Config.ALARM_WRITE_WORKERS,
+    )
+    results = executor.put_metric_alarms(alarm_specs)
+
+    created_count = sum(1 for error in results.values() if error is None)
+    if stats is not None:
+        stats["failed"] = stats.get("failed", 0) + len(results) - created_count
+        stats.setdefault("alarm_results", {}).update(results)
     return created_count
 
 
-def create_alarm(target, cloudwatch, client, alarm_name, alarm_type):
-    alarm_description = generate_alarm_description(target=target, client=client)
+def build_alarm_spec(
+    target, client, alarm_name, alarm_type, record=None, threshold=None
+):
+    alarm_description = generate_alarm_description(
+        target=target, client=client, record=record
+    )
 
     alarm_details = {
         "AlarmName": alarm_name,
@@ -237,7 +421,7 @@ def create_alarm(target, cloudwatch, client, alarm_name, alarm_type):
     }
 
     if alarm_type == "freestoragespace":
-        alarm_details.update(get_rds_freestoragespace_params(target))
+        alarm_details.update(get_rds_freestoragespace_params(target, threshold))
 
     if Config.INCLUDE_OK_ACTION:
         alarm_details.update(
@@ -247,36 +431,22 @@ def create_alarm(target, cloudwatch, client, alarm_name, alarm_type):
         )
 
     logging.debug(f"CloudWatch JSON:\n{alarm_details}\n")
+    return alarm_details
+
+
+def create_alarm(target, cloudwatch, client, alarm_name, alarm_type, record=None):
+    alarm_details = build_alarm_spec(
+        target=target,
+        client=client,
+        alarm_name=alarm_name,
+        alarm_type=alarm_type,
+        record=record,
+    )
     logging.info(f"Creating {alarm_type} alarm {alarm_name} for volume {target}.")
 
     # Create the new alarm
     try:
-        if Config.INCLUDE_OK_ACTION:
-            cloudwatch.put_metric_alarm(
-                AlarmName=alarm_details["AlarmName"],
-                OKActions=alarm_details["OKActions"],
-                AlarmActions=alarm_details["AlarmActions"],
-                AlarmDescription=alarm_details["AlarmDescription"],
-                EvaluationPeriods=alarm_details["EvaluationPeriods"],
-                DatapointsToAlarm=alarm_details["DatapointsToAlarm"],
-                Threshold=alarm_details["Threshold"],
-                ComparisonOperator=alarm_details["ComparisonOperator"],
-                TreatMissingData=alarm_details["TreatMissingData"],
-                Metrics=alarm_details["Metrics"],
-            )
-        else:
-            cloudwatch.put_metric_alarm(
-                AlarmName=alarm_details["AlarmName"],
-                AlarmActions=alarm_details["AlarmActions"],
-                AlarmDescription=alarm_details["AlarmDescription"],
-                EvaluationPeriods=alarm_details["EvaluationPeriods"],
-                DatapointsToAlarm=alarm_details["DatapointsToAlarm"],
-                Threshold=alarm_details["Threshold"],
-                ComparisonOperator=alarm_details["ComparisonOperator"],
-                TreatMissingData=alarm_details["TreatMissingData"],
-                Metrics=alarm_details["Metrics"],
-            )
-
+        cloudwatch.put_metric_alarm(**alarm_details)
         logging.info(
             f"New {alarm_type} alarm '{alarm_details['AlarmName']}' created for volume {target}"
         )
@@ -288,11 +458,17 @@ def create_alarm(target, cloudwatch, client, alarm_name, alarm_type):
         )
 
 
-def get_rds_freestoragespace_params(target):
+def get_rds_freestoragespace_params(target, threshold=None):
     return {
+        # FreeStorageSpace alarms fire when free space falls below the threshold
+        "ComparisonOperator": "LessThanThreshold",
         "EvaluationPeriods": Config.ALARM_RDS_STORAGE_EVALUATION_PERIODS,
         "DatapointsToAlarm": Config.ALARM_RDS_STORAGE_DATAPOINTS_TO_ALARM,
-        "Threshold": Config.ALARM_RDS_STORAGE_THRESHOLD_VALUE,
+        "Threshold": (
+            threshold
+            if threshold is not None
+            else Config.ALARM_RDS_STORAGE_THRESHOLD_VALUE
+        ),
         "Metrics": [
             {
                 "Id": "m1",
@@ -316,6 +492,49 @@ def get_rds_freestoragespace_params(target):
     }
 
 
+def compute_dynamic_thresholds(targets, cloudwatch):
+    # One batched GetMetricData pass over the fleet's FreeStorageSpace history, then
+    # one NumPy pass for every target's threshold. Targets without enough history
+    # keep the Config.ALARM_RDS_STORAGE_THRESHOLD_VALUE default.
+    end_time = datetime.datetime.now(datetime.timezone.utc)
+    start_time = end_time - datetime.timedelta(
+        days=Config.DYNAMIC_THRESHOLD_HISTORY_DAYS
+    )
+    period = Config.DYNAMIC_THRESHOLD_PERIOD
+    values = fetch_low_water_thresholds(
+        [free_storage_request(target, period=period) for target in targets],
+        start_time,
+        end_time,
+        period,
+        horizon_periods=Config.DYNAMIC_THRESHOLD_HORIZON_HOURS * 3600 / period,
+        cloudwatch_client=cloudwatch,
+        minimum=Config.DYNAMIC_THRESHOLD_MINIMUM,
+        step=Config.DYNAMIC_THRESHOLD_STEP,
+    )
+    thresholds = {
+        target: value for target, value in zip(targets, values) if value is not None
+    }
+    # The window slides on every run; small drifts keep the deployed threshold so an
+    # unchanged fleet is not rewritten
+    deployed = get_alarm_index(
+        cloudwatch,
+        prefix=ALARM_NAME_PREFIXES["freestoragespace"],
+        fields=("Threshold",),
+    )
+    current = {}
+    for target in thresholds:
+        alarm = deployed.get(generate_alarm_name(target, "freestoragespace"))
+        if alarm is not None and "Threshold" in alarm:
+            current[target] = alarm["Threshold"]
+    thresholds = stable_thresholds(
+        thresholds, current, tolerance=Config.DYNAMIC_THRESHOLD_TOLERANCE
+    )
+    logging.info(
+        f"Dynamic thresholds computed for {len(thresholds)} of {len(targets)} targets"
+    )
+    return thresholds
+
+
 def fetch_target_info(target, client, service="rds"):
     # TODO: logic around different services. For now, the default is rds
     if not service or service.lower() != "rds":
@@ -336,7 +555,7 @@ def fetch_target_info(target, client, service="rds"):
             "db_instance_class": instance_info["DBInstanceClass"],
             "engine": instance_info["Engine"],
             "availability_zone": instance_info["AvailabilityZone"],
-            "tags": tags
+            "tags": tags,
             # Add other relevant details you need
         }
 
@@ -349,12 +568,14 @@ def fetch_target_info(target, client, service="rds"):
         return None
 
 
-def get_all_alarm_names(cloudwatch):
-    paginator = cloudwatch.get_paginator("describe_alarms")
-    alarm_names = []
-    for page in paginator.paginate(MaxRecords=Config.PAGINATION_COUNT):
-        for alarm in page["MetricAlarms"]:
-            alarm_names.append(alarm["AlarmName"])
+def get_all_alarm_names(cloudwatch, prefix=None):
+    # AlarmNamePrefix and AlarmTypes are filtered server side, so alarms from other
+    # tools are never paged in; the result is a set for O(1) membership checks
+    alarm_names = get_alarm_names(
+        cloudwatch_client=cloudwatch,
+        prefix=prefix,
+        page_size=Config.PAGINATION_COUNT,
+    )
     logging.debug(f"Alarm Names:\n{alarm_names}")
     return alarm_names
 
@@ -428,12 +649,28 @@ def parse_args():
     parser.add_argument(
         "--tag",
         nargs=2,
+        action="append",
         metavar=("TagName", "TagValue"),
-        help="TagName and TagValue to filter RDS instances.",
+        help="TagName and TagValue to filter RDS instances. Repeat to require several tags.",
     )
     parser.add_argument(
         "--cleanup", action="store_true", help="Cleanup CloudWatch Alarms."
     )
+    parser.add_argument(
+        "--reconcile",
+        action="store_true",
+        help="Create, update and delete alarms so they match the current Config and targets.",
+    )
+    parser.add_argument(
+        "--dynamic-thresholds",
+        action="store_true",
+        help="Derive each instance's FreeStorageSpace threshold from its recent history.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="With --cleanup or --reconcile, print the plan without writing any alarms.",
+    )
     parser.add_argument(
         "--region",
         default=Config.DEFAULT_REGION,
@@ -444,6 +681,11 @@ def parse_args():
         action="store_true",
         help="Perform cleanup, create, and update operations.",
     )
+    parser.add_argument(
+        "--write-tps",
+        type=float,
+        help=f"Maximum PutMetricAlarm/DeleteAlarms calls per second (defaults to {Config.ALARM_WRITE_TPS}).",
+    )
     parser.add_argument("--verbose", action="store_true", help="Verbose logging.")
     parser.add_argument("--debug", action="store_true", help="Debug logging.")
     return parser.parse_args()
@@ -0,0 +1,273 @@
+import datetime
+import unittest
+from unittest.mock import MagicMock
+import boto3
+import numpy as np
+from moto import mock_cloudwatch
+from alerts.backtesting import (
+    STATE_ALARM,
+    STATE_INSUFFICIENT_DATA,
+    STATE_OK,
+    backtest_alarms,
+    backtest_thresholds,
+    evaluate_alarm_states,
+    window_counts,
+)
+from alerts.dynamic_thresholds import low_water_thresholds, stable_thresholds
+from alerts.forecasting import forecast_exhaustion, robust_linear_trends
+from alerts.metric_history import alarm_metric_request, minimum_period
+
+nan = np.nan
+
+
+def storage_alarm(instance_id, threshold, evaluation_periods=1, datapoints=1):
+    return {
+        "AlarmName": f"RDS_Storage_{instance_id}",
+        "ComparisonOperator": "LessThanThreshold",
+        "TreatMissingData": "missing",
+        "EvaluationPeriods": evaluation_periods,
+        "DatapointsToAlarm": datapoints,
+        "Threshold": threshold,
+        "Metrics": [
+            {
+                "Id": "m1",
+                "MetricStat": {
+                    "Metric": {
+                        "Namespace": "AWS/RDS",
+                        "MetricName": "FreeStorageSpace",
+                        "Dimensions": [
+                            {"Name": "DBInstanceIdentifier", "Value": instance_id}
+                        ],
+                    },
+                    "Period": 60,
+                    "Stat": "Average",
+                },
+                "ReturnData": True,
+            }
+        ],
+    }
+
+
+class TestEvaluateAlarmStates(unittest.TestCase):
+    def test_window_counts(self):
+        mask = np.array([[1, 1, 0, 1, 1]], dtype=bool)
+        np.testing.assert_array_equal(window_counts(mask, 3), [[1, 2, 2, 2, 2]])
+
+    def test_m_out_of_n(self):
+        states = evaluate_alarm_states(
+            [1, 5, 5, 1, 5, 5, 5], 3, "GreaterThanThreshold", 3, 2, "notBreaching"
+        )
+        np.testing.assert_array_equal(states, [0, 0, 1, 1, 1, 1, 1])
+
+    def test_rows_use_their_own_thresholds(self):
+        values = np.array([[5.0, 5.0], [5.0, 5.0]])
+        states = evaluate_alarm_states(
+            values, [4, 6], "GreaterThanOrEqualToThreshold", 1
+        )
+        np.testing.assert_array_equal(states, [[1, 1], [0, 0]])
+
+    def test_treat_missing_data(self):
+        values = [5, nan, nan, 1]
+        alarm, ok, unknown = STATE_ALARM, STATE_OK, STATE_INSUFFICIENT_DATA
+        cases = {
+            "missing": [alarm, unknown, unknown, ok],
+            "breaching": [alarm, alarm, alarm, ok],
+            "notBreaching": [alarm, ok, ok, ok],
+            "ignore": [alarm, alarm, alarm, ok],
+        }
+        for treat, expected in cases.items():
+            states = evaluate_alarm_states(
+                values, 3, "GreaterThanThreshold", 1, 1, treat
+            )
+            np.testing.assert_array_equal(states, expected, err_msg=treat)
+
+    def test_unsupported_operator(self):
+        with self.assertRaises(ValueError):
+            evaluate_alarm_states([1], 1, "LessThanLowerThreshold", 1)
+
+    def test_metric_math_alarms_are_rejected(self):
+        alarm = {"AlarmName": "a", "Metrics": [{"Id": "e1", "Expression": "m1*2"}]}
+        with self.assertRaises(ValueError):
+            alarm_metric_request(alarm)
+
+
+class TestBacktestAlarms(unittest.TestCase):
+    @mock_cloudwatch
+    def test_backtest_against_history(self):
+        cloudwatch = boto3.client("cloudwatch", region_name="us-west-2")
+        end_time = datetime.datetime.now(datetime.timezone.utc).replace(
+            second=0, microsecond=0
+        )
+        start_time = end_time - datetime.timedelta(minutes=10)
+        # db1 dips below 100 for two minutes; db2 never does
+        for minute, value in enumerate([500, 500, 50, 40, 500, 500, 500, 500]):
+            for instance_id, offset in (("db1", 0), ("db2", 1000)):
+                cloudwatch.put_metric_data(
+                    Namespace="AWS/RDS",
+                    MetricData=[
+                        {
+                            "MetricName": "FreeStorageSpace",
+                            "Dimensions": [
+                                {"Name": "DBInstanceIdentifier", "Value": instance_id}
+                            ],
+                            "Timestamp": start_time
+                            + datetime.timedelta(minutes=minute + 1),
+                            "Value": value + offset,
+                        }
+                    ],
+                )
+
+        reports = backtest_alarms(
+            [storage_alarm("db1", 100), storage_alarm("db2", 100)],
+            start_time,
+            end_time,
+            cloudwatch_client=cloudwatch,
+        )
+
+        self.assertEqual(reports["RDS_Storage_db1"]["fired"], 1)
+        self.assertEqual(reports["RDS_Storage_db1"]["seconds_in_alarm"], 120)
+        self.assertEqual(
+            reports["RDS_Storage_db1"]["fired_at"],
+            [start_time + datetime.timedelta(minutes=3)],
+        )
+        self.assertEqual(reports["RDS_Storage_db2"]["fired"], 0)
+
+        sweep = backtest_thresholds(
+            storage_alarm("db1", 100, evaluation_periods=2, datapoints=2),
+            [45, 100],
+            start_time,
+            end_time,
+            cloudwatch_client=cloudwatch,
+        )
+        self.assertEqual(sweep[45.0]["fired"], 0)
+        self.assertEqual(sweep[100.0]["fired"], 1)
+
+    def test_period_must_be_retained_for_the_whole_window(self):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        cloudwatch = MagicMock()
+
+        with self.assertRaises(ValueError):
+            backtest_alarms(
+                [storage_alarm("db1", 100)],
+                now - datetime.timedelta(days=90),
+                now,
+                cloudwatch_client=cloudwatch,
+            )
+        cloudwatch.get_metric_data.assert_not_called()
+
+        self.assertEqual(minimum_period(now - datetime.timedelta(days=14)), 60)
+        self.assertEqual(minimum_period(now - datetime.timedelta(days=90)), 3600)
+        with self.assertRaises(ValueError):
+            minimum_period(now - datetime.timedelta(days=500))
+
+    @mock_cloudwatch
+    def test_missing_history_is_reported(self):
+        cloudwatch = boto3.client("cloudwatch", region_name="us-west-2")
+        end_time = datetime.datetime.now(datetime.timezone.utc)
+        start_time = end_time - datetime.timedelta(minutes=10)
+
+        reports = backtest_alarms(
+            [storage_alarm("db1", 100)], start_time, end_time, cloudwatch
+        )
+
+        self.assertEqual(reports["RDS_Storage_db1"]["data_fraction"], 0)
+        self.assertIsNotNone(reports["RDS_Storage_db1"]["error"])
+
+        failing = MagicMock()
+        failing.get_metric_data.side_effect = RuntimeError("throttled")
+        with self.assertRaises(RuntimeError):
+            backtest_alarms([storage_alarm("db1", 100)], start_time, end_time, failing)
+
+
+class TestDynamicThresholds(unittest.TestCase):
+    def test_step_rounds_thresholds_up(self):
+        history = 50.0 + np.random.default_rng(2).normal(0, 1, 48)
+
+        raw = low_water_thresholds(history, horizon_periods=1)
+        stepped = low_water_thresholds(history, horizon_periods=1, step=1)
+
+        self.assertEqual(stepped[0], np.ceil(raw[0]))
+
+    def test_small_drifts_keep_the_deployed_threshold(self):
+        thresholds = stable_thresholds(
+            {"db1": 105.0, "db2": 150.0, "db3": 7.0},
+            {"db1": 100.0, "db2": 100.0},
+            tolerance=0.1,
+        )
+
+        self.assertEqual(thresholds, {"db1": 100.0, "db2": 150.0, "db3": 7.0})
+
+    def test_thresholds_scale_with_level_and_consumption(self):
+        steady_large = np.full(48, 1000.0)
+        steady_small = np.full(48, 100.0)
+        # Drops 10 per period, so 5 periods of headroom is 50
+        draining = 1000.0 - 10.0 * np.arange(48)
+        sparse = np.full(48, np.nan)
+        sparse[:3] = 50.0
+
+        thresholds = low_water_thresholds(
+            np.vstack([steady_large, steady_small, draining, sparse]),
+            horizon_periods=5,
+            level_percentile=0,
+            level_fraction=0.01,
+            min_samples=24,
+        )
+
+        np.testing.assert_allclose(thresholds[:3], [10.0, 1.0, 50.0])
+        self.assertTrue(np.isnan(thresholds[3]))
+
+    def test_minimum_and_gaps(self):
+        history = np.array([[100.0, np.nan, 90.0, np.nan, 80.0] * 6])
+        thresholds = low_water_thresholds(
+            history, horizon_periods=1, level_fraction=0.1, minimum=50, min_samples=10
+        )
+        np.testing.assert_allclose(thresholds, [50.0])
+
+
+class TestForecasting(unittest.TestCase):
+    def test_trend_ignores_spikes_and_gaps(self):
+        t = np.arange(200, dtype=float)
+        steady = 1000 - 2 * t
+        spiky = steady.copy()
+        spiky[50] += 800
+        spiky[120] -= 600
+        spiky[80:90] = nan
+
+        levels, slopes = robust_linear_trends(np.vstack([steady, spiky]))
+
+        np.testing.assert_allclose(slopes, [-2, -2], atol=0.05)
+        np.testing.assert_allclose(levels, [602, 602], atol=5)
+
+    def test_rows_without_enough_history_are_nan(self):
+        short = np.full(100, nan)
+        short[:10] = 5
+        levels, slopes = robust_linear_trends(short, min_samples=24)
+        self.assertTrue(np.isnan(levels[0]) and np.isnan(slopes[0]))
+
+    def test_time_to_exhaustion(self):
+        t = np.arange(100, dtype=float)
+        history = np.vstack([1000 - 5 * t, np.full(100, 50.0), 200 + t])
+
+        forecast = forecast_exhaustion(history, period=60)
+
+        # 505 left, consumed at 5 per 60 seconds
+        self.assertAlmostEqual(forecast.seconds_to_exhaustion[0], 505 / 5 * 60, 3)
+        self.assertEqual(forecast.seconds_to_exhaustion[1], np.inf)
+        self.assertEqual(forecast.seconds_to_exhaustion[2], np.inf)
+        self.assertEqual(forecast.rate[2], 0)
+
+    def test_recent_growth_shortens_the_forecast(self):
+        slow = 1000 - 0.1 * np.arange(300)
+        history = np.concatenate([slow, slow[-1] - 5 * np.arange(1, 25)])
+
+        long_only = forecast_exhaustion(history, period=3600)
+        with_recent = forecast_exhaustion(history, period=3600, recent_periods=24)
+
+        self.assertAlmostEqual(with_recent.rate[0] * 3600, 5, 3)
+        self.assertLess(
+            with_recent.seconds_to_exhaustion[0], long_only.seconds_to_exhaustion[0] / 5
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
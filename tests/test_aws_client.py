@@ -1,7 +1,15 @@
+import threading
 import unittest
 from moto import mock_s3, mock_ec2
 from botocore.exceptions import ClientError
-from common.aws_client import initialize_aws_client, initialize_aws_resource
+from common.aws_client import (
+    initialize_aws_client,
+    initialize_aws_resource,
+    get_client_cache_stats,
+    get_client_registry,
+    clear_client_cache,
+    DEFAULT_MAX_POOL_CONNECTIONS,
+)
 
 
 class TestAWSClient(unittest.TestCase):
@@ -31,6 +39,61 @@ class TestAWSClient(unittest.TestCase):
         # Additional checks can be added here if necessary
 
 
+class TestClientRegistry(unittest.TestCase):
+    def setUp(self):
+        clear_client_cache()
+
+    def tearDown(self):
+        clear_client_cache()
+
+    @mock_ec2
+    def test_client_is_reused(self):
+        first = initialize_aws_client("ec2", region_name="us-east-1")
+        second = initialize_aws_client("ec2", region_name="us-east-1")
+        self.assertIs(first, second)
+        stats = get_client_cache_stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 1)
+
+    @mock_ec2
+    def test_clients_are_keyed_by_region_and_endpoint(self):
+        east = initialize_aws_client("ec2", region_name="us-east-1")
+        west = initialize_aws_client("ec2", region_name="us-west-2")
+        endpoint = initialize_aws_client(
+            "ec2",
+            region_name="us-east-1",
+            endpoint_url="https://ec2.us-east-1.amazonaws.com",
+        )
+        self.assertIsNot(east, west)
+        self.assertIsNot(east, endpoint)
+        self.assertEqual(get_client_cache_stats()["clients"], 3)
+
+    @mock_ec2
+    def test_client_shared_across_threads(self):
+        clients = []
+
+        def worker():
+            clients.append(initialize_aws_client("ec2", region_name="us-east-1"))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(client) for client in clients}), 1)
+        self.assertEqual(get_client_cache_stats()["clients"], 1)
+
+    def test_max_pool_connections_applied(self):
+        registry = get_client_registry()
+        registry.set_max_pool_connections(25)
+        try:
+            client = initialize_aws_client("ec2", region_name="us-east-1")
+            self.assertEqual(client.meta.config.max_pool_connections, 25)
+        finally:
+            registry.set_max_pool_connections(DEFAULT_MAX_POOL_CONNECTIONS)
+
+
 @mock_ec2
 def test_initialize_with_invalid_region(self):
     with self.assertRaises(ClientError):
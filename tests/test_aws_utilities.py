@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import MagicMock
 import boto3
 from moto import mock_ec2, mock_rds
 from common.aws_utilities import (
@@ -15,6 +16,9 @@ from common.aws_utilities import (
     get_subnets_for_vpc,
     create_db_subnet_group,
     get_db_subnet_groups,
+    iter_paginated,
+    iter_security_groups,
+    iter_subnets,
 )
 
 
@@ -268,5 +272,82 @@ class TestAWSUtilities(unittest.TestCase):
         self.assertIn("test_subnet_group", subnet_groups)
 
 
+class TestPagination(unittest.TestCase):
+    def test_iter_paginated_reads_every_page(self):
+        client = MagicMock()
+        client.can_paginate.return_value = True
+        client.get_paginator.return_value.paginate.return_value = iter(
+            [
+                {"SecurityGroups": [{"GroupId": "sg-1"}, {"GroupId": "sg-2"}]},
+                {"SecurityGroups": [{"GroupId": "sg-3"}]},
+            ]
+        )
+
+        items = list(
+            iter_paginated(client, "describe_security_groups", "SecurityGroups")
+        )
+
+        self.assertEqual([item["GroupId"] for item in items], ["sg-1", "sg-2", "sg-3"])
+        client.get_paginator.assert_called_once_with("describe_security_groups")
+
+    def test_iter_paginated_falls_back_to_single_call(self):
+        client = MagicMock()
+        client.can_paginate.return_value = False
+        client.describe_key_pairs.return_value = {"KeyPairs": [{"KeyName": "k1"}]}
+
+        items = list(iter_paginated(client, "describe_key_pairs", "KeyPairs"))
+
+        self.assertEqual(items, [{"KeyName": "k1"}])
+
+    def test_iter_paginated_is_lazy(self):
+        client = MagicMock()
+        client.can_paginate.return_value = True
+
+        def pages():
+            yield {"Subnets": [{"SubnetId": "subnet-1"}]}
+            raise AssertionError("second page should not be requested")
+
+        client.get_paginator.return_value.paginate.return_value = pages()
+
+        first = next(iter_paginated(client, "describe_subnets", "Subnets"))
+
+        self.assertEqual(first["SubnetId"], "subnet-1")
+
+    @mock_ec2
+    def test_iter_security_groups_with_filters(self):
+        ec2 = boto3.client("ec2", region_name="us-east-1")
+        vpc_id = ec2.create_vpc(CidrBlock="10.0.0.0/16")["Vpc"]["VpcId"]
+        created = {
+            ec2.create_security_group(
+                GroupName=f"sg-{i}", Description="test", VpcId=vpc_id
+            )["GroupId"]
+            for i in range(3)
+        }
+
+        found = {
+            sg["GroupId"]
+            for sg in iter_security_groups(
+                region_name="us-east-1",
+                filters=[{"Name": "vpc-id", "Values": [vpc_id]}],
+            )
+        }
+
+        self.assertTrue(created.issubset(found))
+
+    @mock_ec2
+    def test_iter_subnets(self):
+        ec2 = boto3.client("ec2", region_name="us-east-1")
+        vpc_id = ec2.create_vpc(CidrBlock="10.0.0.0/16")["Vpc"]["VpcId"]
+        subnet_id = ec2.create_subnet(VpcId=vpc_id, CidrBlock="10.0.1.0/24")["Subnet"][
+            "SubnetId"
+        ]
+
+        subnets = list(
+            iter_subnets(ec2, filters=[{"Name": "vpc-id", "Values": [vpc_id]}])
+        )
+
+        self.assertEqual([subnet["SubnetId"] for subnet in subnets], [subnet_id])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,314 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import boto3
+from moto import mock_ec2
+from botocore.exceptions import ClientError
+from cli.ec2_instance_manager import (
+    Config,
+    launch_instances_in_chunks,
+    monitor_instance_status,
+    find_launch_runs,
+    scan_launch_runs,
+    teardown_launch_runs,
+)
+
+
+def run_instances_response(count, start=0):
+    return {"Instances": [{"InstanceId": f"i-{start + i:04d}"} for i in range(count)]}
+
+
+def capacity_error():
+    return ClientError(
+        {"Error": {"Code": "InsufficientInstanceCapacity", "Message": "no capacity"}},
+        "RunInstances",
+    )
+
+
+class TestLaunchInstancesInChunks(unittest.TestCase):
+    subnets = [("subnet-a", "us-east-1a"), ("subnet-b", "us-east-1b")]
+
+    def test_instances_are_requested_in_chunks(self):
+        ec2_client = MagicMock()
+        ec2_client.run_instances.side_effect = lambda **kwargs: run_instances_response(
+            kwargs["MaxCount"]
+        )
+
+        instance_ids, report = launch_instances_in_chunks(
+            ec2_client, {"ImageId": "ami-1"}, 120, self.subnets, chunk_size=50
+        )
+
+        self.assertEqual(len(instance_ids), 120)
+        self.assertEqual(
+            [
+                call.kwargs["MaxCount"]
+                for call in ec2_client.run_instances.call_args_list
+            ],
+            [50, 50, 20],
+        )
+        self.assertTrue(all(chunk["error"] is None for chunk in report))
+
+    def test_capacity_error_moves_to_next_subnet(self):
+        ec2_client = MagicMock()
+        ec2_client.run_instances.side_effect = [
+            capacity_error(),
+            run_instances_response(10),
+        ]
+
+        instance_ids, report = launch_instances_in_chunks(
+            ec2_client, {"ImageId": "ami-1"}, 10, self.subnets, chunk_size=50
+        )
+
+        self.assertEqual(len(instance_ids), 10)
+        second_call = ec2_client.run_instances.call_args_list[1].kwargs
+        self.assertEqual(second_call["SubnetId"], "subnet-b")
+        self.assertEqual(second_call["Placement"], {"AvailabilityZone": "us-east-1b"})
+        self.assertEqual(report[0]["error"], "InsufficientInstanceCapacity")
+
+    def test_shortfall_is_retried_in_next_subnet(self):
+        ec2_client = MagicMock()
+        ec2_client.run_instances.side_effect = [
+            run_instances_response(6),
+            run_instances_response(4, start=6),
+        ]
+
+        instance_ids, report = launch_instances_in_chunks(
+            ec2_client, {"ImageId": "ami-1"}, 10, self.subnets, chunk_size=50
+        )
+
+        self.assertEqual(len(instance_ids), 10)
+        self.assertEqual(
+            ec2_client.run_instances.call_args_list[1].kwargs["MaxCount"], 4
+        )
+        self.assertEqual([chunk["launched"] for chunk in report], [6, 4])
+
+    def test_partial_success_when_all_subnets_exhausted(self):
+        ec2_client = MagicMock()
+        ec2_client.run_instances.side_effect = [
+            run_instances_response(3),
+            capacity_error(),
+        ]
+
+        instance_ids, report = launch_instances_in_chunks(
+            ec2_client, {"ImageId": "ami-1"}, 10, self.subnets, chunk_size=50
+        )
+
+        self.assertEqual(len(instance_ids), 3)
+        self.assertEqual(len(report), 2)
+
+
+def describe_pages(states_by_tick):
+    """
+    Builds a fake paginate() that returns the next tick's states on each call.
+    IDs missing from a tick are not returned, as if not yet visible.
+    """
+    ticks = iter(states_by_tick)
+
+    def paginate(**kwargs):
+        ids = kwargs["Filters"][-1]["Values"]
+        states = next(ticks)
+        return iter(
+            [
+                {
+                    "Reservations": [
+                        {
+                            "Instances": [
+                                {
+                                    "InstanceId": instance_id,
+                                    "State": {"Name": states[instance_id]},
+                                    "PrivateIpAddress": "10.0.0.1",
+                                }
+                                for instance_id in ids
+                                if instance_id in states
+                            ]
+                        }
+                    ]
+                }
+            ]
+        )
+
+    return paginate
+
+
+class TestMonitorInstanceStatus(unittest.TestCase):
+    @patch("cli.ec2_instance_manager.time.sleep")
+    def test_instances_are_polled_together_until_running(self, sleep):
+        ec2_client = MagicMock()
+        ec2_client.can_paginate.return_value = True
+        ec2_client.get_paginator.return_value.paginate.side_effect = describe_pages(
+            [
+                {"i-1": "pending", "i-2": "pending"},
+                {"i-1": "pending", "i-2": "pending"},
+                {"i-1": "running", "i-2": "pending"},
+                {"i-2": "running"},
+            ]
+        )
+
+        monitor_instance_status(
+            ["i-1", "i-2"], ec2_client, "plain", None, "us-east-1", quiet=True
+        )
+
+        paginate = ec2_client.get_paginator.return_value.paginate
+        self.assertEqual(paginate.call_count, 4)
+        # Only i-2 is still tracked on the last tick.
+        self.assertEqual(paginate.call_args.kwargs["Filters"][-1]["Values"], ["i-2"])
+        intervals = [call.args[0] for call in sleep.call_args_list]
+        self.assertEqual(
+            intervals,
+            [
+                Config.MONITOR_MIN_INTERVAL,
+                Config.MONITOR_MIN_INTERVAL * Config.MONITOR_BACKOFF_FACTOR,
+                Config.MONITOR_MIN_INTERVAL,
+            ],
+        )
+
+    @patch("cli.ec2_instance_manager.time.sleep")
+    def test_repeated_describe_failures_stop_monitoring(self, sleep):
+        ec2_client = MagicMock()
+        ec2_client.can_paginate.return_value = True
+        ec2_client.get_paginator.return_value.paginate.side_effect = ClientError(
+            {"Error": {"Code": "RequestLimitExceeded", "Message": "slow down"}},
+            "DescribeInstances",
+        )
+
+        pending = monitor_instance_status(
+            ["i-2", "i-1"], ec2_client, "plain", None, "us-east-1", quiet=True
+        )
+
+        self.assertEqual(pending, ["i-1", "i-2"])
+        self.assertEqual(sleep.call_count, Config.MONITOR_MAX_FAILURES - 1)
+
+    @patch("cli.ec2_instance_manager.time.monotonic")
+    @patch("cli.ec2_instance_manager.time.sleep")
+    def test_instances_that_never_appear_time_out(self, sleep, monotonic):
+        monotonic.side_effect = [0, 1, Config.MONITOR_TIMEOUT]
+        ec2_client = MagicMock()
+        ec2_client.can_paginate.return_value = True
+        ec2_client.get_paginator.return_value.paginate.side_effect = describe_pages(
+            [{"i-1": "running"}, {}]
+        )
+
+        pending = monitor_instance_status(
+            ["i-1", "i-2"], ec2_client, "plain", None, "us-east-1", quiet=True
+        )
+
+        self.assertEqual(pending, ["i-2"])
+        self.assertEqual(sleep.call_count, 1)
+
+    @mock_ec2
+    @patch("cli.ec2_instance_manager.time.sleep")
+    def test_monitor_with_moto(self, sleep):
+        ec2 = boto3.client("ec2", region_name="us-east-1")
+        response = ec2.run_instances(ImageId="ami-12c6146b", MinCount=3, MaxCount=3)
+        instance_ids = [instance["InstanceId"] for instance in response["Instances"]]
+
+        monitor_instance_status(
+            instance_ids, ec2, "plain", None, "us-east-1", quiet=True
+        )
+
+        sleep.assert_not_called()
+
+
+class TestLaunchRunScan(unittest.TestCase):
+    @mock_ec2
+    def test_find_launch_runs(self):
+        ec2 = boto3.client("ec2", region_name="us-east-1")
+        ec2.run_instances(
+            ImageId="ami-12c6146b",
+            MinCount=2,
+            MaxCount=2,
+            TagSpecifications=[
+                {
+                    "ResourceType": "instance",
+                    "Tags": [{"Key": "LaunchRun", "Value": "run-1"}],
+                }
+            ],
+        )
+        ec2.run_instances(ImageId="ami-12c6146b", MinCount=1, MaxCount=1)
+
+        self.assertEqual(find_launch_runs(ec2), {"run-1"})
+
+    @mock_ec2
+    def test_scan_launch_runs_across_regions(self):
+        for region, launch_run in (
+            ("us-east-1", "run-east"),
+            ("us-west-2", "run-west"),
+        ):
+            boto3.client("ec2", region_name=region).run_instances(
+                ImageId="ami-12c6146b",
+                MinCount=1,
+                MaxCount=1,
+                TagSpecifications=[
+                    {
+                        "ResourceType": "instance",
+                        "Tags": [{"Key": "LaunchRun", "Value": launch_run}],
+                    }
+                ],
+            )
+
+        results = dict(
+            scan_launch_runs(["us-east-1", "us-west-2", "eu-west-1"], max_workers=3)
+        )
+
+        self.assertEqual(results["us-east-1"], {"run-east"})
+        self.assertEqual(results["us-west-2"], {"run-west"})
+        self.assertEqual(results["eu-west-1"], set())
+
+
+def launch_tagged_instance(ec2, launch_run, count=1):
+    return ec2.run_instances(
+        ImageId="ami-12c6146b",
+        MinCount=count,
+        MaxCount=count,
+        TagSpecifications=[
+            {
+                "ResourceType": "instance",
+                "Tags": [{"Key": "LaunchRun", "Value": launch_run}],
+            }
+        ],
+    )["Instances"]
+
+
+class TestTeardownLaunchRuns(unittest.TestCase):
+    @mock_ec2
+    @patch("cli.ec2_instance_manager.time.sleep")
+    def test_teardown_terminates_instances_and_deletes_volumes(self, sleep):
+        ec2 = boto3.client("ec2", region_name="us-east-1")
+        run_1 = launch_tagged_instance(ec2, "run-1", count=2)
+        run_2 = launch_tagged_instance(ec2, "run-2")
+        other = launch_tagged_instance(ec2, "run-other")
+        leftover = ec2.create_volume(
+            AvailabilityZone="us-east-1a",
+            Size=5,
+            TagSpecifications=[
+                {
+                    "ResourceType": "volume",
+                    "Tags": [{"Key": "LaunchRun", "Value": "run-1"}],
+                }
+            ],
+        )["VolumeId"]
+
+        summaries = teardown_launch_runs(["run-1", "run-2"], ["us-east-1", "us-west-2"])
+
+        by_region = {summary["region"]: summary for summary in summaries}
+        self.assertEqual(
+            set(by_region["us-east-1"]["instances"]),
+            {instance["InstanceId"] for instance in run_1 + run_2},
+        )
+        self.assertIn(leftover, by_region["us-east-1"]["volumes_deleted"])
+        self.assertEqual(by_region["us-west-2"]["instances"], [])
+
+        states = {
+            instance["InstanceId"]: instance["State"]["Name"]
+            for reservation in ec2.describe_instances()["Reservations"]
+            for instance in reservation["Instances"]
+        }
+        self.assertEqual(states[run_1[0]["InstanceId"]], "terminated")
+        self.assertEqual(states[other[0]["InstanceId"]], "running")
+        remaining_volumes = {
+            volume["VolumeId"] for volume in ec2.describe_volumes()["Volumes"]
+        }
+        self.assertNotIn(leftover, remaining_volumes)
+
+
+if __name__ == "__main__":
+    unittest.main()
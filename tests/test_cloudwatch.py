@@ -0,0 +1,283 @@
+import datetime
+import unittest
+from unittest.mock import MagicMock, patch
+import boto3
+from moto import mock_cloudwatch
+from botocore.exceptions import ClientError
+from cloudwatch.alarm_executor import AlarmWriteExecutor
+from cloudwatch.alarm_inventory import get_alarm_index, get_alarm_names
+from cloudwatch.alarm_reconciler import alarm_fingerprint, reconcile_alarms
+from cloudwatch.metric_data import (
+    metric_request,
+    get_metric_data_bulk,
+    latest_values,
+    MAX_QUERIES_PER_REQUEST,
+)
+
+
+class TestMetricData(unittest.TestCase):
+    def test_metric_request_is_hashable_and_normalized(self):
+        from_dict = metric_request("AWS/RDS", "FreeStorageSpace", {"B": "2", "A": "1"})
+        from_list = metric_request(
+            "AWS/RDS",
+            "FreeStorageSpace",
+            [{"Name": "A", "Value": "1"}, {"Name": "B", "Value": "2"}],
+        )
+        self.assertEqual(from_dict, from_list)
+        self.assertEqual(len({from_dict, from_list}), 1)
+
+    def test_requests_are_batched(self):
+        client = MagicMock()
+
+        def get_metric_data(**kwargs):
+            return {
+                "MetricDataResults": [
+                    {"Id": q["Id"], "Timestamps": [], "Values": []}
+                    for q in kwargs["MetricDataQueries"]
+                ]
+            }
+
+        client.get_metric_data.side_effect = get_metric_data
+        requests = [
+            metric_request(
+                "AWS/RDS", "FreeStorageSpace", {"DBInstanceIdentifier": f"db{i}"}
+            )
+            for i in range(MAX_QUERIES_PER_REQUEST * 2 + 1)
+        ]
+        now = datetime.datetime.utcnow()
+        results = get_metric_data_bulk(
+            requests, now - datetime.timedelta(hours=1), now, cloudwatch_client=client
+        )
+        self.assertEqual(client.get_metric_data.call_count, 3)
+        self.assertEqual(len(results), len(requests))
+
+    def test_next_token_is_followed(self):
+        client = MagicMock()
+        t1 = datetime.datetime(2024, 1, 1, 0, 0)
+        t2 = datetime.datetime(2024, 1, 1, 0, 5)
+        client.get_metric_data.side_effect = [
+            {
+                "MetricDataResults": [
+                    {"Id": "q0", "Timestamps": [t1], "Values": [1.0]}
+                ],
+                "NextToken": "token",
+            },
+            {"MetricDataResults": [{"Id": "q0", "Timestamps": [t2], "Values": [2.0]}]},
+        ]
+        request = metric_request(
+            "AWS/RDS", "FreeStorageSpace", {"DBInstanceIdentifier": "db"}
+        )
+        results = get_metric_data_bulk([request], t1, t2, cloudwatch_client=client)
+        self.assertEqual(results[request]["Values"], [1.0, 2.0])
+        self.assertEqual(
+            client.get_metric_data.call_args_list[1].kwargs["NextToken"], "token"
+        )
+        self.assertEqual(latest_values(results)[request], 2.0)
+
+    @mock_cloudwatch
+    def test_get_metric_data_bulk_with_moto(self):
+        cloudwatch = boto3.client("cloudwatch", region_name="us-east-1")
+        now = datetime.datetime.utcnow()
+        for name, value in (("db1", 100.0), ("db2", 200.0)):
+            cloudwatch.put_metric_data(
+                Namespace="AWS/RDS",
+                MetricData=[
+                    {
+                        "MetricName": "FreeStorageSpace",
+                        "Dimensions": [{"Name": "DBInstanceIdentifier", "Value": name}],
+                        "Timestamp": now,
+                        "Value": value,
+                    }
+                ],
+            )
+        requests = {
+            name: metric_request(
+                "AWS/RDS", "FreeStorageSpace", {"DBInstanceIdentifier": name}, period=60
+            )
+            for name in ("db1", "db2", "db3")
+        }
+        results = get_metric_data_bulk(
+            requests.values(),
+            now - datetime.timedelta(minutes=5),
+            now + datetime.timedelta(minutes=1),
+            region_name="us-east-1",
+        )
+        latest = latest_values(results)
+        self.assertEqual(latest[requests["db1"]], 100.0)
+        self.assertEqual(latest[requests["db2"]], 200.0)
+        self.assertIsNone(latest[requests["db3"]])
+
+
+class TestAlarmWriteExecutor(unittest.TestCase):
+    @patch("common.concurrency_utilities.time.sleep")
+    def test_put_metric_alarms_collects_results(self, sleep):
+        cloudwatch = MagicMock()
+        throttled = {"alarm-1": 1}
+
+        def put_metric_alarm(**kwargs):
+            name = kwargs["AlarmName"]
+            if throttled.get(name):
+                throttled[name] -= 1
+                raise ClientError(
+                    {"Error": {"Code": "Throttling", "Message": "Rate exceeded"}},
+                    "PutMetricAlarm",
+                )
+            if name == "alarm-bad":
+                raise ClientError(
+                    {"Error": {"Code": "ValidationError", "Message": "bad"}},
+                    "PutMetricAlarm",
+                )
+
+        cloudwatch.put_metric_alarm.side_effect = put_metric_alarm
+        executor = AlarmWriteExecutor(cloudwatch, rate=1000, max_workers=4)
+
+        results = executor.put_metric_alarms(
+            [{"AlarmName": name} for name in ("alarm-0", "alarm-1", "alarm-bad")]
+        )
+
+        self.assertIsNone(results["alarm-0"])
+        self.assertIsNone(results["alarm-1"])
+        self.assertIn("ValidationError", results["alarm-bad"])
+        self.assertEqual(cloudwatch.put_metric_alarm.call_count, 4)
+
+
+def storage_alarm_spec(instance_id, threshold=1024000, actions=None):
+    return {
+        "AlarmName": f"RDS_Storage_{instance_id}",
+        "AlarmDescription": f"Storage alarm for {instance_id}",
+        "AlarmActions": actions or ["arn:aws:sns:us-west-2:123456789012:alerts"],
+        "ComparisonOperator": "LessThanThreshold",
+        "TreatMissingData": "missing",
+        "EvaluationPeriods": 1,
+        "DatapointsToAlarm": 1,
+        "Threshold": threshold,
+        "Metrics": [
+            {
+                "Id": "m1",
+                "MetricStat": {
+                    "Metric": {
+                        "Namespace": "AWS/RDS",
+                        "MetricName": "FreeStorageSpace",
+                        "Dimensions": [
+                            {"Name": "DBInstanceIdentifier", "Value": instance_id}
+                        ],
+                    },
+                    "Period": 300,
+                    "Stat": "Average",
+                },
+                "ReturnData": True,
+            }
+        ],
+    }
+
+
+class TestAlarmReconciler(unittest.TestCase):
+    def test_fingerprint_ignores_order_and_read_only_fields(self):
+        spec = storage_alarm_spec("db1", actions=["arn:b", "arn:a"])
+        described = dict(
+            storage_alarm_spec("db1", threshold=1024000.0, actions=["arn:a", "arn:b"]),
+            AlarmArn="arn:aws:cloudwatch:us-west-2:123456789012:alarm:RDS_Storage_db1",
+            StateValue="OK",
+            ActionsEnabled=True,
+            OKActions=[],
+        )
+        self.assertEqual(alarm_fingerprint(spec), alarm_fingerprint(described))
+        self.assertNotEqual(
+            alarm_fingerprint(spec),
+            alarm_fingerprint(storage_alarm_spec("db1", threshold=5)),
+        )
+
+    @mock_cloudwatch
+    def test_rerun_makes_no_writes_and_detects_drift(self):
+        cloudwatch = boto3.client("cloudwatch", region_name="us-west-2")
+        cloudwatch.put_metric_alarm(**storage_alarm_spec("old"))
+        executor = AlarmWriteExecutor(cloudwatch, rate=1000)
+
+        plan, results = reconcile_alarms(
+            cloudwatch,
+            [storage_alarm_spec("db1"), storage_alarm_spec("db2")],
+            prefix="RDS_Storage_",
+            executor=executor,
+        )
+        self.assertEqual(len(plan["create"]), 2)
+        self.assertEqual(plan["delete"], ["RDS_Storage_old"])
+        self.assertTrue(all(error is None for error in results.values()))
+
+        executor.put_metric_alarms = MagicMock()
+        executor.delete_alarms = MagicMock()
+        plan, results = reconcile_alarms(
+            cloudwatch,
+            [storage_alarm_spec("db1"), storage_alarm_spec("db2")],
+            prefix="RDS_Storage_",
+            executor=executor,
+        )
+        self.assertEqual(
+            sorted(plan["unchanged"]), ["RDS_Storage_db1", "RDS_Storage_db2"]
+        )
+        self.assertEqual(results, {})
+        executor.put_metric_alarms.assert_not_called()
+        executor.delete_alarms.assert_not_called()
+
+        plan, _ = reconcile_alarms(
+            cloudwatch,
+            [storage_alarm_spec("db1", threshold=2048000), storage_alarm_spec("db2")],
+            prefix="RDS_Storage_",
+            executor=executor,
+        )
+        self.assertEqual(
+            [spec["AlarmName"] for spec in plan["update"]], ["RDS_Storage_db1"]
+        )
+        self.assertEqual(plan["create"], [])
+
+
+class TestAlarmInventory(unittest.TestCase):
+    @mock_cloudwatch
+    def test_prefix_and_projection(self):
+        cloudwatch = boto3.client("cloudwatch", region_name="us-west-2")
+        cloudwatch.put_metric_alarm(**storage_alarm_spec("db1"))
+        cloudwatch.put_metric_alarm(**storage_alarm_spec("db2"))
+        cloudwatch.put_metric_alarm(
+            **dict(storage_alarm_spec("db3"), AlarmName="OtherTeam_db3")
+        )
+
+        names = get_alarm_names(
+            cloudwatch_client=cloudwatch, prefix="RDS_Storage_", page_size=1
+        )
+        self.assertEqual(names, {"RDS_Storage_db1", "RDS_Storage_db2"})
+
+        index = get_alarm_index(
+            cloudwatch_client=cloudwatch, prefix="RDS_Storage_", fields=["Threshold"]
+        )
+        self.assertEqual(
+            index["RDS_Storage_db1"],
+            {"AlarmName": "RDS_Storage_db1", "Threshold": 1024000.0},
+        )
+
+    def test_filters_are_sent_to_the_server(self):
+        cloudwatch = MagicMock()
+        paginate = cloudwatch.get_paginator.return_value.paginate
+        paginate.return_value = [
+            {
+                "MetricAlarms": [{"AlarmName": "a1", "StateValue": "ALARM"}],
+                "CompositeAlarms": [{"AlarmName": "c1", "StateValue": "ALARM"}],
+            }
+        ]
+
+        names = get_alarm_names(
+            cloudwatch_client=cloudwatch,
+            prefix="a",
+            state="ALARM",
+            alarm_types=["MetricAlarm", "CompositeAlarm"],
+        )
+
+        self.assertEqual(names, {"a1", "c1"})
+        paginate.assert_called_once_with(
+            AlarmTypes=["MetricAlarm", "CompositeAlarm"],
+            MaxRecords=100,
+            AlarmNamePrefix="a",
+            StateValue="ALARM",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,467 @@
+import datetime
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import boto3
+from moto import mock_ec2, mock_sts
+from common import cache_utilities, identity_utilities
+from common.ami_resolver import AmiResolver, newest_image
+from botocore.exceptions import ClientError
+from common.concurrency_utilities import (
+    ServiceConcurrencyLimits,
+    TokenBucket,
+    call_with_backoff,
+    fan_out,
+    is_throttling_error,
+)
+from common.aws_utilities import get_vpcs
+from common.cache_utilities import DescribeCache, configure_cache, get_cache_stats
+from common.identity_utilities import (
+    IdentityResolver,
+    build_arn,
+    partition_for_region,
+    rds_db_arn,
+    sns_topic_arn,
+)
+from common.network_topology import RegionTopology
+from common.output_utilities import Column, OutputWriter, get_output_writer
+
+
+class TestRegionTopology(unittest.TestCase):
+    @mock_ec2
+    def test_lookups_are_served_from_snapshot(self):
+        ec2 = boto3.client("ec2", region_name="us-east-1")
+        vpc_id = ec2.create_vpc(CidrBlock="10.0.0.0/16")["Vpc"]["VpcId"]
+        ec2.create_tags(Resources=[vpc_id], Tags=[{"Key": "Name", "Value": "TestVPC"}])
+        subnet_a = ec2.create_subnet(
+            VpcId=vpc_id, CidrBlock="10.0.1.0/24", AvailabilityZone="us-east-1a"
+        )["Subnet"]["SubnetId"]
+        subnet_b = ec2.create_subnet(
+            VpcId=vpc_id, CidrBlock="10.0.2.0/24", AvailabilityZone="us-east-1b"
+        )["Subnet"]["SubnetId"]
+        sg_id = ec2.create_security_group(
+            GroupName="test-sg", Description="test", VpcId=vpc_id
+        )["GroupId"]
+
+        topology = RegionTopology.load(region_name="us-east-1")
+
+        self.assertIn((vpc_id, "TestVPC"), topology.vpcs_with_names())
+        self.assertEqual(
+            topology.availability_zones_for_vpc(vpc_id), ["us-east-1a", "us-east-1b"]
+        )
+        self.assertEqual(set(topology.subnets_for_vpc(vpc_id)), {subnet_a, subnet_b})
+        self.assertEqual(
+            topology.subnet_id_for_az_and_vpc("us-east-1b", vpc_id), subnet_b
+        )
+        self.assertIsNone(topology.subnet_id_for_az_and_vpc("us-east-1c", vpc_id))
+        self.assertIn((sg_id, "test-sg"), topology.security_groups_for_vpc(vpc_id))
+        topology.validate_sg_and_subnet(sg_id, subnet_a)
+
+    @mock_ec2
+    def test_validate_sg_and_subnet_rejects_mismatched_vpcs(self):
+        ec2 = boto3.client("ec2", region_name="us-east-1")
+        vpc_a = ec2.create_vpc(CidrBlock="10.0.0.0/16")["Vpc"]["VpcId"]
+        vpc_b = ec2.create_vpc(CidrBlock="10.1.0.0/16")["Vpc"]["VpcId"]
+        subnet_id = ec2.create_subnet(VpcId=vpc_a, CidrBlock="10.0.1.0/24")["Subnet"][
+            "SubnetId"
+        ]
+        sg_id = ec2.create_security_group(
+            GroupName="other-sg", Description="test", VpcId=vpc_b
+        )["GroupId"]
+
+        topology = RegionTopology.load(region_name="us-east-1")
+
+        with self.assertRaises(ValueError):
+            topology.validate_sg_and_subnet(sg_id, subnet_id)
+        with self.assertRaises(ValueError):
+            topology.validate_sg_and_subnet("sg-missing", subnet_id)
+
+
+class TestDescribeCache(unittest.TestCase):
+    def test_entries_expire(self):
+        cache = DescribeCache(path=":memory:")
+        cache.set("key", ["value"], ttl=60)
+        self.assertEqual(cache.get("key"), (True, ["value"]))
+
+        with patch("common.cache_utilities.time.time", return_value=time.time() + 61):
+            self.assertEqual(cache.get("key"), (False, None))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = DescribeCache(path=":memory:", max_entries=2)
+        now = time.time()
+        with patch("common.cache_utilities.time.time", return_value=now):
+            cache.set("a", 1, ttl=60)
+        with patch("common.cache_utilities.time.time", return_value=now + 1):
+            cache.set("b", 2, ttl=60)
+        with patch("common.cache_utilities.time.time", return_value=now + 2):
+            cache.get("a")
+        with patch("common.cache_utilities.time.time", return_value=now + 3):
+            cache.set("c", 3, ttl=60)
+
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(cache.get("a")[0])
+        self.assertFalse(cache.get("b")[0])
+        self.assertTrue(cache.get("c")[0])
+
+
+class TestCachedDescribe(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        configure_cache(path=os.path.join(self.tmpdir.name, "cache.sqlite3"))
+
+    def tearDown(self):
+        configure_cache(enabled=False)
+        cache_utilities._cache.close()
+        cache_utilities._cache = None
+        self.tmpdir.cleanup()
+
+    @mock_ec2
+    def test_second_call_is_served_from_cache(self):
+        ec2 = boto3.client("ec2", region_name="us-east-1")
+        first_vpc = ec2.create_vpc(CidrBlock="10.0.0.0/16")["Vpc"]["VpcId"]
+
+        first = get_vpcs(region_name="us-east-1")
+        second_vpc = ec2.create_vpc(CidrBlock="10.1.0.0/16")["Vpc"]["VpcId"]
+        second = get_vpcs(region_name="us-east-1")
+
+        self.assertIn(first_vpc, second)
+        self.assertNotIn(second_vpc, second)
+        self.assertEqual(first, second)
+        self.assertEqual(get_cache_stats()["hits"], 1)
+
+    @mock_ec2
+    def test_refresh_bypasses_cached_values(self):
+        ec2 = boto3.client("ec2", region_name="us-east-1")
+        get_vpcs(region_name="us-east-1")
+        new_vpc = ec2.create_vpc(CidrBlock="10.1.0.0/16")["Vpc"]["VpcId"]
+
+        configure_cache(
+            refresh=True, path=os.path.join(self.tmpdir.name, "cache.sqlite3")
+        )
+
+        self.assertIn(new_vpc, get_vpcs(region_name="us-east-1"))
+
+    @mock_ec2
+    def test_regions_are_cached_separately(self):
+        ec2 = boto3.client("ec2", region_name="us-west-2")
+        west_vpc = ec2.create_vpc(CidrBlock="10.0.0.0/16")["Vpc"]["VpcId"]
+
+        get_vpcs(region_name="us-east-1")
+
+        self.assertIn(west_vpc, get_vpcs(region_name="us-west-2"))
+
+    @mock_ec2
+    def test_credentials_are_cached_separately(self):
+        def client(access_key):
+            return boto3.client(
+                "ec2",
+                region_name="us-east-1",
+                aws_access_key_id=access_key,
+                aws_secret_access_key="secret",
+            )
+
+        first = client("AKIAFIRSTACCOUNT")
+        get_vpcs(ec2_client=first)
+        new_vpc = first.create_vpc(CidrBlock="10.1.0.0/16")["Vpc"]["VpcId"]
+
+        self.assertIn(new_vpc, get_vpcs(ec2_client=client("AKIASECONDACCOUNT")))
+        self.assertNotIn(new_vpc, get_vpcs(ec2_client=client("AKIAFIRSTACCOUNT")))
+
+
+def fake_ec2_client(region, images):
+    client = MagicMock()
+    client.meta.region_name = region
+    client.can_paginate.return_value = True
+    client.get_paginator.return_value.paginate.side_effect = lambda **kwargs: iter(
+        [{"Images": images[:2]}, {"Images": images[2:]}]
+    )
+    return client
+
+
+class TestAmiResolver(unittest.TestCase):
+    images = [
+        {"ImageId": "ami-old", "CreationDate": "2023-01-01T00:00:00.000Z"},
+        {"ImageId": "ami-new", "CreationDate": "2024-06-01T00:00:00.000Z"},
+        {"ImageId": "ami-mid", "CreationDate": "2023-12-01T00:00:00.000Z"},
+    ]
+
+    def test_newest_image(self):
+        self.assertEqual(newest_image(iter(self.images))["ImageId"], "ami-new")
+        self.assertIsNone(newest_image([]))
+
+    def test_result_is_cached_per_region(self):
+        resolver = AmiResolver()
+        client = fake_ec2_client("us-east-1", self.images)
+
+        self.assertEqual(resolver.resolve(ec2_client=client), "ami-new")
+        self.assertEqual(resolver.resolve(ec2_client=client), "ami-new")
+        self.assertEqual(client.get_paginator.return_value.paginate.call_count, 1)
+
+    def test_cache_expires(self):
+        resolver = AmiResolver(ttl=0)
+        client = fake_ec2_client("us-east-1", self.images)
+
+        resolver.resolve(ec2_client=client)
+        resolver.resolve(ec2_client=client)
+
+        self.assertEqual(client.get_paginator.return_value.paginate.call_count, 2)
+
+    def test_al2023_arm64_filters(self):
+        resolver = AmiResolver()
+        client = fake_ec2_client("us-west-2", self.images)
+
+        resolver.resolve(ec2_client=client, family="al2023", architecture="arm64")
+
+        filters = client.get_paginator.return_value.paginate.call_args.kwargs["Filters"]
+        self.assertIn({"Name": "name", "Values": ["al2023-ami-2023.*"]}, filters)
+        self.assertIn({"Name": "architecture", "Values": ["arm64"]}, filters)
+
+    def test_unsupported_family(self):
+        with self.assertRaises(ValueError):
+            AmiResolver().resolve(ec2_client=MagicMock(), family="centos")
+
+    def test_resolve_many(self):
+        resolver = AmiResolver()
+        clients = {
+            region: fake_ec2_client(region, self.images)
+            for region in ("us-east-1", "eu-west-1")
+        }
+        with patch(
+            "common.ami_resolver.initialize_aws_client",
+            side_effect=lambda service, region_name=None: clients[region_name],
+        ):
+            result = resolver.resolve_many(["us-east-1", "eu-west-1"])
+
+        self.assertEqual(result, {"us-east-1": "ami-new", "eu-west-1": "ami-new"})
+
+
+class TestFanOut(unittest.TestCase):
+    def test_results_and_errors_are_returned_per_item(self):
+        def work(item):
+            if item == 3:
+                raise ValueError("bad item")
+            return item * 2
+
+        results = {
+            item: (result, error) for item, result, error in fan_out(work, range(5))
+        }
+
+        self.assertEqual(results[2], (4, None))
+        self.assertIsNone(results[3][0])
+        self.assertIsInstance(results[3][1], ValueError)
+        self.assertEqual(len(results), 5)
+
+    def test_empty_input(self):
+        self.assertEqual(list(fan_out(lambda item: item, [])), [])
+
+
+class TestServiceConcurrencyLimits(unittest.TestCase):
+    def test_calls_are_capped_per_service_and_scope(self):
+        limits = ServiceConcurrencyLimits({"rds": 2})
+        running = {}
+        peaks = {}
+        lock = threading.Lock()
+
+        def work(scope):
+            with limits.slot("rds", scope):
+                with lock:
+                    running[scope] = running.get(scope, 0) + 1
+                    peaks[scope] = max(peaks.get(scope, 0), running[scope])
+                time.sleep(0.02)
+                with lock:
+                    running[scope] -= 1
+
+        items = ["a", "b"] * 6
+        list(fan_out(work, items, max_workers=len(items)))
+
+        self.assertEqual(peaks, {"a": 2, "b": 2})
+
+
+def throttling_error():
+    return ClientError(
+        {"Error": {"Code": "Throttling", "Message": "Rate exceeded"}}, "PutMetricAlarm"
+    )
+
+
+class TestRateLimiting(unittest.TestCase):
+    def test_token_bucket_limits_rate(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        # The first token is available immediately, the other five need 1/50s each.
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_token_bucket_rejects_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+    @patch("common.concurrency_utilities.time.sleep")
+    def test_call_with_backoff_retries_throttling(self, sleep):
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise throttling_error()
+            return "ok"
+
+        self.assertEqual(call_with_backoff(flaky), "ok")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    @patch("common.concurrency_utilities.time.sleep")
+    def test_call_with_backoff_does_not_retry_other_errors(self, sleep):
+        def broken():
+            raise ValueError("bad request")
+
+        with self.assertRaises(ValueError):
+            call_with_backoff(broken)
+        sleep.assert_not_called()
+
+    @patch("common.concurrency_utilities.time.sleep")
+    def test_call_with_backoff_gives_up(self, sleep):
+        def always_throttled():
+            raise throttling_error()
+
+        with self.assertRaises(ClientError):
+            call_with_backoff(always_throttled, max_attempts=3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_is_throttling_error(self):
+        self.assertTrue(is_throttling_error(throttling_error()))
+        self.assertFalse(is_throttling_error(ValueError()))
+
+
+class TestIdentity(unittest.TestCase):
+    def test_partition_for_region(self):
+        self.assertEqual(partition_for_region("us-west-2"), "aws")
+        self.assertEqual(partition_for_region("cn-north-1"), "aws-cn")
+        self.assertEqual(partition_for_region("us-gov-west-1"), "aws-us-gov")
+        self.assertEqual(partition_for_region("us-isob-east-1"), "aws-iso-b")
+        self.assertEqual(
+            build_arn("sns", "cn-north-1", "123456789012", "alerts"),
+            "arn:aws-cn:sns:cn-north-1:123456789012:alerts",
+        )
+
+    def test_explicit_account_makes_no_calls(self):
+        with patch("common.identity_utilities.fetch_caller_identity") as fetch:
+            arn = sns_topic_arn("alerts", region_name="us-west-2", account_id="1")
+        self.assertEqual(arn, "arn:aws:sns:us-west-2:1:alerts")
+        fetch.assert_not_called()
+
+    @mock_sts
+    def test_identity_is_resolved_once(self):
+        with patch("common.identity_utilities._resolver", IdentityResolver()), patch(
+            "common.identity_utilities.fetch_caller_identity",
+            wraps=identity_utilities.fetch_caller_identity,
+        ) as fetch:
+            arns = [rds_db_arn(f"db{i}", region_name="us-west-2") for i in range(5)]
+
+        self.assertEqual(arns[0], "arn:aws:rds:us-west-2:123456789012:db:db0")
+        self.assertEqual(fetch.call_count, 1)
+
+    def test_profiles_are_resolved_concurrently(self):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def fetch(profile_name=None, credential_key=None):
+            with lock:
+                running.append(profile_name)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(profile_name)
+            return {"account_id": profile_name}
+
+        resolver = IdentityResolver()
+        with patch(
+            "common.identity_utilities.credential_fingerprint", return_value="key"
+        ), patch(
+            "common.identity_utilities.fetch_caller_identity", side_effect=fetch
+        ) as fetch_mock:
+            results = {
+                item: result
+                for item, result, _ in fan_out(
+                    resolver.account_id, ["a", "b", "a", "b"], max_workers=4
+                )
+            }
+
+        self.assertEqual(results, {"a": "a", "b": "b"})
+        self.assertEqual(fetch_mock.call_count, 2)
+        self.assertEqual(max(peak), 2)
+
+    @mock_sts
+    def test_fetch_caller_identity_with_moto(self):
+        resolver = IdentityResolver()
+        identity = resolver.identity()
+        self.assertEqual(identity["account_id"], "123456789012")
+        self.assertEqual(identity["partition"], "aws")
+
+
+class TestOutputWriters(unittest.TestCase):
+    columns = [
+        Column("id", "Instance"),
+        Column("size", "Size", lambda value: f"{value} GB"),
+        Column("created", "Created"),
+    ]
+    rows = [
+        {"id": "db1", "size": 20, "created": datetime.datetime(2024, 1, 2, 3, 4, 5)},
+        {"id": "db2", "size": 40, "created": None},
+    ]
+
+    def render(self, output_format):
+        stream = io.StringIO()
+        with get_output_writer(output_format, self.columns, stream=stream) as writer:
+            writer.write_rows(self.rows)
+        return stream.getvalue()
+
+    def test_ndjson_streams_raw_values(self):
+        lines = self.render("ndjson").splitlines()
+        self.assertEqual(
+            json.loads(lines[0]),
+            {"id": "db1", "size": 20, "created": "2024-01-02T03:04:05"},
+        )
+        self.assertEqual(len(lines), 2)
+
+    def test_ndjson_writes_each_row_immediately(self):
+        stream = io.StringIO()
+        writer = get_output_writer("ndjson", self.columns, stream=stream)
+        writer.write_row(self.rows[0])
+        self.assertTrue(stream.getvalue().endswith("\n"))
+
+    def test_json_and_csv(self):
+        self.assertEqual(json.loads(self.render("json"))[1]["id"], "db2")
+        self.assertEqual(
+            self.render("csv").splitlines(),
+            ["id,size,created", "db1,20,2024-01-02T03:04:05", "db2,40,"],
+        )
+        stream = io.StringIO()
+        get_output_writer("json", self.columns, stream=stream).close()
+        self.assertEqual(json.loads(stream.getvalue()), [])
+
+    def test_table_uses_headers_and_formatters(self):
+        output = self.render("table")
+        self.assertIn("Instance", output)
+        self.assertIn("20 GB", output)
+
+    def test_writers_must_implement_write(self):
+        class IncompleteWriter(OutputWriter):
+            pass
+
+        with self.assertRaises(TypeError):
+            IncompleteWriter(["a"], stream=io.StringIO())
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            get_output_writer("xml", self.columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
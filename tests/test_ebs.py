@@ -0,0 +1,165 @@
+import unittest
+from unittest.mock import MagicMock
+import boto3
+from moto import mock_cloudwatch, mock_ec2
+from cloudwatch.alarm_executor import AlarmWriteExecutor
+from ebs.ebs_alarm_manager import (
+    Config,
+    build_alarm_spec,
+    reconcile_ebs_alarms,
+)
+from ebs.ebs_utilities import iter_ebs_volumes, volume_tag_filters
+
+
+def create_attached_volumes(ec2, count, tags=None):
+    instance_id = ec2.run_instances(ImageId="ami-12345678", MinCount=1, MaxCount=1)[
+        "Instances"
+    ][0]["InstanceId"]
+    volume_ids = []
+    for index in range(count):
+        volume = ec2.create_volume(
+            AvailabilityZone="us-west-2a",
+            Size=10,
+            VolumeType="gp3",
+            TagSpecifications=[
+                {
+                    "ResourceType": "volume",
+                    "Tags": [{"Key": "Name", "Value": f"vol{index}"}]
+                    + [{"Key": k, "Value": v} for k, v in (tags or {}).items()],
+                }
+            ],
+        )
+        ec2.attach_volume(
+            VolumeId=volume["VolumeId"],
+            InstanceId=instance_id,
+            Device=f"/dev/sd{chr(ord('f') + index)}",
+        )
+        volume_ids.append(volume["VolumeId"])
+    return volume_ids
+
+
+class TestEbsVolumes(unittest.TestCase):
+    def test_tag_filters(self):
+        self.assertEqual(
+            volume_tag_filters([("env", "prod"), ("team", None)]),
+            [
+                {"Name": "tag:env", "Values": ["prod"]},
+                {"Name": "tag-key", "Values": ["team"]},
+            ],
+        )
+
+    @mock_ec2
+    def test_streams_only_attached_matching_volumes(self):
+        ec2 = boto3.client("ec2", region_name="us-west-2")
+        attached = create_attached_volumes(ec2, 2, tags={"env": "prod"})
+        ec2.create_volume(AvailabilityZone="us-west-2a", Size=10)
+
+        volumes = list(
+            iter_ebs_volumes(
+                ec2_client=ec2, tag_predicates=[("env", "prod")], page_size=5
+            )
+        )
+
+        self.assertEqual(sorted(v["VolumeId"] for v in volumes), sorted(attached))
+
+
+class TestEbsAlarms(unittest.TestCase):
+    def test_latency_alarm_uses_metric_math(self):
+        volume = {"VolumeId": "vol-1", "VolumeType": "gp3", "Size": 10}
+        spec = build_alarm_spec(volume, "readlatency")
+
+        self.assertEqual(
+            spec["AlarmName"], Config.ALARM_READLATENCY_NAME_PREFIX + "vol-1"
+        )
+        expression, time_metric, ops_metric = spec["Metrics"]
+        self.assertEqual(expression["Expression"], "IF(m2>0, (m1/m2)*1000, 0)")
+        self.assertEqual(
+            time_metric["MetricStat"]["Metric"]["MetricName"], "VolumeTotalReadTime"
+        )
+        self.assertEqual(
+            ops_metric["MetricStat"]["Metric"]["MetricName"], "VolumeReadOps"
+        )
+
+    def test_unknown_alarm_type(self):
+        with self.assertRaises(ValueError):
+            build_alarm_spec({"VolumeId": "vol-1"}, "throughput")
+
+    @mock_ec2
+    @mock_cloudwatch
+    def test_reconcile_is_idempotent(self):
+        ec2 = boto3.client("ec2", region_name="us-west-2")
+        cloudwatch = boto3.client("cloudwatch", region_name="us-west-2")
+        volume_ids = create_attached_volumes(ec2, 3, tags={"env": "prod"})
+        prod = [("env", "prod")]
+        executor = AlarmWriteExecutor(cloudwatch, rate=1000)
+
+        volume_count, outcomes = reconcile_ebs_alarms(
+            ec2, cloudwatch, tag_predicates=prod, executor=executor
+        )
+
+        self.assertEqual(volume_count, 3)
+        for alarm_type, (plan, results) in outcomes.items():
+            self.assertEqual(len(plan["create"]), 3, alarm_type)
+            self.assertTrue(all(error is None for error in results.values()))
+
+        executor.put_metric_alarms = MagicMock()
+        executor.delete_alarms = MagicMock(return_value={})
+
+        _, outcomes = reconcile_ebs_alarms(
+            ec2, cloudwatch, tag_predicates=prod, executor=executor
+        )
+
+        executor.put_metric_alarms.assert_not_called()
+        executor.delete_alarms.assert_not_called()
+        for plan, _ in outcomes.values():
+            self.assertEqual(len(plan["unchanged"]), 3)
+
+    @mock_ec2
+    @mock_cloudwatch
+    def test_tag_filtered_reconcile_deletes_nothing(self):
+        ec2 = boto3.client("ec2", region_name="us-west-2")
+        cloudwatch = boto3.client("cloudwatch", region_name="us-west-2")
+        volume_ids = create_attached_volumes(ec2, 2, tags={"env": "prod"})
+        executor = AlarmWriteExecutor(cloudwatch, rate=1000)
+        reconcile_ebs_alarms(
+            ec2, cloudwatch, tag_predicates=[("env", "prod")], executor=executor
+        )
+
+        # Untagged volumes are outside the selection, not gone
+        ec2.delete_tags(Resources=[volume_ids[0]], Tags=[{"Key": "env"}])
+        _, outcomes = reconcile_ebs_alarms(
+            ec2, cloudwatch, tag_predicates=[("env", "prod")], executor=executor
+        )
+
+        for plan, _ in outcomes.values():
+            self.assertEqual(plan["delete"], [])
+        names = {a["AlarmName"] for a in cloudwatch.describe_alarms()["MetricAlarms"]}
+        self.assertIn(Config.ALARM_IMPAIREDVOL_NAME_PREFIX + volume_ids[0], names)
+
+    @mock_ec2
+    @mock_cloudwatch
+    def test_only_alarms_of_deleted_volumes_are_removed(self):
+        ec2 = boto3.client("ec2", region_name="us-west-2")
+        cloudwatch = boto3.client("cloudwatch", region_name="us-west-2")
+        create_attached_volumes(ec2, 1)
+        detached = ec2.create_volume(AvailabilityZone="us-west-2a", Size=10)
+        executor = AlarmWriteExecutor(cloudwatch, rate=1000)
+        prefix = Config.ALARM_IMPAIREDVOL_NAME_PREFIX
+        for volume_id in (detached["VolumeId"], "vol-gone"):
+            executor.put_metric_alarms(
+                [build_alarm_spec({"VolumeId": volume_id}, "impairedvol")]
+            )
+
+        _, outcomes = reconcile_ebs_alarms(
+            ec2, cloudwatch, alarm_types=("impairedvol",), executor=executor
+        )
+
+        plan, _ = outcomes["impairedvol"]
+        self.assertEqual(plan["delete"], [prefix + "vol-gone"])
+        names = {a["AlarmName"] for a in cloudwatch.describe_alarms()["MetricAlarms"]}
+        self.assertIn(prefix + detached["VolumeId"], names)
+        self.assertNotIn(prefix + "vol-gone", names)
+
+
+if __name__ == "__main__":
+    unittest.main()
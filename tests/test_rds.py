@@ -0,0 +1,273 @@
+import datetime
+import unittest
+from unittest.mock import patch
+import boto3
+from moto import mock_cloudwatch, mock_rds, mock_sts
+from rds.rds_utilities import (
+    get_rds_free_storage_bulk,
+    get_rds_free_storage_percentage_bulk,
+    build_rds_detail_report,
+    build_rds_storage_report,
+    iter_rds_instances,
+    iter_rds_storage_report,
+)
+from rds.rds_forecast import build_rds_storage_forecast
+from rds.rds_inventory import (
+    RdsInstanceRecord,
+    TagIndex,
+    iter_rds_inventory,
+    resolve_inventory_targets,
+    select_rds_targets,
+)
+
+
+def create_db_instance(rds, instance_id, allocated_storage=20, tags=None):
+    rds.create_db_instance(
+        DBInstanceIdentifier=instance_id,
+        AllocatedStorage=allocated_storage,
+        DBInstanceClass="db.t3.micro",
+        Engine="postgres",
+        MasterUsername="admin",
+        MasterUserPassword="password123",
+        Tags=tags or [],
+    )
+
+
+def put_free_storage(cloudwatch, instance_id, value, timestamp=None):
+    cloudwatch.put_metric_data(
+        Namespace="AWS/RDS",
+        MetricData=[
+            {
+                "MetricName": "FreeStorageSpace",
+                "Dimensions": [{"Name": "DBInstanceIdentifier", "Value": instance_id}],
+                "Timestamp": timestamp
+                or datetime.datetime.utcnow() - datetime.timedelta(minutes=1),
+                "Value": value,
+            }
+        ],
+    )
+
+
+class TestRDSFreeStorage(unittest.TestCase):
+    @mock_cloudwatch
+    def test_get_rds_free_storage_bulk(self):
+        cloudwatch = boto3.client("cloudwatch", region_name="us-east-1")
+        put_free_storage(cloudwatch, "db1", 5 * 1024**3)
+        put_free_storage(cloudwatch, "db2", 10 * 1024**3)
+
+        free_storage = get_rds_free_storage_bulk(
+            ["db1", "db2", "missing"], region_name="us-east-1"
+        )
+
+        self.assertEqual(free_storage["db1"], 5 * 1024**3)
+        self.assertEqual(free_storage["db2"], 10 * 1024**3)
+        self.assertIsNone(free_storage["missing"])
+
+    @mock_cloudwatch
+    def test_get_rds_free_storage_percentage_bulk(self):
+        cloudwatch = boto3.client("cloudwatch", region_name="us-east-1")
+        put_free_storage(cloudwatch, "db1", 5 * 1024**3)
+
+        percentages = get_rds_free_storage_percentage_bulk(
+            {"db1": 20, "db2": 20}, region_name="us-east-1"
+        )
+
+        self.assertAlmostEqual(percentages["db1"], 25.0)
+        self.assertIsNone(percentages["db2"])
+
+
+class TestRDSInventory(unittest.TestCase):
+    @mock_rds
+    def test_iter_rds_instances_reads_every_page(self):
+        rds = boto3.client("rds", region_name="us-east-1")
+        for i in range(25):
+            create_db_instance(rds, f"db{i}")
+
+        instances = list(iter_rds_instances(region_name="us-east-1", page_size=20))
+
+        self.assertEqual(len(instances), 25)
+
+    def test_iter_rds_instances_raises_without_a_client(self):
+        with patch("common.aws_utilities.initialize_aws_client", return_value=None):
+            with self.assertRaises(RuntimeError):
+                list(iter_rds_instances(region_name="us-east-1"))
+
+    @mock_rds
+    @mock_cloudwatch
+    def test_build_rds_storage_report(self):
+        rds = boto3.client("rds", region_name="us-east-1")
+        cloudwatch = boto3.client("cloudwatch", region_name="us-east-1")
+        create_db_instance(rds, "db1", allocated_storage=20)
+        create_db_instance(rds, "db2", allocated_storage=40)
+        put_free_storage(cloudwatch, "db1", 5 * 1024**3)
+
+        report = {
+            row["instance_id"]: row
+            for row in build_rds_storage_report(region_name="us-east-1")
+        }
+
+        self.assertEqual(report["db1"]["allocated_storage"], 20)
+        self.assertEqual(report["db1"]["used_storage"], 15 * 1024**3)
+        self.assertAlmostEqual(report["db1"]["free_storage_percentage"], 25.0)
+        self.assertIsNone(report["db2"]["free_storage"])
+        self.assertIsNone(report["db2"]["free_storage_percentage"])
+
+    @mock_rds
+    @mock_cloudwatch
+    def test_storage_report_reads_metrics_in_the_client_region(self):
+        rds = boto3.client("rds", region_name="eu-west-1")
+        cloudwatch = boto3.client("cloudwatch", region_name="eu-west-1")
+        create_db_instance(rds, "db1", allocated_storage=20)
+        put_free_storage(cloudwatch, "db1", 5 * 1024**3)
+
+        rows = list(iter_rds_storage_report(rds_client=rds))
+
+        self.assertEqual(rows[0]["free_storage"], 5 * 1024**3)
+
+    @mock_rds
+    @mock_cloudwatch
+    def test_build_rds_detail_report(self):
+        rds = boto3.client("rds", region_name="us-east-1")
+        cloudwatch = boto3.client("cloudwatch", region_name="us-east-1")
+        create_db_instance(rds, "db1", tags=[{"Key": "env", "Value": "prod"}])
+        create_db_instance(rds, "db2")
+        put_free_storage(cloudwatch, "db1", 5 * 1024**3)
+
+        with patch.object(
+            rds, "list_tags_for_resource", wraps=rds.list_tags_for_resource
+        ) as list_tags:
+            report = build_rds_detail_report(
+                rds_client=rds, cloudwatch_client=cloudwatch
+            )
+
+        rows = {row["instance_id"]: row for row in report}
+        self.assertEqual(rows["db1"]["tags"], {"env": "prod"})
+        self.assertEqual(rows["db1"]["free_storage"], 5 * 1024**3)
+        self.assertEqual(rows["db1"]["engine"], "postgres")
+        self.assertIsNone(rows["db2"]["free_storage"])
+        list_tags.assert_not_called()
+
+
+class TestStorageForecast(unittest.TestCase):
+    @mock_rds
+    @mock_cloudwatch
+    def test_instances_are_ranked_by_time_to_full(self):
+        rds = boto3.client("rds", region_name="us-east-1")
+        cloudwatch = boto3.client("cloudwatch", region_name="us-east-1")
+        for instance_id in ("steady", "filling", "no-data"):
+            create_db_instance(rds, instance_id, allocated_storage=100)
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        gib = 1024**3
+        for hours_ago in range(1, 49):
+            timestamp = now - datetime.timedelta(hours=hours_ago, minutes=-1)
+            put_free_storage(cloudwatch, "steady", 80 * gib, timestamp)
+            # Loses 1 GiB an hour, so 10 GiB are left now
+            put_free_storage(cloudwatch, "filling", (10 + hours_ago) * gib, timestamp)
+
+        rows = build_rds_storage_forecast(
+            region_name="us-east-1", history_days=2, recent_days=0, now=now
+        )
+
+        self.assertEqual(
+            [row["instance_id"] for row in rows], ["filling", "steady", "no-data"]
+        )
+        filling = rows[0]
+        self.assertAlmostEqual(filling["growth_per_day"] / gib, 24, delta=0.5)
+        self.assertAlmostEqual(filling["days_to_full"] * 24, 10, delta=1.5)
+        self.assertIsNone(rows[1]["days_to_full"])
+        self.assertIsNone(rows[2]["free_storage"])
+
+        within = build_rds_storage_forecast(
+            region_name="us-east-1", history_days=2, within_days=1, now=now
+        )
+        self.assertEqual([row["instance_id"] for row in within], ["filling"])
+
+
+class TestMultiRegionInventory(unittest.TestCase):
+    @mock_rds
+    @mock_sts
+    def test_instances_are_tagged_with_region_and_account(self):
+        create_db_instance(boto3.client("rds", region_name="us-east-1"), "east-db")
+        for instance_id in ("west-db1", "west-db2"):
+            create_db_instance(
+                boto3.client("rds", region_name="eu-west-1"), instance_id
+            )
+
+        pairs = resolve_inventory_targets(regions=["us-east-1", "eu-west-1"])
+        results = {
+            region: (account_id, sorted(i["DBInstanceIdentifier"] for i in instances))
+            for _, region, account_id, instances, error in iter_rds_inventory(pairs)
+        }
+
+        self.assertEqual(pairs, [(None, "us-east-1"), (None, "eu-west-1")])
+        self.assertEqual(results["us-east-1"], ("123456789012", ["east-db"]))
+        self.assertEqual(
+            results["eu-west-1"], ("123456789012", ["west-db1", "west-db2"])
+        )
+
+    def test_all_regions_are_resolved_per_profile(self):
+        with patch(
+            "rds.rds_inventory.get_regions", side_effect=[["us-east-1"], ["eu-west-1"]]
+        ):
+            pairs = resolve_inventory_targets(regions=["all"], profiles=["a", "b"])
+
+        self.assertEqual(pairs, [("a", "us-east-1"), ("b", "eu-west-1")])
+
+    def test_all_regions_are_listed_from_the_default_region(self):
+        with patch(
+            "rds.rds_inventory.get_regions", return_value=["us-east-1"]
+        ) as get_regions:
+            resolve_inventory_targets(
+                regions=["all"], profiles=["a"], default_region="eu-west-1"
+            )
+
+        get_regions.assert_called_once_with(region_name="eu-west-1", profile_name="a")
+
+    def test_profile_without_regions_raises(self):
+        with patch("rds.rds_inventory.get_regions", return_value=None):
+            with self.assertRaises(RuntimeError):
+                resolve_inventory_targets(regions=["all"], profiles=["a"])
+
+
+class TestTagIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TagIndex()
+        self.index.add("db1", {"env": "prod", "team": "a"})
+        self.index.add("db2", {"env": "prod", "team": "b"})
+        self.index.add("db3", {"env": "dev"})
+
+    def test_select_with_multiple_predicates(self):
+        self.assertEqual(self.index.select([("env", "prod")]), {"db1", "db2"})
+        self.assertEqual(self.index.select([("env", "prod"), ("team", "b")]), {"db2"})
+        self.assertEqual(self.index.select([("env", "qa")]), set())
+
+    def test_select_key_only_and_all(self):
+        self.assertEqual(self.index.select([("team", None)]), {"db1", "db2"})
+        self.assertEqual(self.index.select(None), {"db1", "db2", "db3"})
+
+
+class TestSelectRdsTargets(unittest.TestCase):
+    @mock_rds
+    def test_select_rds_targets_uses_describe_tags(self):
+        rds = boto3.client("rds", region_name="us-east-1")
+        create_db_instance(rds, "db1", tags=[{"Key": "env", "Value": "prod"}])
+        create_db_instance(rds, "db2", tags=[{"Key": "env", "Value": "dev"}])
+
+        target_ids, records = select_rds_targets(
+            rds_client=rds, tag_predicates=[("env", "prod")]
+        )
+
+        self.assertEqual(target_ids, ["db1"])
+        self.assertIsInstance(records["db1"], RdsInstanceRecord)
+        self.assertEqual(records["db1"].engine, "postgres")
+        self.assertEqual(records["db1"].tags, {"env": "prod"})
+
+    def test_record_has_no_instance_dict(self):
+        record = RdsInstanceRecord("db1", tags={"env": "prod"})
+        self.assertFalse(hasattr(record, "__dict__"))
+        self.assertEqual(record.to_target_details()["tags"], {"env": "prod"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,252 @@
+import datetime
+import boto3
+import numpy as np
+import unittest
+from unittest.mock import MagicMock, patch
+from moto import mock_cloudwatch, mock_rds, mock_sns
+from cloudwatch.alarm_executor import AlarmWriteExecutor
+from rds.rds_inventory import RdsInstanceRecord
+from starting_points.rds_alarm_manager import (
+    Config,
+    cleanup_alarms,
+    create_alarms,
+    main,
+    plan_alarm_cleanup,
+)
+
+
+class TestCreateAlarms(unittest.TestCase):
+    def test_records_avoid_per_target_describes(self):
+        rds_client = MagicMock()
+        cloudwatch = MagicMock()
+        records = {
+            target: RdsInstanceRecord(
+                target,
+                db_instance_class="db.t3.micro",
+                engine="postgres",
+                availability_zone="us-west-2a",
+                tags={"env": "prod"},
+            )
+            for target in ("db1", "db2")
+        }
+
+        created = create_alarms(
+            targets=["db1", "db2"],
+            alarm_names=[],
+            cloudwatch=cloudwatch,
+            client=rds_client,
+            alarm_type="freestoragespace",
+            target_records=records,
+        )
+
+        self.assertEqual(created, 2)
+        self.assertEqual(cloudwatch.put_metric_alarm.call_count, 2)
+        rds_client.describe_db_instances.assert_not_called()
+        rds_client.list_tags_for_resource.assert_not_called()
+        description = cloudwatch.put_metric_alarm.call_args.kwargs["AlarmDescription"]
+        self.assertIn("db.t3.micro, postgres", description)
+        self.assertIn("env: prod", description)
+
+    def test_thresholds_override_the_default(self):
+        cloudwatch = MagicMock()
+        records = {"db1": RdsInstanceRecord("db1"), "db2": RdsInstanceRecord("db2")}
+
+        create_alarms(
+            targets=["db1", "db2"],
+            alarm_names=set(),
+            cloudwatch=cloudwatch,
+            client=MagicMock(),
+            alarm_type="freestoragespace",
+            target_records=records,
+            thresholds={"db1": 5e9},
+        )
+
+        specs = {
+            call.kwargs["AlarmName"]: call.kwargs
+            for call in cloudwatch.put_metric_alarm.call_args_list
+        }
+        prefix = Config.ALARM_RDS_STORAGE_NAME_PREFIX
+        self.assertEqual(specs[prefix + "db1"]["Threshold"], 5e9)
+        self.assertEqual(
+            specs[prefix + "db2"]["Threshold"], Config.ALARM_RDS_STORAGE_THRESHOLD_VALUE
+        )
+        self.assertEqual(
+            specs[prefix + "db1"]["ComparisonOperator"], "LessThanThreshold"
+        )
+
+
+class TestCleanupAlarms(unittest.TestCase):
+    def test_plan_splits_alarms_by_target(self):
+        prefix = Config.ALARM_RDS_STORAGE_NAME_PREFIX
+        plan = plan_alarm_cleanup(
+            targets=["db1"],
+            alarm_names=[prefix + "db2", prefix + "db1", "Other_db3"],
+            prefix=prefix,
+        )
+        self.assertEqual(plan, {"delete": [prefix + "db2"], "keep": [prefix + "db1"]})
+
+    @mock_cloudwatch
+    def test_cleanup_deletes_in_batches(self):
+        cloudwatch = boto3.client("cloudwatch", region_name="us-west-2")
+        prefix = Config.ALARM_RDS_STORAGE_NAME_PREFIX
+        names = [f"{prefix}db{i}" for i in range(250)] + ["Unrelated_alarm"]
+        for name in names:
+            cloudwatch.put_metric_alarm(
+                AlarmName=name,
+                MetricName="FreeStorageSpace",
+                Namespace="AWS/RDS",
+                Statistic="Minimum",
+                Period=300,
+                EvaluationPeriods=1,
+                Threshold=1,
+                ComparisonOperator="LessThanThreshold",
+            )
+        delete_calls = []
+        real_delete = cloudwatch.delete_alarms
+
+        def delete_alarms(**kwargs):
+            delete_calls.append(len(kwargs["AlarmNames"]))
+            return real_delete(**kwargs)
+
+        cloudwatch.delete_alarms = delete_alarms
+        stats = {}
+
+        deleted = cleanup_alarms(
+            targets=["db0", "db1"],
+            cloudwatch=cloudwatch,
+            alarm_type="freestoragespace",
+            stats=stats,
+        )
+
+        self.assertEqual(deleted, 248)
+        self.assertEqual(sorted(delete_calls), [48, 100, 100])
+        self.assertEqual(stats["failed"], 0)
+        remaining = {
+            alarm["AlarmName"] for alarm in cloudwatch.describe_alarms()["MetricAlarms"]
+        }
+        self.assertEqual(remaining, {prefix + "db0", prefix + "db1", "Unrelated_alarm"})
+
+    def test_dry_run_makes_no_deletes(self):
+        cloudwatch = MagicMock()
+        cloudwatch.get_paginator.return_value.paginate.return_value = [
+            {
+                "MetricAlarms": [
+                    {"AlarmName": Config.ALARM_RDS_STORAGE_NAME_PREFIX + "gone"}
+                ]
+            }
+        ]
+
+        deleted = cleanup_alarms(
+            targets=[],
+            cloudwatch=cloudwatch,
+            alarm_type="freestoragespace",
+            dry_run=True,
+        )
+
+        self.assertEqual(deleted, 0)
+        cloudwatch.delete_alarms.assert_not_called()
+
+
+@mock_rds
+@mock_sns
+@mock_cloudwatch
+class TestTagFilteredRuns(unittest.TestCase):
+    def setUp(self):
+        self.region = "us-west-2"
+        rds = boto3.client("rds", region_name=self.region)
+        for instance_id, env in (("prod-db", "prod"), ("dev-db", "dev")):
+            rds.create_db_instance(
+                DBInstanceIdentifier=instance_id,
+                AllocatedStorage=20,
+                DBInstanceClass="db.t3.micro",
+                Engine="postgres",
+                MasterUsername="admin",
+                MasterUserPassword="password123",
+                Tags=[{"Key": "env", "Value": env}],
+            )
+        self.topic_arn = boto3.client("sns", region_name=self.region).create_topic(
+            Name="alerts"
+        )["TopicArn"]
+        self.cloudwatch = boto3.client("cloudwatch", region_name=self.region)
+        self.prefix = Config.ALARM_RDS_STORAGE_NAME_PREFIX
+        for instance_id in ("dev-db", "deleted-db"):
+            self.cloudwatch.put_metric_alarm(
+                AlarmName=self.prefix + instance_id,
+                MetricName="FreeStorageSpace",
+                Namespace="AWS/RDS",
+                Statistic="Minimum",
+                Period=300,
+                EvaluationPeriods=1,
+                Threshold=1,
+                ComparisonOperator="LessThanThreshold",
+            )
+
+    def run_main(self, *flags):
+        argv = ["rds_alarm_manager", "--region", self.region]
+        argv += ["--sns-topic", self.topic_arn, *flags]
+        with patch("sys.argv", argv), patch.object(
+            Config, "SNS_ALARM_ACTION_ARN", self.topic_arn
+        ), patch.object(Config, "SNS_OK_ACTION_ARN", self.topic_arn):
+            main()
+        return {
+            alarm["AlarmName"]
+            for alarm in self.cloudwatch.describe_alarms()["MetricAlarms"]
+        }
+
+    def test_tag_filtered_reconcile_keeps_other_instances_alarms(self):
+        names = self.run_main("--reconcile", "--tag", "env", "prod")
+
+        self.assertEqual(
+            names,
+            {
+                self.prefix + "dev-db",
+                self.prefix + "deleted-db",
+                self.prefix + "prod-db",
+            },
+        )
+
+    def test_tag_filtered_cleanup_only_deletes_alarms_of_deleted_instances(self):
+        names = self.run_main("--cleanup", "--tag", "env", "prod")
+
+        self.assertEqual(names, {self.prefix + "dev-db"})
+
+    def test_dynamic_thresholds_are_stable_across_runs(self):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        gib = 1024**3
+
+        def put_free_storage(hours_ago, value):
+            self.cloudwatch.put_metric_data(
+                Namespace="AWS/RDS",
+                MetricData=[
+                    {
+                        "MetricName": "FreeStorageSpace",
+                        "Dimensions": [
+                            {"Name": "DBInstanceIdentifier", "Value": "prod-db"}
+                        ],
+                        "Timestamp": now - datetime.timedelta(hours=hours_ago),
+                        "Value": value,
+                    }
+                ],
+            )
+
+        values = 50 + np.random.default_rng(0).normal(0, 1, 49)
+        for hours_ago, value in zip(range(49, 1, -1), values[:-1]):
+            put_free_storage(hours_ago, value * gib)
+        flags = ("--reconcile", "--dynamic-thresholds", "--tag", "env", "prod")
+        self.run_main(*flags)
+
+        # The next run sees one more datapoint, which nudges the computed threshold
+        put_free_storage(1, values[-1] * gib)
+        with patch.object(
+            AlarmWriteExecutor,
+            "put_metric_alarms",
+            autospec=True,
+            side_effect=AlarmWriteExecutor.put_metric_alarms,
+        ) as put_metric_alarms:
+            self.run_main(*flags)
+
+        put_metric_alarms.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()